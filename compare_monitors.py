@@ -82,7 +82,7 @@ print("WebSocket Monitor:")
 print("  00:00 - Streaming prices: BTC = $100,000 everywhere")
 print("  00:05 - Real-time update: Coinbase BTC = $100,500")
 print("  00:05 - ARBITRAGE DETECTED! 0.5% opportunity")
-print("  00:05 - Logged to arbitrage_TIMESTAMP.json")
+print("  00:05 - Logged to arbitrage_TIMESTAMP.jsonl")
 print("  Result: Arbitrage opportunity CAUGHT")
 print()
 
@@ -12,6 +12,11 @@ from typing import Dict, List, Optional
 from collections import defaultdict
 import statistics
 
+try:
+    from metrics import ANALYZER_WRITE_SECONDS
+except ImportError:  # imported as src.arbitrage_analyzer
+    from src.metrics import ANALYZER_WRITE_SECONDS
+
 
 class ArbitrageAnalyzer:
     """
@@ -46,6 +51,7 @@ class ArbitrageAnalyzer:
             opportunity: Opportunity dict with buy/sell details
             timestamp: Optional timestamp (defaults to now)
         """
+        started = time.perf_counter()
         if timestamp is None:
             timestamp = datetime.now()
 
@@ -71,6 +77,8 @@ class ArbitrageAnalyzer:
         if record['net_profit_pct'] >= self.alert_threshold:
             self._create_alert(record)
 
+        ANALYZER_WRITE_SECONDS.observe(time.perf_counter() - started)
+
     def _create_alert(self, record: Dict) -> None:
         """Create an alert for a high-value opportunity"""
         alert = {
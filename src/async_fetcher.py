@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Concurrent ticker fetcher built on ccxt.async_support
+Requests every exchange at once so a price snapshot costs the slowest
+venue's round trip instead of the sum of all of them
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional
+
+import ccxt.async_support as ccxt_async
+
+try:
+    from rate_limiter import limiter_for_exchange
+    from metrics import REST_ERRORS, REST_REQUEST_SECONDS
+except ImportError:  # imported as src.async_fetcher
+    from src.rate_limiter import limiter_for_exchange
+    from src.metrics import REST_ERRORS, REST_REQUEST_SECONDS
+
+
+# Per-exchange request timeout (seconds)
+DEFAULT_TIMEOUT = 5.0
+
+# Max symbols per fetch_tickers() call when a venue rejects the full list
+TICKER_CHUNK_SIZE = 100
+TICKER_CHUNK_SIZES = {
+    'coinbase': 50,
+    'kraken': 50,
+}
+
+
+def _exchange_id(exchange) -> str:
+    """Return the ccxt id for an exchange instance or id string"""
+    return exchange if isinstance(exchange, str) else exchange.id
+
+
+class AsyncPriceFetcher:
+    """
+    Fetch tickers from several exchanges concurrently
+
+    Can be used from async code (``await fetch_snapshot(...)``) or from
+    plain/threaded code (``fetch_snapshot_sync(...)``), which runs the
+    requests on a private background event loop. Use one style per
+    instance - the async ccxt clients are bound to the loop that created them.
+    """
+
+    def __init__(self, exchanges: Dict, timeout: float = DEFAULT_TIMEOUT,
+                 timeouts: Optional[Dict[str, float]] = None):
+        """
+        Initialize the fetcher
+
+        Args:
+            exchanges: Dict of display name -> ccxt exchange instance (or ccxt id)
+            timeout: Default per-exchange timeout in seconds
+            timeouts: Optional per-exchange timeout overrides keyed by display name
+        """
+        self.exchange_ids = {name: _exchange_id(ex) for name, ex in exchanges.items()}
+        # Sync instances whose markets (e.g. from the market cache) can seed the async clients
+        self._market_sources = {name: ex for name, ex in exchanges.items() if not isinstance(ex, str)}
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+
+        self._clients = {}
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _timeout_for(self, name: str) -> float:
+        return self.timeouts.get(name, self.timeout)
+
+    def _client(self, name: str):
+        """Lazily create the async ccxt client for an exchange"""
+        client = self._clients.get(name)
+        if client is None:
+            exchange_class = getattr(ccxt_async, self.exchange_ids[name])
+            client = exchange_class({
+                # Every call goes through the shared token bucket; ccxt's own throttler
+                # would serialize them again at rateLimit spacing and defeat its burst
+                'enableRateLimit': False,
+                'timeout': int(self._timeout_for(name) * 1000),
+            })
+            source = self._market_sources.get(name)
+            if source is not None and source.markets:
+                client.set_markets(list(source.markets.values()), source.currencies)
+            self._clients[name] = client
+        return client
+
+    async def _request(self, name: str, method: str, *args):
+        """Call a ccxt method behind the exchange's shared rate limiter and timeout"""
+        client = self._client(name)
+        await limiter_for_exchange(client).acquire_async()
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(getattr(client, method)(*args), self._timeout_for(name))
+        except Exception:
+            REST_ERRORS.labels(exchange=name, method=method).inc()
+            raise
+        finally:
+            REST_REQUEST_SECONDS.labels(exchange=name, method=method).observe(time.perf_counter() - started)
+
+    async def _fetch_ticker(self, name: str, symbol: str,
+                            fallback_symbol: Optional[str] = None) -> Dict:
+        """Fetch one ticker, trying the fallback symbol if the first fails"""
+        started = time.perf_counter()
+
+        try:
+            ticker = await self._request(name, 'fetch_ticker', symbol)
+        except Exception:
+            if not fallback_symbol:
+                raise
+            ticker = await self._request(name, 'fetch_ticker', fallback_symbol)
+
+        return {
+            'bid': ticker['bid'],
+            'ask': ticker['ask'],
+            'last': ticker['last'],
+            'timestamp': ticker['timestamp'],
+            'latency_ms': (time.perf_counter() - started) * 1000,
+        }
+
+    async def fetch_snapshot(self, symbol: str, fallback_symbol: Optional[str] = None) -> Dict:
+        """
+        Fetch a ticker for one symbol from every exchange at once
+
+        Args:
+            symbol: Trading symbol (e.g., 'BTC/USDT')
+            fallback_symbol: Symbol to try when the first one fails (e.g., 'BTC/USD')
+
+        Returns:
+            Snapshot dict with send/receive times, per-exchange prices
+            (None on failure) and per-exchange error messages
+        """
+        names = list(self.exchange_ids)
+
+        sent_at = time.time()
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[self._fetch_ticker(name, symbol, fallback_symbol) for name in names],
+            return_exceptions=True
+        )
+        latency_ms = (time.perf_counter() - started) * 1000
+        received_at = time.time()
+
+        prices = {}
+        errors = {}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                prices[name] = None
+                errors[name] = str(result) or type(result).__name__
+            else:
+                prices[name] = result
+
+        return {
+            'symbol': symbol,
+            'sent_at': sent_at,
+            'received_at': received_at,
+            'latency_ms': latency_ms,
+            'prices': prices,
+            'errors': errors,
+        }
+
+    async def fetch_order_books(self, symbol: str, limit: Optional[int] = None) -> Dict:
+        """
+        Fetch one symbol's order book from every exchange at once
+
+        Args:
+            symbol: Trading symbol (e.g., 'BTC/USDT')
+            limit: Levels per side to request (exchange default when None)
+
+        Returns:
+            Snapshot dict with latency, ``books`` as {exchange: ccxt order
+            book or None} and per-exchange error messages
+        """
+        names = list(self.exchange_ids)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[self._request(name, 'fetch_order_book', symbol, limit) for name in names],
+            return_exceptions=True
+        )
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        books = {}
+        errors = {}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                books[name] = None
+                errors[name] = str(result) or type(result).__name__
+            else:
+                books[name] = result
+
+        return {
+            'symbol': symbol,
+            'latency_ms': latency_ms,
+            'books': books,
+            'errors': errors,
+        }
+
+    async def _fetch_tickers_chunked(self, name: str, symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch tickers in chunks sized for the venue"""
+        chunk_size = TICKER_CHUNK_SIZES.get(self.exchange_ids[name], TICKER_CHUNK_SIZE)
+        chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+        # The shared rate limiter spaces these out to stay inside the venue's budget
+        results = await asyncio.gather(
+            *[self._request(name, 'fetch_tickers', chunk) for chunk in chunks],
+            return_exceptions=True
+        )
+
+        tickers = {}
+        for result in results:
+            if isinstance(result, BaseException):
+                print(f"  Warning: {name} ticker chunk failed: {str(result)[:80]}")
+                continue
+            tickers.update(result)
+        return tickers
+
+    async def _fetch_tickers_one_by_one(self, name: str, symbols: List[str]) -> Dict[str, Dict]:
+        """Fallback for venues without a bulk ticker endpoint"""
+        results = await asyncio.gather(
+            *[self._request(name, 'fetch_ticker', symbol) for symbol in symbols],
+            return_exceptions=True
+        )
+        return {
+            symbol: ticker for symbol, ticker in zip(symbols, results)
+            if not isinstance(ticker, BaseException)
+        }
+
+    async def _fetch_exchange_tickers(self, name: str, symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch many tickers from one exchange with as few calls as possible"""
+        client = self._client(name)
+        if not client.markets:
+            await limiter_for_exchange(client).acquire_async()
+            await client.load_markets()
+
+        listed = [symbol for symbol in symbols if symbol in client.markets]
+        if not listed:
+            return {}
+
+        if not client.has.get('fetchTickers'):
+            tickers = await self._fetch_tickers_one_by_one(name, listed)
+        else:
+            try:
+                tickers = await self._request(name, 'fetch_tickers', listed)
+            except Exception:
+                tickers = await self._fetch_tickers_chunked(name, listed)
+
+        return {
+            symbol: {
+                'bid': ticker['bid'],
+                'ask': ticker['ask'],
+                'last': ticker['last'],
+                'timestamp': ticker['timestamp'],
+            }
+            for symbol, ticker in tickers.items()
+            if symbol in client.markets
+        }
+
+    async def fetch_tickers(self, symbols: List[str]) -> Dict:
+        """
+        Fetch many symbols from every exchange using bulk ticker calls
+
+        Args:
+            symbols: Symbols to fetch (symbols a venue doesn't list are skipped)
+
+        Returns:
+            Snapshot dict with send/receive times, ``tickers`` as
+            {exchange: {symbol: price_dict}} and per-exchange error messages
+        """
+        names = list(self.exchange_ids)
+
+        sent_at = time.time()
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[self._fetch_exchange_tickers(name, symbols) for name in names],
+            return_exceptions=True
+        )
+        latency_ms = (time.perf_counter() - started) * 1000
+        received_at = time.time()
+
+        tickers = {}
+        errors = {}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                tickers[name] = {}
+                errors[name] = str(result) or type(result).__name__
+            else:
+                tickers[name] = result
+
+        return {
+            'sent_at': sent_at,
+            'received_at': received_at,
+            'latency_ms': latency_ms,
+            'tickers': tickers,
+            'errors': errors,
+        }
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop used by the sync API"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='AsyncPriceFetcher',
+                    daemon=True
+                )
+                self._thread.start()
+        return self._loop
+
+    def run_sync(self, coro):
+        """Run a coroutine on the background loop and wait for the result"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def fetch_snapshot_sync(self, symbol: str, fallback_symbol: Optional[str] = None) -> Dict:
+        """Blocking version of fetch_snapshot, safe to call from any thread"""
+        return self.run_sync(self.fetch_snapshot(symbol, fallback_symbol))
+
+    def fetch_tickers_sync(self, symbols: List[str]) -> Dict:
+        """Blocking version of fetch_tickers, safe to call from any thread"""
+        return self.run_sync(self.fetch_tickers(symbols))
+
+    def fetch_order_books_sync(self, symbol: str, limit: Optional[int] = None) -> Dict:
+        """Blocking version of fetch_order_books, safe to call from any thread"""
+        return self.run_sync(self.fetch_order_books(symbol, limit))
+
+    def fetch_prices(self, symbol: str, fallback_symbol: Optional[str] = None,
+                     skip_failed: bool = False, verbose: bool = True) -> Dict[str, Optional[Dict]]:
+        """
+        Blocking fetch returning the classic ``{exchange: price_dict}`` shape
+
+        Args:
+            symbol: Trading symbol
+            fallback_symbol: Symbol to try when the first one fails
+            skip_failed: Drop failed exchanges instead of mapping them to None
+            verbose: Print per-exchange errors
+
+        Returns:
+            Dictionary of exchange name -> price data
+        """
+        snapshot = self.fetch_snapshot_sync(symbol, fallback_symbol)
+
+        if verbose:
+            for name, error in snapshot['errors'].items():
+                print(f"Error fetching from {name}: {error}")
+
+        prices = snapshot['prices']
+        if skip_failed:
+            prices = {name: data for name, data in prices.items() if data}
+        return prices
+
+    async def close(self) -> None:
+        """Close all async exchange clients"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+    def close_sync(self) -> None:
+        """Close clients and stop the background loop"""
+        if self._loop is None:
+            return
+        self.run_sync(self.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+
+
+# Shared fetchers, one per exchange set, so markets are only loaded once
+_fetchers = {}
+_fetchers_lock = threading.Lock()
+
+
+def get_fetcher(exchanges: Dict, timeout: float = DEFAULT_TIMEOUT) -> AsyncPriceFetcher:
+    """Return the shared fetcher for this set of exchanges"""
+    key = (tuple((name, _exchange_id(ex)) for name, ex in exchanges.items()), timeout)
+
+    with _fetchers_lock:
+        fetcher = _fetchers.get(key)
+        if fetcher is None:
+            fetcher = AsyncPriceFetcher(exchanges, timeout=timeout)
+            _fetchers[key] = fetcher
+        return fetcher
+
+
+def fetch_prices(exchanges: Dict, symbol: str = 'BTC/USDT', fallback_symbol: Optional[str] = None,
+                 timeout: float = DEFAULT_TIMEOUT, skip_failed: bool = False,
+                 verbose: bool = True) -> Dict[str, Optional[Dict]]:
+    """Fetch a symbol from all exchanges concurrently (blocking helper)"""
+    return get_fetcher(exchanges, timeout).fetch_prices(
+        symbol, fallback_symbol, skip_failed=skip_failed, verbose=verbose
+    )
+
+
+def fetch_snapshot(exchanges: Dict, symbol: str = 'BTC/USDT', fallback_symbol: Optional[str] = None,
+                   timeout: float = DEFAULT_TIMEOUT) -> Dict:
+    """Fetch a timestamped snapshot from all exchanges concurrently (blocking helper)"""
+    return get_fetcher(exchanges, timeout).fetch_snapshot_sync(symbol, fallback_symbol)
+
+
+async def demo_fetcher():
+    """Demo: compare sequential-equivalent cost with concurrent snapshot latency"""
+    fetcher = AsyncPriceFetcher({'Binance': 'binance', 'Kraken': 'kraken', 'Coinbase': 'coinbase'})
+
+    try:
+        for _ in range(3):
+            snapshot = await fetcher.fetch_snapshot('BTC/USDT', fallback_symbol='BTC/USD')
+            per_exchange = {
+                name: data['latency_ms'] for name, data in snapshot['prices'].items() if data
+            }
+            print(f"\nSnapshot latency: {snapshot['latency_ms']:.0f} ms "
+                  f"(sum of venues: {sum(per_exchange.values()):.0f} ms)")
+            for name, data in snapshot['prices'].items():
+                if data:
+                    print(f"  {name:<10} bid ${data['bid']:<12.2f} ask ${data['ask']:<12.2f} "
+                          f"{data['latency_ms']:>6.0f} ms")
+                else:
+                    print(f"  {name:<10} ERROR: {snapshot['errors'][name][:60]}")
+    finally:
+        await fetcher.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(demo_fetcher())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Vectorized arbitrage backtester
+Aligns recorded per-exchange quotes onto one as-of timeline per symbol,
+builds the cross-exchange spread tensor with NumPy and sweeps fee and
+threshold grids over it, in parallel across cores
+"""
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from tick_replay import load_ticks
+except ImportError:  # imported as src.backtester
+    from src.tick_replay import load_ticks
+
+
+# Default parameter grid
+FEES = [0.05, 0.1, 0.2]              # Taker fee per trade (%), like fee_percent
+MIN_PROFITS = [0.0, 0.1, 0.3, 0.5]   # Net profit needed to count an opportunity (%), like MIN_PROFIT
+ALERT_THRESHOLDS = [0.5, 1.0]        # Net profit that raises an alert (%), like alert_threshold
+
+TRADE_SIZE_USD = 1000     # Notional per opportunity for theoretical PnL
+MAX_QUOTE_AGE = 5.0       # Seconds before an exchange's last quote is treated as missing
+CHUNK_BYTES = 64 * 1024 * 1024   # Working memory per evaluate_grid chunk
+CELL_BYTES = 2 * 8 + 3           # Per (row, pair, parameter set): two float64 temporaries and three masks
+
+
+def align_quotes(records: np.ndarray, n_exchanges: int, symbol_id: int,
+                 max_age: Optional[float] = MAX_QUOTE_AGE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    As-of join of one symbol's quotes across exchanges
+
+    At every tick, each exchange contributes its most recent quote (if it
+    is not older than max_age), the same view WebSocketPriceMonitor has.
+
+    Args:
+        records: TICK_DTYPE records in timestamp order
+        n_exchanges: Number of exchange ids
+        symbol_id: Symbol to align
+        max_age: Staleness limit in seconds (None disables)
+
+    Returns:
+        (timestamps (T,), bids (T, E), asks (T, E)); missing quotes are NaN
+    """
+    ticks = records[records['symbol'] == symbol_id]
+    timestamps = ticks['timestamp']
+    n = len(ticks)
+    rows = np.arange(n)
+
+    bids = np.full((n, n_exchanges), np.nan)
+    asks = np.full((n, n_exchanges), np.nan)
+    for exchange in range(n_exchanges):
+        # Index of the latest tick from this exchange at or before each row
+        last = np.maximum.accumulate(np.where(ticks['exchange'] == exchange, rows, -1))
+        valid = last >= 0
+        if max_age is not None:
+            valid &= (timestamps - timestamps[np.maximum(last, 0)]) <= max_age * 1e9
+        source = ticks[np.maximum(last, 0)]
+        valid &= (source['bid'] > 0) & (source['ask'] > 0)
+        bids[valid, exchange] = source['bid'][valid]
+        asks[valid, exchange] = source['ask'][valid]
+
+    # Several ticks can share a timestamp; keep the state after the last one
+    keep = np.append(timestamps[1:] != timestamps[:-1], True) if n else np.zeros(0, dtype=bool)
+    return timestamps[keep], bids[keep], asks[keep]
+
+
+def spread_tensor(bids: np.ndarray, asks: np.ndarray) -> np.ndarray:
+    """
+    Gross profit (%) of buying on one exchange and selling on another
+
+    Returns:
+        (T, E, E) array: [t, buy, sell] = (bid[sell] - ask[buy]) / ask[buy] * 100,
+        NaN on the diagonal and where a quote is missing
+    """
+    gross = (bids[:, None, :] - asks[:, :, None]) / asks[:, :, None] * 100
+    diagonal = np.arange(bids.shape[1])
+    gross[:, diagonal, diagonal] = np.nan
+    return gross
+
+
+def pair_series(gross: np.ndarray, exchanges: Sequence[str]) -> Tuple[np.ndarray, List[Tuple[str, str]]]:
+    """Flatten the (T, E, E) tensor to (T, pairs) with (buy, sell) labels"""
+    pairs = [(buy, sell) for buy in range(len(exchanges)) for sell in range(len(exchanges)) if buy != sell]
+    series = np.stack([gross[:, buy, sell] for buy, sell in pairs], axis=1) if pairs else gross.reshape(len(gross), 0)
+    return series, [(exchanges[buy], exchanges[sell]) for buy, sell in pairs]
+
+
+def parameter_grid(fees: Sequence[float] = FEES, min_profits: Sequence[float] = MIN_PROFITS,
+                   alert_thresholds: Sequence[float] = ALERT_THRESHOLDS) -> List[Dict]:
+    """Every combination of fee, minimum profit and alert threshold"""
+    return [{'fee_percent': fee, 'min_profit': min_profit, 'alert_threshold': alert}
+            for fee, min_profit, alert in itertools.product(fees, min_profits, alert_thresholds)]
+
+
+def chunk_rows(pairs: int, param_sets: int, chunk_bytes: int = CHUNK_BYTES) -> int:
+    """Timeline rows per chunk so the (rows, pairs, param_sets) temporaries fit in chunk_bytes"""
+    return max(1, chunk_bytes // (max(pairs, 1) * max(param_sets, 1) * CELL_BYTES))
+
+
+def evaluate_grid(gross: np.ndarray, dt: np.ndarray, params: List[Dict],
+                  chunk_bytes: int = CHUNK_BYTES) -> Dict[str, np.ndarray]:
+    """
+    Evaluate every parameter set against one symbol's pair series in one pass
+
+    An opportunity opens when a pair's net profit rises above min_profit and
+    stays open until it falls back, matching the monitor's per-tick
+    evaluation. PnL assumes one trade of TRADE_SIZE_USD at the moment it opens.
+
+    Args:
+        gross: (T, P) gross profit per pair in percent (NaN = no quote)
+        dt: (T,) seconds until the next timeline row
+        params: Parameter sets from parameter_grid()
+        chunk_bytes: Memory budget for the per-chunk (rows, P, K) temporaries
+
+    Returns:
+        Arrays of shape (K,): opportunities, alerts, open_seconds, net_pct_sum, best_net_pct
+    """
+    fee_cost = np.array([2 * p['fee_percent'] for p in params])
+    open_cutoff = fee_cost + np.array([p['min_profit'] for p in params])
+    alert_cutoff = fee_cost + np.array([p['alert_threshold'] for p in params])
+
+    k = len(params)
+    totals = {name: np.zeros(k) for name in ('opportunities', 'alerts', 'open_seconds', 'net_pct_sum')}
+    best_gross = np.full(k, -np.inf)
+    previous = np.zeros((gross.shape[1], k), dtype=bool)
+    rows = chunk_rows(gross.shape[1], k, chunk_bytes)
+
+    with np.errstate(invalid='ignore'):
+        for start in range(0, len(gross), rows):
+            chunk = gross[start:start + rows, :, None]          # (T, P, 1)
+            is_open = chunk > open_cutoff                              # (T, P, K); NaN -> closed
+
+            opened = is_open.copy()
+            opened[1:] &= ~is_open[:-1]
+            opened[0] &= ~previous
+            previous = is_open[-1]
+
+            opened_gross = np.where(opened, chunk, 0.0)
+            totals['opportunities'] += opened.sum(axis=(0, 1))
+            totals['alerts'] += (opened & (chunk >= alert_cutoff)).sum(axis=(0, 1))
+            totals['net_pct_sum'] += opened_gross.sum(axis=(0, 1))
+            totals['open_seconds'] += np.einsum('t,tk->k', dt[start:start + rows],
+                                                is_open.sum(axis=1, dtype=np.float64))
+            best_gross = np.maximum(best_gross, np.where(opened, chunk, -np.inf).max(axis=(0, 1)))
+
+    totals['net_pct_sum'] -= fee_cost * totals['opportunities']
+    totals['best_net_pct'] = best_gross - fee_cost
+    return totals
+
+
+# Per-process copy of the aligned series, set once by the pool initializer
+_WORKER_SERIES = None
+
+
+def _init_worker(series):
+    global _WORKER_SERIES
+    _WORKER_SERIES = series
+
+
+def _evaluate_params(params: List[Dict], series=None) -> List[Dict]:
+    """Run a slice of the grid over every symbol and summarize each parameter set"""
+    series = _WORKER_SERIES if series is None else series
+    results = [dict(p, opportunities=0, alerts=0, open_seconds=0.0, pnl_usd=0.0,
+                    best_net_pct=None, by_symbol={}) for p in params]
+
+    for symbol, (gross, dt) in series.items():
+        totals = evaluate_grid(gross, dt, params)
+        for i, result in enumerate(results):
+            count = int(totals['opportunities'][i])
+            result['opportunities'] += count
+            result['alerts'] += int(totals['alerts'][i])
+            result['open_seconds'] += float(totals['open_seconds'][i])
+            result['pnl_usd'] += float(totals['net_pct_sum'][i]) / 100 * TRADE_SIZE_USD
+            result['by_symbol'][symbol] = count
+            if count and (result['best_net_pct'] is None or totals['best_net_pct'][i] > result['best_net_pct']):
+                result['best_net_pct'] = float(totals['best_net_pct'][i])
+
+    for result in results:
+        result['avg_duration_s'] = result['open_seconds'] / result['opportunities'] if result['opportunities'] else 0.0
+    return results
+
+
+class Backtester:
+    """
+    Backtest fee/threshold settings over recorded ticks
+
+    The spread tensor is built once; every parameter set is then evaluated
+    with array operations instead of replaying calculate_arbitrage per tick.
+    """
+
+    def __init__(self, records: np.ndarray, exchanges: List[str], symbols: List[str],
+                 max_age: Optional[float] = MAX_QUOTE_AGE):
+        """
+        Align the recording and build the pair series for each symbol
+
+        Args:
+            records: TICK_DTYPE records in timestamp order (see tick_replay.load_ticks)
+            exchanges: Exchange names indexed by records['exchange']
+            symbols: Symbol names indexed by records['symbol']
+            max_age: Seconds before a quote is treated as stale (None disables)
+        """
+        self.exchanges = exchanges
+        self.symbols = symbols
+        self.ticks = len(records)
+        self.series = {}
+        self.pairs = {}
+
+        for symbol_id, symbol in enumerate(symbols):
+            timestamps, bids, asks = align_quotes(records, len(exchanges), symbol_id, max_age)
+            if len(timestamps) == 0:
+                continue
+            gross, pairs = pair_series(spread_tensor(bids, asks), exchanges)
+            dt = np.append(np.diff(timestamps) / 1e9, 0.0)
+            self.series[symbol] = (gross, dt)
+            self.pairs[symbol] = pairs
+
+    @classmethod
+    def from_files(cls, paths, max_age: Optional[float] = MAX_QUOTE_AGE) -> 'Backtester':
+        """Build a backtester from recordings (csv, ticklog or a Parquet tick store)"""
+        return cls(*load_ticks(paths), max_age=max_age)
+
+    def run(self, params: Optional[List[Dict]] = None, workers: Optional[int] = None) -> List[Dict]:
+        """
+        Evaluate a parameter grid
+
+        Args:
+            params: Parameter sets (default: parameter_grid())
+            workers: Worker processes (default: one per core; 1 runs in-process)
+
+        Returns:
+            One result per parameter set, in grid order
+        """
+        params = params if params is not None else parameter_grid()
+        workers = min(workers or os.cpu_count() or 1, len(params)) or 1
+
+        if workers == 1:
+            return _evaluate_params(params, self.series)
+
+        chunk = -(-len(params) // workers)
+        slices = [params[i:i + chunk] for i in range(0, len(params), chunk)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.series,)) as pool:
+            return [result for part in pool.map(_evaluate_params, slices) for result in part]
+
+
+def display_results(results: List[Dict], limit: int = 20) -> None:
+    """Print the parameter sets ranked by theoretical PnL"""
+    print("\n" + "=" * 100)
+    print(f"{'Fee %':>7} {'Min %':>7} {'Alert %':>8} {'Opps':>8} {'Alerts':>8} "
+          f"{'Avg dur (s)':>12} {'Best net %':>11} {'PnL (USD)':>12}")
+    print("-" * 100)
+    for result in sorted(results, key=lambda r: r['pnl_usd'], reverse=True)[:limit]:
+        best = f"{result['best_net_pct']:.3f}" if result['best_net_pct'] is not None else '-'
+        print(f"{result['fee_percent']:>7.3f} {result['min_profit']:>7.3f} {result['alert_threshold']:>8.3f} "
+              f"{result['opportunities']:>8,} {result['alerts']:>8,} {result['avg_duration_s']:>12.3f} "
+              f"{best:>11} {result['pnl_usd']:>12,.2f}")
+    print("=" * 100)
+
+
+def main():
+    """Backtest a parameter grid over recorded ticks"""
+    parser = argparse.ArgumentParser(description='Sweep fee/threshold settings over recorded ticks')
+    parser.add_argument('paths', nargs='+', help='prices_*.csv, *.ticklog files or a Parquet tick store directory')
+    parser.add_argument('--fees', type=float, nargs='+', default=FEES, help='Fee per trade (%%)')
+    parser.add_argument('--min-profits', type=float, nargs='+', default=MIN_PROFITS, help='Minimum net profit (%%)')
+    parser.add_argument('--alerts', type=float, nargs='+', default=ALERT_THRESHOLDS, help='Alert thresholds (%%)')
+    parser.add_argument('--max-age', type=float, default=MAX_QUOTE_AGE, help='Quote staleness limit in seconds')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    backtester = Backtester.from_files(args.paths, max_age=args.max_age)
+    rows = sum(len(dt) for _, dt in backtester.series.values())
+    print(f"📊 Aligned {backtester.ticks:,} ticks into {rows:,} timeline rows for "
+          f"{len(backtester.series)} symbol(s) in {time.perf_counter() - started:.2f}s")
+
+    params = parameter_grid(args.fees, args.min_profits, args.alerts)
+    started = time.perf_counter()
+    results = backtester.run(params, workers=args.workers)
+    print(f"⚡ Evaluated {len(params)} parameter sets in {time.perf_counter() - started:.2f}s")
+
+    display_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Ingest and detection benchmark suite
+Times the hot paths (message decode, quote updates, arbitrage detection,
+analyzer writes and history loads, dashboard serialization), saves the
+results as a JSON baseline and flags regressions against a saved one
+"""
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    from websocket_monitor import WebSocketPriceMonitor, to_kraken_pair, to_coinbase_product, to_binance_stream
+    from arbitrage_analyzer import ArbitrageAnalyzer
+except ImportError:  # imported as src.benchmark_suite
+    from src.websocket_monitor import WebSocketPriceMonitor, to_kraken_pair, to_coinbase_product, to_binance_stream
+    from src.arbitrage_analyzer import ArbitrageAnalyzer
+
+
+BASELINE_FILE = 'data/benchmarks/baseline.json'
+TOLERANCE = 0.10          # Flag results more than 10% slower than the baseline...
+NOISE_FACTOR = 1.0        # ...or the two runs' combined spread, whichever is larger
+REPEAT = 7                # Samples per benchmark; the median is compared
+MIN_SAMPLE_SECONDS = 0.5  # Each sample calls the benchmark until this much time was measured
+
+SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'BNB/USDT', 'XRP/USDT',
+           'ADA/USDT', 'AVAX/USDT', 'DOT/USDT', 'LINK/USDT', 'LTC/USDT']
+EXCHANGES = ['binance', 'kraken', 'coinbase', 'kucoin', 'gemini']
+
+# Benchmark registry: name -> function(scale, workdir) returning (operations, seconds)
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark function"""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def _quote(price: float, rng: random.Random) -> Dict:
+    mid = price * (1 + rng.gauss(0, 0.002))
+    return {'bid': mid * 0.9999, 'ask': mid * 1.0001, 'last': mid, 'volume': 1000.0, 'timestamp': datetime.now()}
+
+
+def _monitor(workdir: Path, symbols: List[str]) -> WebSocketPriceMonitor:
+    data_dir = workdir / f"monitor_{len(list(workdir.iterdir()))}"
+    data_dir.mkdir()
+    return WebSocketPriceMonitor(symbols=symbols, data_dir=str(data_dir))
+
+
+def _close(monitor: WebSocketPriceMonitor) -> None:
+    monitor.tick_recorder.close()
+    monitor.journal.close()
+
+
+@benchmark('ws_decode')
+def bench_ws_decode(scale: float, workdir: Path):
+    """Parse Binance, Kraken and Coinbase ticker messages the way the connect_* loops do"""
+    binance = json.dumps({'stream': 'btcusdt@ticker', 'data': {
+        'e': '24hrTicker', 's': 'BTCUSDT', 'b': '50000.10', 'a': '50000.20', 'c': '50000.15', 'v': '1234.5'}})
+    kraken = json.dumps([0, {'a': ['50000.2', 1, '1.0'], 'b': ['50000.1', 1, '1.0'],
+                             'c': ['50000.15', '0.1'], 'v': ['100.0', '1234.5']}, 'ticker', 'XBT/USDT'])
+    coinbase = json.dumps({'type': 'ticker', 'product_id': 'BTC-USD', 'price': '50000.15',
+                           'best_bid': '50000.10', 'best_ask': '50000.20', 'volume_24h': '1234.5'})
+    streams = {to_binance_stream('BTC/USDT'): 'BTC/USDT'}
+    pairs = {to_kraken_pair('BTC/USDT'): 'BTC/USDT'}
+    products = {to_coinbase_product('BTC/USDT'): 'BTC/USDT'}
+
+    n = int(100_000 * scale)
+    started = time.perf_counter()
+    for _ in range(n):
+        message = json.loads(binance)
+        symbol = streams.get(message.get('stream', '').split('@')[0])
+        data = message['data']
+        float(data['b']), float(data['a']), float(data['c']), float(data['v'])
+
+        data = json.loads(kraken)
+        symbol = pairs.get(data[3])
+        ticker = data[1]
+        float(ticker['b'][0]), float(ticker['a'][0]), float(ticker['c'][0]), float(ticker['v'][1])
+
+        data = json.loads(coinbase)
+        symbol = products.get(data.get('product_id'))
+        float(data.get('best_bid', 0)), float(data.get('best_ask', 0)), float(data.get('price', 0))
+    return n * 3, time.perf_counter() - started
+
+
+@benchmark('quote_update')
+def bench_quote_update(scale: float, workdir: Path):
+    """WebSocketPriceMonitor.update_quote: store, evaluate affected pairs, enqueue the tick"""
+    rng = random.Random(1)
+    monitor = _monitor(workdir, SYMBOLS[:3])
+    updates = [(rng.choice(SYMBOLS[:3]), rng.choice(['binance', 'kraken', 'coinbase']), _quote(100, rng))
+               for _ in range(10_000)]
+
+    n = int(100_000 * scale)
+    started = time.perf_counter()
+    for i in range(n):
+        symbol, exchange, quote = updates[i % len(updates)]
+        monitor.update_quote(symbol, exchange, quote['bid'], quote['ask'], quote['last'], quote['volume'])
+    elapsed = time.perf_counter() - started
+    _close(monitor)
+    return n, elapsed
+
+
+@benchmark('calculate_arbitrage')
+def bench_calculate_arbitrage(scale: float, workdir: Path):
+    """calculate_arbitrage over len(EXCHANGES) exchanges x len(SYMBOLS) symbols, without journal writes"""
+    rng = random.Random(2)
+    monitor = _monitor(workdir, SYMBOLS)
+    # Every hit would be appended to the journal; record_opportunity times writes separately
+    monitor.log_arbitrage = lambda opportunity: None
+    for symbol in SYMBOLS:
+        monitor.quotes[symbol] = {exchange: _quote(100, rng) for exchange in EXCHANGES}
+
+    n = int(2_000 * scale)
+    started = time.perf_counter()
+    for _ in range(n):
+        monitor.calculate_arbitrage(0.1)
+    elapsed = time.perf_counter() - started
+    _close(monitor)
+    return n, elapsed
+
+
+def _opportunity(rng: random.Random) -> Dict:
+    buy, sell = rng.sample(EXCHANGES, 2)
+    buy_price = 100 * (1 + rng.uniform(-0.002, 0.002))
+    sell_price = buy_price * (1 + rng.uniform(0.0001, 0.008))
+    gross = (sell_price - buy_price) / buy_price * 100
+    return {'buy_from': buy, 'sell_to': sell, 'buy_price': buy_price, 'sell_price': sell_price,
+            'gross_profit_pct': gross, 'net_profit_pct': gross - 0.2}
+
+
+@benchmark('record_opportunity')
+def bench_record_opportunity(scale: float, workdir: Path):
+    """ArbitrageAnalyzer.record_opportunity writes per second"""
+    rng = random.Random(3)
+    data_dir = workdir / 'analyzer_record'
+    data_dir.mkdir(exist_ok=True)
+    analyzer = ArbitrageAnalyzer(data_dir=str(data_dir))
+    opportunities = [_opportunity(rng) for _ in range(1000)]
+
+    n = int(20_000 * scale)
+    started = time.perf_counter()
+    for i in range(n):
+        analyzer.record_opportunity(SYMBOLS[i % len(SYMBOLS)], opportunities[i % len(opportunities)])
+    return n, time.perf_counter() - started
+
+
+def _history(workdir: Path, rows: int) -> ArbitrageAnalyzer:
+    """Analyzer whose history file holds `rows` records from the last 24 hours (built once per run)"""
+    data_dir = workdir / f"analyzer_history_{rows}"
+    if not data_dir.exists():
+        data_dir.mkdir()
+        rng = random.Random(4)
+        now = datetime.now()
+        with open(data_dir / 'arbitrage_history.jsonl', 'w') as f:
+            for i in range(rows):
+                record = _opportunity(rng)
+                record['timestamp'] = (now - timedelta(seconds=86_000 * i / rows)).isoformat()
+                record['symbol'] = SYMBOLS[i % len(SYMBOLS)]
+                f.write(json.dumps(record) + '\n')
+    return ArbitrageAnalyzer(data_dir=str(data_dir))
+
+
+@benchmark('load_history')
+def bench_load_history(scale: float, workdir: Path):
+    """ArbitrageAnalyzer.load_history rows per second on a 1M-row history"""
+    rows = int(1_000_000 * scale)
+    analyzer = _history(workdir, rows)
+    started = time.perf_counter()
+    loaded = analyzer.load_history(hours=24)
+    return len(loaded), time.perf_counter() - started
+
+
+@benchmark('get_statistics')
+def bench_get_statistics(scale: float, workdir: Path):
+    """ArbitrageAnalyzer.get_statistics rows per second on a 1M-row history"""
+    rows = int(1_000_000 * scale)
+    analyzer = _history(workdir, rows)
+    started = time.perf_counter()
+    stats = analyzer.get_statistics(hours=24)
+    return stats['total_opportunities'], time.perf_counter() - started
+
+
+@benchmark('api_data')
+def bench_api_data(scale: float, workdir: Path):
+    """Serialize a multi-coin dashboard /api/data payload (25 coins x 5 exchanges) with jsonify"""
+    from flask import Flask, jsonify
+
+    rng = random.Random(5)
+    coins = [f"COIN{i}/USDT" for i in range(25)]
+    coin_data = {}
+    for symbol in coins:
+        prices = {exchange: {key: value for key, value in _quote(100, rng).items() if key != 'timestamp'}
+                  for exchange in EXCHANGES}
+        opportunities = [dict(_opportunity(rng), symbol=symbol) for _ in range(3)]
+        coin_data[symbol] = {'prices': prices, 'opportunities': opportunities,
+                             'stats': {'symbol': symbol, 'avg_price': 100.0, 'min_price': 99.0, 'max_price': 101.0,
+                                       'spread_pct': 2.0, 'exchanges_online': len(EXCHANGES)}}
+    payload = {
+        'all_opportunities': [o for data in coin_data.values() for o in data['opportunities']][:20],
+        'coin_data': coin_data,
+        'stats': {'total_coins': len(coins), 'coins_with_opps': len(coins), 'total_opps': 75, 'best_profit': 0.5},
+        'last_update': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'iteration': 1,
+        'demo_mode': False,
+    }
+
+    app = Flask(__name__)
+    n = int(2_000 * scale)
+    with app.test_request_context('/api/data'):
+        started = time.perf_counter()
+        for _ in range(n):
+            jsonify(payload).get_data()
+        elapsed = time.perf_counter() - started
+    return n, elapsed
+
+
+def _sample(fn: Callable, scale: float, workdir: Path, min_seconds: float):
+    """Call a benchmark until at least min_seconds were measured; returns (ops, seconds) summed"""
+    total_ops, total_seconds = 0, 0.0
+    while total_seconds < min_seconds or not total_ops:
+        ops, seconds = fn(scale, workdir)
+        total_ops += ops
+        total_seconds += seconds
+        if not ops:
+            break
+    return total_ops, total_seconds
+
+
+def run_suite(names: Optional[List[str]] = None, scale: float = 1.0, repeat: int = REPEAT,
+              min_seconds: float = MIN_SAMPLE_SECONDS) -> Dict:
+    """
+    Run benchmarks and keep the median of `repeat` samples for each
+
+    Args:
+        names: Benchmarks to run (default: all)
+        scale: Multiplier on operation counts and history sizes (0.1 for a quick run)
+        repeat: Samples per benchmark (one warm-up sample is run first and discarded)
+        min_seconds: Minimum measured time per sample; short benchmarks are called repeatedly
+
+    Returns:
+        Baseline-shaped dict: {'meta': {...}, 'results': {name: {'ops_per_second', 'spread',
+        'samples', 'ops', 'seconds'}}}, where spread is half the samples' range
+        relative to the median
+    """
+    names = names or list(BENCHMARKS)
+    results = {}
+    workdir = Path(tempfile.mkdtemp(prefix='arb_bench_'))
+
+    try:
+        for name in names:
+            _sample(BENCHMARKS[name], scale, workdir, 0)
+            samples, ops, seconds = [], 0, 0.0
+            for _ in range(max(repeat, 1)):
+                sample_ops, sample_seconds = _sample(BENCHMARKS[name], scale, workdir, min_seconds)
+                samples.append(sample_ops / sample_seconds if sample_seconds else 0.0)
+                ops += sample_ops
+                seconds += sample_seconds
+
+            median = statistics.median(samples)
+            spread = (max(samples) - min(samples)) / 2 / median if median else 0.0
+            results[name] = {'ops_per_second': median, 'spread': spread, 'samples': samples,
+                             'ops': ops, 'seconds': seconds}
+            print(f"  {name:<22} {median:>14,.0f} ops/s  ±{spread * 100:4.1f}%  ({ops:,} ops in {seconds:.3f}s)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'scale': scale,
+            'repeat': repeat,
+            'min_seconds': min_seconds,
+        },
+        'results': results,
+    }
+
+
+def save_baseline(report: Dict, path: str = BASELINE_FILE) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Baseline saved to {path}")
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float = TOLERANCE,
+            noise_factor: float = NOISE_FACTOR) -> List[Dict]:
+    """
+    Compare a run's medians against a baseline
+
+    A benchmark regresses when its median throughput drops by more than
+    the larger of `tolerance` and noise_factor x (baseline spread + current
+    spread), so a noisy benchmark needs a bigger drop to be flagged.
+
+    Returns:
+        One row per benchmark present in both, with change_pct, threshold_pct
+        and a regression flag
+    """
+    rows = []
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or not base['ops_per_second']:
+            continue
+        change = result['ops_per_second'] / base['ops_per_second'] - 1
+        # Baselines saved before spreads were recorded fall back to the fixed tolerance
+        threshold = max(tolerance, noise_factor * (base.get('spread', 0.0) + result.get('spread', 0.0)))
+        rows.append({
+            'name': name,
+            'baseline': base['ops_per_second'],
+            'current': result['ops_per_second'],
+            'change_pct': change * 100,
+            'threshold_pct': threshold * 100,
+            'regression': change < -threshold,
+        })
+    return rows
+
+
+def display_comparison(rows: List[Dict], tolerance: float) -> None:
+    print(f"\n{'Benchmark':<22} {'Baseline':>14} {'Current':>14} {'Change':>9} {'Allowed':>9}")
+    print("-" * 74)
+    for row in rows:
+        flag = '❌ REGRESSION' if row['regression'] else ('✅' if row['change_pct'] >= 0 else '')
+        print(f"{row['name']:<22} {row['baseline']:>14,.0f} {row['current']:>14,.0f} {row['change_pct']:>+8.1f}% "
+              f"{-row['threshold_pct']:>+8.1f}% {flag}")
+    regressions = sum(row['regression'] for row in rows)
+    print(f"\n{regressions} regression(s) beyond the noise-adjusted threshold (at least {tolerance * 100:.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ingest and detection hot paths')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--scale', type=float, default=1.0, help='Work multiplier (e.g. 0.1 for a quick run)')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='Samples per benchmark (median is kept)')
+    parser.add_argument('--min-seconds', type=float, default=MIN_SAMPLE_SECONDS,
+                        help='Minimum measured time per sample')
+    parser.add_argument('--save', nargs='?', const=BASELINE_FILE, help='Save results as a baseline')
+    parser.add_argument('--compare', nargs='?', const=BASELINE_FILE, help='Compare against a saved baseline')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='Minimum allowed slowdown (0.10 = 10%%); noisy benchmarks get more')
+    parser.add_argument('--noise-factor', type=float, default=NOISE_FACTOR,
+                        help='Allowed slowdown as a multiple of the combined sample spread')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('scale') != args.scale:
+            print(f"⚠️  Baseline was recorded at scale {baseline['meta'].get('scale')}, running at {args.scale}")
+
+    print(f"⏱️  Running {len(args.only or BENCHMARKS)} benchmark(s) at scale {args.scale}")
+    report = run_suite(args.only, scale=args.scale, repeat=args.repeat, min_seconds=args.min_seconds)
+
+    if args.save:
+        save_baseline(report, args.save)
+
+    if baseline:
+        rows = compare(report, baseline, args.tolerance, args.noise_factor)
+        display_comparison(rows, args.tolerance)
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
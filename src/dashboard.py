@@ -8,6 +8,9 @@ from flask import Flask, render_template, jsonify
 import ccxt
 import time
 from datetime import datetime
+from async_fetcher import get_fetcher
+from metrics import metrics_response, observe_update_loop
+from spread_engine import find_opportunities
 import threading
 import json
 
@@ -38,72 +41,13 @@ UPDATE_INTERVAL = 10  # seconds
 
 
 def fetch_prices(symbol=SYMBOL):
-    """Fetch current price for a symbol from multiple exchanges"""
-    prices = {}
-
-    for exchange_name, exchange in exchanges.items():
-        try:
-            ticker = exchange.fetch_ticker(symbol)
-            prices[exchange_name] = {
-                'bid': ticker['bid'],
-                'ask': ticker['ask'],
-                'last': ticker['last'],
-                'timestamp': ticker['timestamp']
-            }
-        except Exception as e:
-            print(f"Error fetching from {exchange_name}: {e}")
-            prices[exchange_name] = None
-
-    return prices
+    """Fetch current price for a symbol from all exchanges concurrently"""
+    return get_fetcher(exchanges).fetch_prices(symbol)
 
 
 def calculate_arbitrage(prices, fee_percent=FEE_PERCENT):
-    """Calculate potential arbitrage opportunities"""
-    opportunities = []
-    exchange_names = list(prices.keys())
-
-    for i, buy_exchange in enumerate(exchange_names):
-        for sell_exchange in exchange_names[i+1:]:
-            if prices[buy_exchange] and prices[sell_exchange]:
-                buy_price = prices[buy_exchange]['ask']
-                sell_price = prices[sell_exchange]['bid']
-
-                # Calculate profit percentage after fees
-                gross_profit = ((sell_price - buy_price) / buy_price) * 100
-                fees = fee_percent * 2  # Buy fee + sell fee
-                net_profit = gross_profit - fees
-
-                if net_profit > 0:
-                    opportunities.append({
-                        'buy_from': buy_exchange,
-                        'sell_to': sell_exchange,
-                        'buy_price': buy_price,
-                        'sell_price': sell_price,
-                        'gross_profit_pct': gross_profit,
-                        'net_profit_pct': net_profit
-                    })
-
-                # Also check reverse direction
-                buy_price_reverse = prices[sell_exchange]['ask']
-                sell_price_reverse = prices[buy_exchange]['bid']
-
-                gross_profit_reverse = ((sell_price_reverse - buy_price_reverse) / buy_price_reverse) * 100
-                net_profit_reverse = gross_profit_reverse - fees
-
-                if net_profit_reverse > 0:
-                    opportunities.append({
-                        'buy_from': sell_exchange,
-                        'sell_to': buy_exchange,
-                        'buy_price': buy_price_reverse,
-                        'sell_price': sell_price_reverse,
-                        'gross_profit_pct': gross_profit_reverse,
-                        'net_profit_pct': net_profit_reverse
-                    })
-
-    # Sort by net profit descending
-    opportunities.sort(key=lambda x: x['net_profit_pct'], reverse=True)
-
-    return opportunities
+    """Calculate potential arbitrage opportunities, best first"""
+    return find_opportunities(prices, fee_percent)
 
 
 def update_data_loop():
@@ -113,6 +57,7 @@ def update_data_loop():
 
     while True:
         try:
+            started = time.perf_counter()
             iteration += 1
 
             # Fetch prices
@@ -127,6 +72,7 @@ def update_data_loop():
                 latest_data['opportunities'] = opportunities
                 latest_data['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 latest_data['iteration'] = iteration
+            observe_update_loop('dashboard', started, len(opportunities))
 
             print(f"[{datetime.now().strftime('%H:%M:%S')}] Update #{iteration} - Found {len(opportunities)} opportunities")
 
@@ -160,6 +106,12 @@ def health():
     return jsonify({'status': 'ok', 'timestamp': datetime.now().isoformat()})
 
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint"""
+    return metrics_response()
+
+
 if __name__ == '__main__':
     print("🚀 Crypto Arbitrage Bot Dashboard")
     print("="*60)
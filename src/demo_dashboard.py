@@ -8,6 +8,9 @@ from flask import Flask, render_template, jsonify, request
 import ccxt
 import time
 from datetime import datetime
+from async_fetcher import get_fetcher
+from metrics import metrics_response, observe_update_loop
+from spread_engine import find_opportunities
 import threading
 from collections import deque
 import random
@@ -99,29 +102,11 @@ def add_demo_variation(prices):
 
 def fetch_prices(symbol=SYMBOL, demo_mode=False):
     """Fetch prices, with optional demo variations"""
-    prices = {}
-
-    for exchange_name, exchange in exchanges.items():
-        try:
-            ticker = exchange.fetch_ticker(symbol)
-            prices[exchange_name] = {
-                'bid': ticker['bid'],
-                'ask': ticker['ask'],
-                'last': ticker['last'],
-                'timestamp': ticker['timestamp']
-            }
-        except Exception:
-            # Try USD version
-            try:
-                ticker = exchange.fetch_ticker(symbol.replace('USDT', 'USD'))
-                prices[exchange_name] = {
-                    'bid': ticker['bid'],
-                    'ask': ticker['ask'],
-                    'last': ticker['last'],
-                    'timestamp': ticker['timestamp']
-                }
-            except:
-                pass
+    # Try USD version if USDT fails
+    prices = get_fetcher(exchanges).fetch_prices(
+        symbol, fallback_symbol=symbol.replace('USDT', 'USD'),
+        skip_failed=True, verbose=False
+    )
 
     # Apply demo variations if in demo mode
     if demo_mode:
@@ -131,50 +116,8 @@ def fetch_prices(symbol=SYMBOL, demo_mode=False):
 
 
 def calculate_arbitrage(prices, fee_percent=FEE_PERCENT):
-    """Calculate arbitrage opportunities"""
-    opportunities = []
-    exchange_names = list(prices.keys())
-
-    for i, buy_exchange in enumerate(exchange_names):
-        for sell_exchange in exchange_names[i+1:]:
-            if prices[buy_exchange] and prices[sell_exchange]:
-                # Forward direction
-                buy_price = prices[buy_exchange]['ask']
-                sell_price = prices[sell_exchange]['bid']
-
-                gross_profit = ((sell_price - buy_price) / buy_price) * 100
-                fees = fee_percent * 2
-                net_profit = gross_profit - fees
-
-                if net_profit > 0:
-                    opportunities.append({
-                        'buy_from': buy_exchange,
-                        'sell_to': sell_exchange,
-                        'buy_price': buy_price,
-                        'sell_price': sell_price,
-                        'gross_profit_pct': gross_profit,
-                        'net_profit_pct': net_profit
-                    })
-
-                # Reverse direction
-                buy_price_reverse = prices[sell_exchange]['ask']
-                sell_price_reverse = prices[buy_exchange]['bid']
-
-                gross_profit_reverse = ((sell_price_reverse - buy_price_reverse) / buy_price_reverse) * 100
-                net_profit_reverse = gross_profit_reverse - fees
-
-                if net_profit_reverse > 0:
-                    opportunities.append({
-                        'buy_from': sell_exchange,
-                        'sell_to': buy_exchange,
-                        'buy_price': buy_price_reverse,
-                        'sell_price': sell_price_reverse,
-                        'gross_profit_pct': gross_profit_reverse,
-                        'net_profit_pct': net_profit_reverse
-                    })
-
-    opportunities.sort(key=lambda x: x['net_profit_pct'], reverse=True)
-    return opportunities
+    """Calculate arbitrage opportunities, best first"""
+    return find_opportunities(prices, fee_percent)
 
 
 def calculate_spread_data(prices):
@@ -218,6 +161,7 @@ def update_data_loop():
     """Background thread to update data"""
     while True:
         try:
+            started = time.perf_counter()
             with data_lock:
                 demo_mode = latest_data['demo_mode']
 
@@ -232,6 +176,7 @@ def update_data_loop():
                 latest_data['spread_data'] = spread_data
                 latest_data['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 latest_data['iteration'] += 1
+            observe_update_loop('demo', started, len(opportunities))
 
         except Exception as e:
             print(f"Error in update loop: {e}")
@@ -295,6 +240,12 @@ def toggle_demo():
     return jsonify({'demo_mode': mode})
 
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint"""
+    return metrics_response()
+
+
 if __name__ == '__main__':
     print("\n" + "="*60)
     print("🎭 DEMO MODE CRYPTO ARBITRAGE DASHBOARD")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Depth-aware arbitrage calculator
+Walks the buy exchange's asks and the sell exchange's bids together to find
+the largest quantity that is still profitable after fees and the dollar PnL
+of trading it, for every exchange pair of a symbol in one vectorized pass
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from spread_engine import DEFAULT_FEE_PERCENT, Fees, fee_vector
+except ImportError:  # imported as src.depth_arbitrage
+    from src.spread_engine import DEFAULT_FEE_PERCENT, Fees, fee_vector
+
+
+DEPTH_LEVELS = 50          # Levels per side taken from each book
+
+
+def book_levels(book, depth: int = DEPTH_LEVELS) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Best `depth` levels of a book as arrays, best first
+
+    Args:
+        book: ccxt order book dict ({'bids': [[price, size, ...], ...], 'asks': ...})
+            or an order_book.OrderBook
+        depth: Maximum levels per side
+
+    Returns:
+        (bid prices, bid sizes, ask prices, ask sizes)
+    """
+    if isinstance(book, dict):
+        sides = []
+        for side in ('bids', 'asks'):
+            levels = (book.get(side) or [])[:depth]
+            levels = np.array(levels, dtype=np.float64) if levels else np.empty((0, 2))
+            sides += [levels[:, 0], levels[:, 1]]
+        return tuple(sides)
+
+    return (book.bids.prices[:depth], book.bids.sizes[:depth],
+            book.asks.prices[:depth], book.asks.sizes[:depth])
+
+
+def _stack(levels: List[Tuple[np.ndarray, ...]]) -> Tuple[np.ndarray, ...]:
+    """
+    Pad every exchange's levels to a common depth
+
+    Returns:
+        bid/ask prices shaped (exchanges, depth + 1) - the extra column and any
+        padding are sentinels (bid 0, ask inf) that are never profitable - and
+        bid/ask cumulative sizes shaped (exchanges, depth), flat after the last level
+    """
+    depth = max(1, max(max(len(bid_prices), len(ask_prices)) for bid_prices, _, ask_prices, _ in levels))
+    n = len(levels)
+
+    bid_prices = np.zeros((n, depth + 1))
+    ask_prices = np.full((n, depth + 1), np.inf)
+    bid_cum = np.zeros((n, depth))
+    ask_cum = np.zeros((n, depth))
+
+    for e, (bp, bs, ap, asz) in enumerate(levels):
+        for prices, sizes, price_out, cum_out in ((bp, bs, bid_prices, bid_cum), (ap, asz, ask_prices, ask_cum)):
+            k = len(prices)
+            if not k:
+                continue
+            price_out[e, :k] = prices
+            cum = np.cumsum(sizes)
+            cum_out[e, :k] = cum
+            cum_out[e, k:] = cum[-1]
+
+    return bid_prices, ask_prices, bid_cum, ask_cum
+
+
+def _searchsorted_rows(rows: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """searchsorted(rows[i], values[i], side='right') for every row at once (rows non-decreasing, finite, >= 0)"""
+    n, width = rows.shape
+    span = float(rows[:, -1].max(initial=0.0)) + float(np.max(values, initial=0.0)) + 1.0
+    offsets = np.arange(n) * span
+    flat = (rows + offsets[:, None]).ravel()
+    return np.searchsorted(flat, values + offsets, side='right') - np.arange(n) * width
+
+
+def evaluate_books(books: Dict[str, object], fees: Fees = DEFAULT_FEE_PERCENT,
+                   max_notional: Optional[float] = None, depth: int = DEPTH_LEVELS,
+                   symbol: Optional[str] = None) -> List[Dict]:
+    """
+    Executable arbitrage for every (buy exchange, sell exchange) pair of one symbol
+
+    For each pair the asks and bids are merged on their cumulative sizes, so
+    every segment of the merged grid has one buy price and one sell price.
+    The per-unit margin, bid * (1 - sell fee) - ask * (1 + buy fee), only
+    falls as quantity grows, so the profitable quantity is a prefix of the
+    grid; max_notional cuts it with a binary search on cumulative cost.
+
+    Args:
+        books: {exchange: ccxt order book dict or order_book.OrderBook}; None entries are skipped
+        fees: Taker fee (%) per trade, or {exchange: fee}
+        max_notional: Cap on the buy side's cost in quote currency (fees included)
+        depth: Maximum levels per side
+        symbol: Symbol to tag results with
+
+    Returns:
+        Profitable routes sorted by dollar PnL, each with quantity, average
+        and worst prices, cost, pnl_usd, pnl_pct and the top-of-book net %
+    """
+    exchanges = [name for name, book in books.items() if book is not None]
+    if len(exchanges) < 2:
+        return []
+
+    bid_prices, ask_prices, bid_cum, ask_cum = _stack([book_levels(books[name], depth) for name in exchanges])
+    fee = fee_vector(exchanges, fees) / 100
+
+    # Every ordered pair: buy on a, sell on b
+    a, b = np.nonzero(~np.eye(len(exchanges), dtype=bool))
+    width = ask_cum.shape[1]
+
+    # Merge the two cumulative-size ladders per pair; segment j ends at grid[:, j]
+    merged = np.concatenate([ask_cum[a], bid_cum[b]], axis=1)
+    order = np.argsort(merged, axis=1, kind='stable')
+    grid = np.take_along_axis(merged, order, axis=1)
+    is_ask = order < width
+    segment = np.diff(grid, axis=1, prepend=0.0)
+
+    # Level in force on each segment = breakpoints of that side passed before it
+    ask_level = np.cumsum(is_ask, axis=1) - is_ask
+    bid_level = np.arange(2 * width) - ask_level
+    buy_price = np.take_along_axis(ask_prices[a], ask_level, axis=1)
+    sell_price = np.take_along_axis(bid_prices[b], bid_level, axis=1)
+
+    buy_cost = buy_price * (1 + fee[a])[:, None]
+    margin = sell_price * (1 - fee[b])[:, None] - buy_cost
+    profitable = margin > 0                    # Non-increasing along the grid, so a prefix
+
+    # Per segment: quantity, cost with fees, buy notional, sell notional, PnL; zero past the prefix
+    per_unit = np.stack([np.ones_like(segment), buy_cost, buy_price, sell_price, margin])
+    with np.errstate(invalid='ignore'):
+        cum = np.cumsum(np.where(profitable, per_unit * segment, 0.0), axis=2)
+    last = profitable.sum(axis=1) - 1          # Last profitable segment
+
+    rows = np.arange(len(a))
+    k = last
+    if max_notional is not None:
+        # Segments fully affordable within max_notional
+        k = np.minimum(_searchsorted_rows(cum[1], np.full(len(a), float(max_notional))) - 1, last)
+
+    totals = np.where(k >= 0, cum[:, rows, np.maximum(k, 0)], 0.0)
+
+    # Part of the next segment that the remaining budget still buys
+    nxt = np.minimum(k + 1, 2 * width - 1)
+    partial = np.zeros(len(a))
+    if max_notional is not None:
+        room = max_notional - totals[1]
+        open_rows = (k < last) & (room > 0)
+        partial[open_rows] = np.minimum(room[open_rows] / buy_cost[rows, nxt][open_rows], segment[rows, nxt][open_rows])
+        totals[:, open_rows] += partial[open_rows] * per_unit[:, rows[open_rows], nxt[open_rows]]
+
+    filled, spent, bought, sold, profit = totals
+    worst = np.where(partial > 0, nxt, np.maximum(k, 0))
+
+    top_net = (bid_prices[b, 0] / ask_prices[a, 0] - 1) * 100 - (fee[a] + fee[b]) * 100
+
+    results = []
+    for i in np.flatnonzero((filled > 0) & (profit > 0)).tolist():
+        results.append({
+            'symbol': symbol,
+            'buy_from': exchanges[a[i]],
+            'sell_to': exchanges[b[i]],
+            'quantity': float(filled[i]),
+            'avg_buy_price': float(bought[i] / filled[i]),
+            'avg_sell_price': float(sold[i] / filled[i]),
+            'worst_buy_price': float(buy_price[i, worst[i]]),
+            'worst_sell_price': float(sell_price[i, worst[i]]),
+            'cost_usd': float(spent[i]),
+            'pnl_usd': float(profit[i]),
+            'pnl_pct': float(profit[i] / spent[i] * 100),
+            'top_of_book_net_pct': float(top_net[i]),
+        })
+
+    results.sort(key=lambda x: x['pnl_usd'], reverse=True)
+    return results
+
+
+def best_route(books: Dict[str, object], fees: Fees = DEFAULT_FEE_PERCENT,
+               max_notional: Optional[float] = None, symbol: Optional[str] = None) -> Optional[Dict]:
+    """Route with the highest dollar PnL, or None"""
+    routes = evaluate_books(books, fees, max_notional, symbol=symbol)
+    return routes[0] if routes else None
+
+
+def fetch_books(exchanges: Dict, symbol: str, limit: int = DEPTH_LEVELS) -> Dict[str, Optional[Dict]]:
+    """Fetch a symbol's order book from every exchange concurrently"""
+    try:
+        from async_fetcher import get_fetcher
+    except ImportError:  # imported as src.depth_arbitrage
+        from src.async_fetcher import get_fetcher
+
+    snapshot = get_fetcher(exchanges).fetch_order_books_sync(symbol, limit)
+    for name, error in snapshot['errors'].items():
+        print(f"  ❌ {name}: {error[:80]}")
+    return snapshot['books']
+
+
+def display_routes(symbol: str, routes: List[Dict], top_n: int = 10) -> None:
+    """Print routes ranked by dollar PnL next to their top-of-book percentage"""
+    print(f"\n{'='*110}")
+    print(f"💧 {symbol} - executable arbitrage by dollar PnL")
+    print(f"{'='*110}")
+    if not routes:
+        print("No profitable size on any route")
+        return
+
+    print(f"{'Route':<26} {'Quantity':>14} {'Avg buy':>13} {'Avg sell':>13} {'Cost':>14} "
+          f"{'PnL':>11} {'PnL %':>8} {'Top %':>8}")
+    print("-"*110)
+    for route in routes[:top_n]:
+        label = f"{route['buy_from']} → {route['sell_to']}"
+        print(f"{label:<26} {route['quantity']:>14.6f} ${route['avg_buy_price']:>12.4f} ${route['avg_sell_price']:>12.4f} "
+              f"${route['cost_usd']:>13,.2f} ${route['pnl_usd']:>10,.2f} {route['pnl_pct']:>7.3f}% "
+              f"{route['top_of_book_net_pct']:>7.3f}%")
+
+
+def demo_books() -> Dict[str, Dict]:
+    """A thin book with a wide spread next to deep books with a narrow one"""
+    rng = np.random.default_rng(4)
+
+    def book(mid, half_spread, level_size, levels=DEPTH_LEVELS, tick=0.5):
+        bids = [[mid - half_spread - i * tick, level_size * rng.uniform(0.5, 1.5)] for i in range(levels)]
+        asks = [[mid + half_spread + i * tick, level_size * rng.uniform(0.5, 1.5)] for i in range(levels)]
+        return {'bids': bids, 'asks': asks}
+
+    return {
+        'thin': book(50_300, 1, 0.0006),          # Bid ~0.6% above the others, ~$30 deep per level
+        'deep_a': book(50_000, 0.5, 4.0),         # ~$200k per level
+        'deep_b': book(50_170, 0.5, 4.0),         # ~0.34% above deep_a
+        'deep_c': book(50_020, 0.5, 2.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank cross-exchange arbitrage by executable dollar PnL')
+    parser.add_argument('symbols', nargs='*', default=['BTC/USDT'], help='Symbols to evaluate')
+    parser.add_argument('--fee', type=float, default=DEFAULT_FEE_PERCENT, help='Taker fee per trade (%%)')
+    parser.add_argument('--max-notional', type=float, default=None, help='Cap on the buy cost per route')
+    parser.add_argument('--depth', type=int, default=DEPTH_LEVELS, help='Levels per side')
+    parser.add_argument('--demo', action='store_true', help='Use synthetic books instead of fetching')
+    args = parser.parse_args()
+
+    if args.demo:
+        books = demo_books()
+        started = time.perf_counter()
+        for _ in range(1000):
+            routes = evaluate_books(books, args.fee, args.max_notional, args.depth, symbol='DEMO')
+        elapsed_us = (time.perf_counter() - started) * 1000
+        display_routes('DEMO', routes)
+        print(f"\n⏱️  {len(books) * (len(books) - 1)} routes x {args.depth} levels in {elapsed_us:.0f}µs")
+        return
+
+    import ccxt
+
+    exchanges = {'Binance': ccxt.binance(), 'Kraken': ccxt.kraken(), 'Coinbase': ccxt.coinbase()}
+    for symbol in args.symbols:
+        books = fetch_books(exchanges, symbol, args.depth)
+        display_routes(symbol, evaluate_books(books, args.fee, args.max_notional, args.depth, symbol=symbol))
+
+
+if __name__ == "__main__":
+    main()
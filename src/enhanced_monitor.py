@@ -7,27 +7,15 @@ Integrates the arbitrage analyzer with price monitoring
 import ccxt
 import time
 from datetime import datetime
+from async_fetcher import get_fetcher
 from arbitrage_analyzer import ArbitrageAnalyzer
+from metrics import OPPORTUNITIES, route, start_metrics_server
+from spread_engine import find_opportunities
 
 
 def fetch_prices(exchanges, symbol='BTC/USDT'):
-    """Fetch current price for a symbol from multiple exchanges"""
-    prices = {}
-
-    for exchange_name, exchange in exchanges.items():
-        try:
-            ticker = exchange.fetch_ticker(symbol)
-            prices[exchange_name] = {
-                'bid': ticker['bid'],
-                'ask': ticker['ask'],
-                'last': ticker['last'],
-                'timestamp': ticker['timestamp']
-            }
-        except Exception as e:
-            print(f"Error fetching from {exchange_name}: {e}")
-            prices[exchange_name] = None
-
-    return prices
+    """Fetch current price for a symbol from all exchanges concurrently"""
+    return get_fetcher(exchanges).fetch_prices(symbol)
 
 
 def calculate_arbitrage(prices, fee_percent=0.1):
@@ -35,47 +23,7 @@ def calculate_arbitrage(prices, fee_percent=0.1):
     Calculate potential arbitrage opportunities
     fee_percent: Trading fee percentage (default 0.1% = Binance fee)
     """
-    opportunities = []
-    exchange_names = list(prices.keys())
-
-    for i, buy_exchange in enumerate(exchange_names):
-        for sell_exchange in exchange_names[i+1:]:
-            if prices[buy_exchange] and prices[sell_exchange]:
-                buy_price = prices[buy_exchange]['ask']
-                sell_price = prices[sell_exchange]['bid']
-
-                # Calculate profit percentage after fees
-                gross_profit = ((sell_price - buy_price) / buy_price) * 100
-                fees = fee_percent * 2  # Buy fee + sell fee
-                net_profit = gross_profit - fees
-
-                opportunities.append({
-                    'buy_from': buy_exchange,
-                    'sell_to': sell_exchange,
-                    'buy_price': buy_price,
-                    'sell_price': sell_price,
-                    'gross_profit_pct': gross_profit,
-                    'net_profit_pct': net_profit
-                })
-
-                # Also check reverse direction
-                buy_price_reverse = prices[sell_exchange]['ask']
-                sell_price_reverse = prices[buy_exchange]['bid']
-
-                gross_profit_reverse = ((sell_price_reverse - buy_price_reverse) / buy_price_reverse) * 100
-                net_profit_reverse = gross_profit_reverse - fees
-
-                opportunities.append({
-                    'buy_from': sell_exchange,
-                    'sell_to': buy_exchange,
-                    'buy_price': buy_price_reverse,
-                    'sell_price': sell_price_reverse,
-                    'gross_profit_pct': gross_profit_reverse,
-                    'net_profit_pct': net_profit_reverse
-                })
-
-    # Only return profitable opportunities
-    return [opp for opp in opportunities if opp['net_profit_pct'] > 0]
+    return find_opportunities(prices, fee_percent)
 
 
 def display_prices(prices, symbol):
@@ -116,6 +64,7 @@ def main():
     print("🤖 Enhanced Crypto Arbitrage Bot")
     print("With Historical Analysis & Statistics")
     print("="*80 + "\n")
+    start_metrics_server()
 
     # Initialize exchanges (using public APIs, no authentication needed)
     exchanges = {
@@ -163,6 +112,7 @@ def main():
                 # Record opportunities in analyzer
                 for opp in opportunities:
                     analyzer.record_opportunity(symbol, opp)
+                    OPPORTUNITIES.labels(symbol=symbol, route=route(opp['buy_from'], opp['sell_to'])).inc()
 
             # Show any new alerts
             alerts = analyzer.get_alerts()
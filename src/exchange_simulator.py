@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Local exchange stand-in for load testing
+A WebSocket server that speaks the Binance combined-stream, Kraken and
+Coinbase ticker formats WebSocketPriceMonitor parses, at configurable
+message rates with optional bursts and dropped connections, and reports
+the rate it sustained and how far it fell behind schedule
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import websockets
+
+try:
+    from websocket_monitor import WebSocketPriceMonitor
+except ImportError:  # imported as src.exchange_simulator
+    from src.websocket_monitor import WebSocketPriceMonitor
+
+
+HOST = '127.0.0.1'
+PORT = 8765
+SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']
+START_PRICES = {'BTC': 50000.0, 'ETH': 3000.0, 'SOL': 100.0}
+
+RATE = 1000            # Messages per second per connection
+MAX_BATCH = 1000       # Most messages sent back-to-back before yielding
+LAG_WINDOW = 10000     # Recent lag samples kept for percentiles
+
+
+def _base_asset(target: str) -> str:
+    """Base asset of a Binance stream, Kraken pair or Coinbase product (btcusdt, XBT/USDT, BTC-USD -> BTC)"""
+    name = target.upper().replace('XBT', 'BTC').replace('XDG', 'DOGE')
+    for separator in ('/', '-'):
+        if separator in name:
+            return name.split(separator)[0]
+    for quote in ('USDT', 'USDC', 'USD'):
+        if name.endswith(quote):
+            return name[:-len(quote)]
+    return name
+
+
+class _Prices:
+    """Random-walk mid price per base asset, shared by every connection, with per-message skew so spreads open and close"""
+
+    def __init__(self, seed: int):
+        self.random = random.Random(seed)
+        self.mid = {}
+
+    def quote(self, target: str) -> Dict:
+        base = _base_asset(target)
+        mid = self.mid.get(base) or START_PRICES.get(base, 10.0)
+        mid = self.mid[base] = mid * (1 + self.random.gauss(0, 0.0001))
+        skew = mid * self.random.gauss(0, 0.001)
+        half_spread = mid * 0.00005
+        return {'bid': mid + skew - half_spread, 'ask': mid + skew + half_spread, 'last': mid + skew,
+                'volume': 1000 + self.random.random() * 100}
+
+
+def _request_path(websocket) -> str:
+    request = getattr(websocket, 'request', None)  # websockets >= 13
+    return request.path if request is not None else websocket.path
+
+
+class ExchangeSimulator:
+    """
+    Binance/Kraken/Coinbase stand-in
+
+    Each client connection gets its own paced stream: ``rate`` ticker
+    messages per second spread over the symbols it subscribed to, plus
+    ``burst_size`` extra messages every ``burst_interval`` seconds, and the
+    connection is dropped without a close frame every ``disconnect_interval``
+    seconds. Lag is how late a message went out relative to its schedule;
+    it grows once the client (or the network stack) can no longer keep up.
+    """
+
+    def __init__(self, host: str = HOST, port: int = PORT, rate: float = RATE,
+                 burst_size: int = 0, burst_interval: float = 0, disconnect_interval: float = 0,
+                 seed: int = 0):
+        """
+        Initialize the simulator
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on
+            rate: Messages per second per connection
+            burst_size: Extra messages sent at once every burst_interval
+            burst_interval: Seconds between bursts (0 disables)
+            disconnect_interval: Seconds between dropped connections (0 disables)
+            seed: Seed for the price random walk
+        """
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.burst_size = burst_size
+        self.burst_interval = burst_interval
+        self.disconnect_interval = disconnect_interval
+        self.seed = seed
+        self._prices = _Prices(seed)
+
+        self.stats = {exchange: {'connections': 0, 'disconnects': 0, 'sent': 0, 'lags_ms': [],
+                                 'first_send': None, 'last_send': None}
+                      for exchange in ('binance', 'kraken', 'coinbase')}
+        self._server = None
+
+    @property
+    def endpoints(self) -> Dict[str, str]:
+        """URLs to pass as WebSocketPriceMonitor(endpoints=...)"""
+        base = f"ws://{self.host}:{self.port}"
+        return {'binance': f"{base}/binance/stream", 'kraken': f"{base}/kraken", 'coinbase': f"{base}/coinbase"}
+
+    async def start(self) -> None:
+        self._server = await websockets.serve(self._handle, self.host, self.port, max_size=None)
+        print(f"🧪 Exchange simulator on ws://{self.host}:{self.port} ({self.rate:,.0f} msg/s per connection)")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, websocket, path: Optional[str] = None) -> None:
+        url = urlparse(path or _request_path(websocket))
+        try:
+            if url.path.startswith('/binance'):
+                streams = parse_qs(url.query).get('streams', [''])[0].split('/')
+                targets = [stream.split('@')[0] for stream in streams if stream]
+                await self._stream(websocket, 'binance', targets, self._binance_message)
+            elif url.path.startswith('/kraken'):
+                subscribe = json.loads(await websocket.recv())
+                pairs = subscribe.get('pair', [])
+                for channel_id, pair in enumerate(pairs):
+                    await websocket.send(json.dumps({
+                        'event': 'subscriptionStatus', 'status': 'subscribed', 'channelID': channel_id,
+                        'pair': pair, 'subscription': {'name': 'ticker'}
+                    }))
+                await self._stream(websocket, 'kraken', pairs, self._kraken_message)
+            elif url.path.startswith('/coinbase'):
+                subscribe = json.loads(await websocket.recv())
+                products = subscribe.get('product_ids', [])
+                await websocket.send(json.dumps({
+                    'type': 'subscriptions', 'channels': [{'name': 'ticker', 'product_ids': products}]
+                }))
+                await self._stream(websocket, 'coinbase', products, self._coinbase_message)
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _stream(self, websocket, exchange: str, targets: List[str], render) -> None:
+        """Send paced ticker messages round-robin over the subscribed targets"""
+        if not targets:
+            return
+
+        stats = self.stats[exchange]
+        stats['connections'] += 1
+        prices = self._prices
+        lags = stats['lags_ms']
+
+        started = time.perf_counter()
+        if stats['first_send'] is None:
+            stats['first_send'] = started
+        next_burst = started + self.burst_interval if self.burst_interval else None
+        disconnect_at = started + self.disconnect_interval if self.disconnect_interval else None
+        sent = 0
+        extra = 0  # Burst messages, sent on top of the schedule
+
+        while True:
+            now = time.perf_counter()
+            if disconnect_at and now >= disconnect_at:
+                stats['disconnects'] += 1
+                websocket.transport.abort()  # Drop without a close frame, like a network failure
+                return
+
+            if next_burst and now >= next_burst:
+                extra += self.burst_size
+                next_burst += self.burst_interval
+
+            due = int((now - started) * self.rate) - sent
+            batch = min(due + extra, MAX_BATCH)
+            if batch <= 0:
+                await asyncio.sleep(max(0.0005, (sent + 1) / self.rate - (now - started)))
+                continue
+
+            if due > 0:
+                lag_ms = (now - started - sent / self.rate) * 1000
+                lags.append(lag_ms)
+                if len(lags) > LAG_WINDOW:
+                    del lags[:len(lags) - LAG_WINDOW]
+
+            for i in range(batch):
+                target = targets[(sent + i) % len(targets)]
+                await websocket.send(render(target, prices.quote(target)))
+
+            scheduled = min(batch, max(due, 0))
+            sent += scheduled
+            extra -= batch - scheduled
+            stats['sent'] += batch
+            stats['last_send'] = time.perf_counter()
+
+    def _binance_message(self, stream: str, quote: Dict) -> str:
+        return json.dumps({'stream': f"{stream}@ticker", 'data': {
+            'e': '24hrTicker', 'E': int(time.time() * 1000), 's': stream.upper(),
+            'b': f"{quote['bid']:.8f}", 'a': f"{quote['ask']:.8f}",
+            'c': f"{quote['last']:.8f}", 'v': f"{quote['volume']:.8f}",
+        }})
+
+    def _kraken_message(self, pair: str, quote: Dict) -> str:
+        return json.dumps([0, {
+            'a': [f"{quote['ask']:.5f}", 1, '1.000'], 'b': [f"{quote['bid']:.5f}", 1, '1.000'],
+            'c': [f"{quote['last']:.5f}", '0.1'], 'v': ['100.0', f"{quote['volume']:.5f}"],
+        }, 'ticker', pair])
+
+    def _coinbase_message(self, product: str, quote: Dict) -> str:
+        return json.dumps({
+            'type': 'ticker', 'product_id': product, 'price': f"{quote['last']:.8f}",
+            'best_bid': f"{quote['bid']:.8f}", 'best_ask': f"{quote['ask']:.8f}",
+            'volume_24h': f"{quote['volume']:.8f}", 'time': datetime.now(timezone.utc).isoformat(),
+        })
+
+    def report(self) -> Dict:
+        """Sustained rate (over the time clients were connected) and schedule lag per exchange"""
+        report = {}
+        for exchange, stats in self.stats.items():
+            elapsed = (stats['last_send'] - stats['first_send']) if stats['last_send'] else 0.0
+            lags = sorted(stats['lags_ms'])
+            report[exchange] = {
+                'connections': stats['connections'],
+                'disconnects': stats['disconnects'],
+                'sent': stats['sent'],
+                'msgs_per_second': stats['sent'] / elapsed if elapsed else 0.0,
+                'lag_p50_ms': lags[len(lags) // 2] if lags else 0.0,
+                'lag_p99_ms': lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0,
+                'lag_max_ms': lags[-1] if lags else 0.0,
+            }
+        return report
+
+
+def display_report(report: Dict) -> None:
+    print(f"\n{'Exchange':<10} {'Conns':>6} {'Drops':>6} {'Sent':>10} {'Msg/s':>10} "
+          f"{'Lag p50':>9} {'Lag p99':>9} {'Lag max':>9}")
+    for exchange, stats in report.items():
+        if not stats['connections']:
+            continue
+        print(f"{exchange:<10} {stats['connections']:>6} {stats['disconnects']:>6} {stats['sent']:>10,} "
+              f"{stats['msgs_per_second']:>10,.0f} {stats['lag_p50_ms']:>7.1f}ms {stats['lag_p99_ms']:>7.1f}ms "
+              f"{stats['lag_max_ms']:>7.1f}ms")
+
+
+async def serve(duration: Optional[float] = None, **options) -> Dict:
+    """Run the simulator until Ctrl+C or for `duration` seconds, then return its report"""
+    simulator = ExchangeSimulator(**options)
+    await simulator.start()
+    try:
+        if duration:
+            await asyncio.sleep(duration)
+        else:
+            await asyncio.Future()
+    finally:
+        await simulator.stop()
+    return simulator.report()
+
+
+def _serve_process(options: Dict, duration: float, results) -> None:
+    results.put(asyncio.run(serve(duration=duration, **options)))
+
+
+async def _keep_feeding(connect, stop_at: float, counters: Dict, name: str) -> None:
+    """Re-run a monitor feed whenever it returns (the simulator drops connections on purpose)"""
+    while time.perf_counter() < stop_at:
+        await connect()
+        counters[name] += 1
+        await asyncio.sleep(0.1)
+
+
+async def load_test(rate: float = RATE, duration: float = 10.0, symbols: Optional[List[str]] = None,
+                    data_dir: str = 'data/load_test', **options) -> Dict:
+    """
+    Drive a WebSocketPriceMonitor from a simulator running in another process
+
+    Returns:
+        Dict with the server report, ticks the monitor processed and its latency stats
+    """
+    symbols = symbols or SYMBOLS
+    Path(data_dir).mkdir(parents=True, exist_ok=True)
+    options = dict(options, rate=rate)
+    results = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve_process, args=(options, duration + 1, results), daemon=True)
+    server.start()
+    await asyncio.sleep(0.5)  # Let the server bind
+
+    simulator = ExchangeSimulator(host=options.get('host', HOST), port=options.get('port', PORT))
+    # The simulator drops connections on purpose: reconnect every feed right away, like Binance's
+    monitor = WebSocketPriceMonitor(symbols=symbols, data_dir=data_dir, endpoints=simulator.endpoints,
+                                    reconnect_delay=0)
+    reconnects = {'binance': 0, 'kraken': 0, 'coinbase': 0}
+    stop_at = time.perf_counter() + duration
+
+    feeds = [asyncio.create_task(_keep_feeding(connect, stop_at, reconnects, name))
+             for name, connect in (('binance', monitor.connect_binance), ('kraken', monitor.connect_kraken),
+                                   ('coinbase', monitor.connect_coinbase))]
+    await asyncio.sleep(duration)
+    processed = monitor.tick_recorder.recorded
+    for feed in feeds:
+        feed.cancel()
+    await asyncio.gather(*feeds, return_exceptions=True)
+    monitor.tick_recorder.close()
+    monitor.journal.close()
+
+    server.join(timeout=5)
+    report = results.get(timeout=5) if not results.empty() else {}
+    return {
+        'server': report,
+        'processed': processed,
+        'processed_per_second': processed / duration,
+        'reconnects': reconnects,
+        'latency': monitor.latency_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Binance/Kraken/Coinbase stand-in for load tests')
+    parser.add_argument('mode', choices=['serve', 'loadtest'], help='Run the server, or run it against the monitor')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--rate', type=float, nargs='+', default=[RATE],
+                        help='Messages/s per connection; several values step up the load')
+    parser.add_argument('--burst-size', type=int, default=0)
+    parser.add_argument('--burst-interval', type=float, default=0)
+    parser.add_argument('--disconnect-interval', type=float, default=0)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per load test step')
+    args = parser.parse_args()
+
+    options = {'port': args.port, 'burst_size': args.burst_size, 'burst_interval': args.burst_interval,
+               'disconnect_interval': args.disconnect_interval}
+
+    if args.mode == 'serve':
+        try:
+            display_report(asyncio.run(serve(rate=args.rate[0], **options)))
+        except KeyboardInterrupt:
+            print("\nExiting...")
+        return
+
+    for rate in args.rate:
+        result = asyncio.run(load_test(rate=rate, duration=args.duration, **options))
+        offered = rate * 3
+        print(f"\n📈 Offered {offered:,.0f} msg/s, monitor processed {result['processed_per_second']:,.0f} msg/s "
+              f"(reconnects {result['reconnects']})")
+        display_report(result['server'])
+        latency = result['latency']['evaluation']
+        if latency:
+            print(f"Evaluation latency: p50 {latency['p50_us']:.1f}µs  p99 {latency['p99_us']:.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
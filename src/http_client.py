@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Shared pooled HTTP client for the DEX monitors
+Keeps connections alive across requests, applies the per-host rate limits
+and counts TLS handshakes vs reused connections
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from rate_limiter import limiter_for_url
+except ImportError:  # imported as src.http_client
+    from src.rate_limiter import limiter_for_url
+
+# HTTP/2 is optional and needs httpx with the h2 extra (pip install "httpx[http2]")
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+
+# Hosts the monitors talk to; pre-connected at startup
+KNOWN_HOSTS = [
+    'https://api.dexscreener.com',
+    'https://quote-api.jup.ag',
+]
+
+# Connection pool sizing
+POOL_CONNECTIONS = 10  # Number of hosts to keep pools for
+POOL_MAXSIZE = 20      # Keep-alive connections per host
+MAX_RETRIES = 2
+
+ENABLE_HTTP2 = False
+
+# Exceptions raised by either backend, for callers' except clauses
+HTTPError = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if HTTPX_AVAILABLE else ())
+
+
+class PooledHTTPClient:
+    """
+    Keep-alive HTTP client shared by all monitors
+
+    Uses a requests.Session with sized connection pools by default, or an
+    httpx HTTP/2 client when ``http2=True`` and httpx is installed. Both
+    return response objects with ``status_code``, ``json()`` and
+    ``raise_for_status()``.
+    """
+
+    def __init__(self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                 max_retries: int = MAX_RETRIES, http2: bool = ENABLE_HTTP2,
+                 headers: Optional[Dict] = None):
+        """
+        Initialize the client
+
+        Args:
+            pool_connections: Number of per-host pools to keep
+            pool_maxsize: Keep-alive connections per host
+            max_retries: Retries for connection errors and 429/5xx responses
+            http2: Use httpx with HTTP/2 (falls back to requests if httpx is missing)
+            headers: Default headers for every request
+        """
+        default_headers = {'User-Agent': 'CryptoArbitrageBot/1.0', 'Accept': 'application/json'}
+        default_headers.update(headers or {})
+
+        self.http2 = http2 and HTTPX_AVAILABLE
+        if http2 and not HTTPX_AVAILABLE:
+            print("⚠️  httpx not installed, HTTP/2 disabled (pip install 'httpx[http2]')")
+
+        # Only tracked directly for httpx; urllib3 pools keep their own counters
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._handshakes = 0
+
+        if self.http2:
+            self._client = httpx.Client(
+                http2=True,
+                headers=default_headers,
+                limits=httpx.Limits(max_connections=pool_connections * pool_maxsize,
+                                    max_keepalive_connections=pool_connections * pool_maxsize),
+                transport=httpx.HTTPTransport(http2=True, retries=max_retries),
+            )
+        else:
+            retry = Retry(
+                total=max_retries,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=('GET', 'HEAD'),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                  max_retries=retry)
+            self._client = requests.Session()
+            self._client.headers.update(default_headers)
+            self._client.mount('https://', adapter)
+            self._client.mount('http://', adapter)
+            self._adapter = adapter
+
+    def _trace(self, event_name: str, info: Dict) -> None:
+        """httpcore trace hook: count new TCP connections"""
+        if event_name == 'connection.connect_tcp.complete':
+            with self._lock:
+                self._handshakes += 1
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: float = 10, rate_limit: bool = True):
+        """
+        GET a URL over a pooled connection
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            headers: Extra headers for this request
+            timeout: Timeout in seconds
+            rate_limit: Wait on the host's shared token bucket first
+
+        Returns:
+            Response object
+        """
+        if rate_limit:
+            limiter_for_url(url).acquire()
+
+        if self.http2:
+            response = self._client.get(url, params=params, headers=headers, timeout=timeout,
+                                        extensions={'trace': self._trace})
+            with self._lock:
+                self._requests += 1
+            return response
+        return self._client.get(url, params=params, headers=headers, timeout=timeout)
+
+    def preconnect(self, hosts: Optional[List[str]] = None) -> None:
+        """
+        Open connections to known hosts ahead of the first real request
+
+        Args:
+            hosts: Base URLs to warm up (defaults to KNOWN_HOSTS)
+        """
+        hosts = hosts or KNOWN_HOSTS
+
+        def warm(host):
+            try:
+                if self.http2:
+                    self._client.head(host, timeout=5, extensions={'trace': self._trace})
+                    with self._lock:
+                        self._requests += 1
+                else:
+                    self._client.head(host, timeout=5)
+            except Exception as e:
+                print(f"  Warning: could not pre-connect to {urlparse(host).hostname}: {str(e)[:80]}")
+
+        with ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+            list(executor.map(warm, hosts))
+
+    def stats(self) -> Dict:
+        """
+        Connection reuse counters
+
+        Returns:
+            Dict with requests made, new connections (handshakes) and reused connections
+        """
+        if self.http2:
+            requests_made = self._requests
+            handshakes = self._handshakes
+        else:
+            pools = self._adapter.poolmanager.pools
+            connection_pools = [pools[key] for key in list(pools.keys())]
+            requests_made = sum(pool.num_requests for pool in connection_pools)
+            handshakes = sum(pool.num_connections for pool in connection_pools)
+
+        reused = max(0, requests_made - handshakes)
+
+        return {
+            'backend': 'httpx-h2' if self.http2 else 'requests',
+            'requests': requests_made,
+            'handshakes': handshakes,
+            'reused': reused,
+            'reuse_ratio': reused / requests_made if requests_made else 0.0,
+        }
+
+    def close(self) -> None:
+        self._client.close()
+
+
+# Process-wide shared client
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHTTPClient:
+    """Return the shared pooled client, creating it on first use"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = PooledHTTPClient()
+        return _shared_client
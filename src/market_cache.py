@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Persistent market-metadata cache
+Keeps each exchange's load_markets() result on disk so scanners can start
+immediately instead of re-downloading several MB of metadata every run
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from rate_limiter import limiter_for_exchange
+except ImportError:  # imported as src.market_cache
+    from src.rate_limiter import limiter_for_exchange
+
+
+# Markets older than this are refreshed in the background
+DEFAULT_TTL = 6 * 3600  # seconds
+
+# Bump when the on-disk layout changes
+CACHE_VERSION = 1
+
+# Client settings carried over to the background refresh client
+CLIENT_CONFIG_KEYS = ['apiKey', 'secret', 'uid', 'login', 'password', 'privateKey', 'walletAddress', 'token',
+                      'hostname', 'timeout', 'enableRateLimit', 'rateLimit', 'proxies', 'httpProxy',
+                      'httpsProxy', 'socksProxy', 'userAgent', 'isSandboxModeEnabled']
+# Copied as-is after construction: passed as config, ccxt would merge them into its defaults
+# (a sandbox client would regain production endpoints the testnet doesn't list)
+CLIENT_DICT_KEYS = ['options', 'urls', 'headers']
+
+
+def usd_symbol_filter(symbol: str) -> bool:
+    """Default filter: USD and USDT quoted pairs (most liquid)"""
+    return '/USDT' in symbol or '/USD' in symbol
+
+
+def clone_exchange(exchange):
+    """
+    New ccxt client of the same class and configuration
+
+    Args:
+        exchange: ccxt exchange instance
+
+    Returns:
+        Exchange with the same credentials, options, URLs (e.g. sandbox) and rate limiting
+    """
+    config = {key: getattr(exchange, key) for key in CLIENT_CONFIG_KEYS if getattr(exchange, key, None) is not None}
+    clone = type(exchange)(config)
+    for key in CLIENT_DICT_KEYS:
+        setattr(clone, key, copy.deepcopy(getattr(exchange, key)))
+    return clone
+
+
+class MarketCache:
+    """
+    On-disk cache of exchange markets keyed by exchange id
+    """
+
+    def __init__(self, cache_dir: str = "data/market_cache", ttl: float = DEFAULT_TTL):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory for cached market files
+            ttl: Seconds before cached markets are refreshed in the background
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.json"
+
+    def _read(self, name: str) -> Optional[Dict]:
+        path = self._path(name)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  Warning: ignoring unreadable market cache {path}: {e}")
+            return None
+
+        if entry.get('version') != CACHE_VERSION:
+            return None
+        return entry
+
+    def _write(self, name: str, entry: Dict) -> None:
+        """Write atomically so readers never see a partial file"""
+        path = self._path(name)
+        tmp_path = path.with_suffix('.tmp')
+
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def is_fresh(self, entry: Optional[Dict]) -> bool:
+        return bool(entry) and time.time() - entry['fetched_at'] < self.ttl
+
+    def refresh(self, exchange) -> Dict:
+        """
+        Download markets from the exchange and store them
+
+        Args:
+            exchange: ccxt exchange instance
+
+        Returns:
+            Markets dict keyed by symbol
+        """
+        return self._refresh(exchange)[0]
+
+    def _refresh(self, exchange) -> Tuple[Dict, float]:
+        """refresh(), also returning the fetched_at stamp that was stored"""
+        limiter_for_exchange(exchange).acquire()
+        markets = exchange.load_markets(reload=True)
+        fetched_at = time.time()
+
+        self._write(exchange.id, {
+            'version': CACHE_VERSION,
+            'exchange': exchange.id,
+            'fetched_at': fetched_at,
+            'markets': list(markets.values()),
+            'currencies': exchange.currencies,
+        })
+
+        return markets, fetched_at
+
+    def _refresh_in_background(self, exchange) -> None:
+        """Refresh stale markets on a separate client, then swap them in"""
+        with self._lock:
+            if exchange.id in self._refreshing:
+                return
+            self._refreshing.add(exchange.id)
+
+        def worker():
+            try:
+                fresh_client = clone_exchange(exchange)
+                self.refresh(fresh_client)
+                exchange.set_markets(list(fresh_client.markets.values()), fresh_client.currencies)
+            except Exception as e:
+                print(f"  Warning: background market refresh failed for {exchange.id}: {str(e)[:100]}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(exchange.id)
+
+        threading.Thread(target=worker, name=f"market-refresh-{exchange.id}", daemon=True).start()
+
+    def load_markets(self, exchange, background_refresh: bool = True) -> Dict:
+        """
+        Load markets into an exchange, from disk when possible
+
+        Stale entries are used immediately and refreshed in the background.
+
+        Args:
+            exchange: ccxt exchange instance
+            background_refresh: Refresh stale entries in a background thread
+
+        Returns:
+            Markets dict keyed by symbol
+        """
+        return self._load_markets(exchange, background_refresh)[0]
+
+    def _load_markets(self, exchange, background_refresh: bool = True) -> Tuple[Dict, float]:
+        """load_markets(), also returning the fetched_at stamp of the entry the markets came from"""
+        entry = self._read(exchange.id)
+
+        if entry is None:
+            return self._refresh(exchange)
+
+        exchange.set_markets(entry['markets'], entry.get('currencies'))
+        # Taken before a background refresh can swap in newer markets
+        markets = exchange.markets
+
+        if not self.is_fresh(entry):
+            if background_refresh:
+                self._refresh_in_background(exchange)
+            else:
+                return self._refresh(exchange)
+
+        return markets, entry['fetched_at']
+
+    def load_all(self, exchanges: Dict, symbol_filter: Optional[Callable[[str], bool]] = None,
+                 verbose: bool = True) -> Dict[str, set]:
+        """
+        Load markets for every exchange
+
+        Args:
+            exchanges: Dict of display name -> ccxt exchange instance
+            symbol_filter: Optional predicate to select symbols
+            verbose: Print per-exchange progress
+
+        Returns:
+            Dict of display name -> set of (filtered) symbols; failed exchanges are omitted
+        """
+        return self._load_all(exchanges, symbol_filter, verbose)[0]
+
+    def _load_all(self, exchanges: Dict, symbol_filter: Optional[Callable[[str], bool]] = None,
+                  verbose: bool = True) -> Tuple[Dict[str, set], Dict[str, float]]:
+        """load_all(), also returning the fetched_at stamp each exchange's symbols came from"""
+        all_symbols = {}
+        stamps = {}
+
+        for exchange_name, exchange in exchanges.items():
+            try:
+                markets, stamps[exchange_name] = self._load_markets(exchange)
+                symbols = [s for s in markets.keys() if symbol_filter is None or symbol_filter(s)]
+                all_symbols[exchange_name] = set(symbols)
+                if verbose:
+                    print(f"  ✓ {exchange_name}: {len(symbols)} pairs")
+            except Exception as e:
+                if verbose:
+                    print(f"  ❌ Error loading {exchange_name}: {str(e)[:100]}")
+
+        all_symbols = {k: v for k, v in all_symbols.items() if v}
+        return all_symbols, {k: stamps[k] for k in all_symbols}
+
+    def common_symbols(self, exchanges: Dict, symbol_filter: Callable[[str], bool] = usd_symbol_filter,
+                       verbose: bool = True) -> List[str]:
+        """
+        Symbols listed on every working exchange, precomputed when possible
+
+        The intersection is cached alongside the markets and reused while
+        none of the underlying market files have changed.
+
+        Args:
+            exchanges: Dict of display name -> ccxt exchange instance
+            symbol_filter: Predicate to select symbols (defaults to USD/USDT pairs)
+            verbose: Print per-exchange progress
+
+        Returns:
+            Sorted list of common symbols (empty if fewer than 2 exchanges work)
+        """
+        key = '+'.join(sorted(exchange.id for exchange in exchanges.values()))
+        cache_name = f"common_{key}_{getattr(symbol_filter, '__name__', 'custom')}"
+
+        # Stamps of the exact entries the symbols came from, not re-read after a
+        # background refresh may have rewritten them
+        all_symbols, stamps = self._load_all(exchanges, symbol_filter, verbose=verbose)
+        if len(all_symbols) < 2:
+            return []
+
+        cached = self._read(cache_name)
+        if cached and cached.get('stamps') == stamps:
+            return cached['symbols']
+
+        common = sorted(set.intersection(*all_symbols.values()))
+
+        self._write(cache_name, {
+            'version': CACHE_VERSION,
+            'fetched_at': time.time(),
+            'stamps': stamps,
+            'symbols': common,
+        })
+
+        return common
+
+
+# Shared default cache
+_default_cache = None
+
+
+def get_market_cache() -> MarketCache:
+    """Return the shared market cache in data/market_cache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = MarketCache()
+    return _default_cache
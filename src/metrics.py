@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Prometheus metrics for the fetchers, streams, analyzer and dashboards
+Every metric is defined here; dashboards serve them on /metrics and the
+command-line monitors start a standalone exporter. Without prometheus_client
+installed every metric is a no-op.
+"""
+
+import os
+import time
+from typing import Optional
+
+# prometheus_client is optional; without it metrics are recorded nowhere (pip install prometheus-client)
+try:
+    from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+    from prometheus_client import start_http_server
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = 'text/plain; version=0.0.4; charset=utf-8'
+
+    class _NoOpTimer:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    class _NoOpMetric:
+        """Accepts the prometheus_client metric API and does nothing"""
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def labels(self, *args, **kwargs):
+            return self
+
+        def inc(self, amount=1):
+            pass
+
+        def dec(self, amount=1):
+            pass
+
+        def set(self, value):
+            pass
+
+        def set_to_current_time(self):
+            pass
+
+        def observe(self, value):
+            pass
+
+        def time(self):
+            return _NoOpTimer()
+
+    Counter = Gauge = Histogram = _NoOpMetric
+
+    def generate_latest(*args) -> bytes:
+        return b"# prometheus_client is not installed\n"
+
+
+def _metric(kind, name: str, documentation: str, labelnames=(), **kwargs):
+    """
+    Create a metric in the default registry, or reuse the one already there
+
+    This module is imported as both `metrics` and `src.metrics`; each copy
+    runs the definitions below, and both must share one set of collectors.
+    """
+    try:
+        return kind(name, documentation, labelnames, **kwargs)
+    except ValueError:  # Duplicated timeseries: registered by the other copy
+        existing = REGISTRY._names_to_collectors.get(name)
+        if not isinstance(existing, kind):
+            raise
+        return existing
+
+
+METRICS_PORT = int(os.environ.get('METRICS_PORT', 9108))
+
+# Seconds; REST calls and loop iterations are slow, stream gaps and waits span ms to minutes
+REST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+GAP_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.5, 1, 5, 30, 60)
+WRITE_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+WAIT_BUCKETS = (0, 0.01, 0.1, 0.5, 1, 2, 5, 10, 30)
+LOOP_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 30, 60)
+
+# REST fetchers (AsyncPriceFetcher, used by every fetch_prices variant)
+REST_REQUEST_SECONDS = _metric(
+    Histogram, 'arb_rest_request_seconds', 'Exchange REST call latency', ['exchange', 'method'], buckets=REST_BUCKETS)
+REST_ERRORS = _metric(
+    Counter, 'arb_rest_errors_total', 'Failed exchange REST calls', ['exchange', 'method'])
+
+# WebSocket streams (WebSocketPriceMonitor)
+WS_MESSAGES = _metric(
+    Counter, 'arb_ws_messages_total', 'WebSocket messages received', ['exchange', 'stream'])
+WS_MESSAGE_GAP_SECONDS = _metric(
+    Histogram, 'arb_ws_message_gap_seconds', 'Time between consecutive messages from an exchange', ['exchange', 'stream'],
+    buckets=GAP_BUCKETS)
+WS_LAST_MESSAGE = _metric(
+    Gauge, 'arb_ws_last_message_timestamp_seconds', 'Wall-clock time of the last message', ['exchange', 'stream'])
+
+# Arbitrage
+OPPORTUNITIES = _metric(
+    Counter, 'arb_opportunities_total', 'Arbitrage opportunities opened', ['symbol', 'route'])
+CURRENT_OPPORTUNITIES = _metric(
+    Gauge, 'arb_current_opportunities', 'Opportunities found in the latest dashboard update', ['dashboard'])
+ANALYZER_WRITE_SECONDS = _metric(
+    Histogram, 'arb_analyzer_write_seconds', 'ArbitrageAnalyzer.record_opportunity duration', buckets=WRITE_BUCKETS)
+
+# Rate limiting
+RATE_LIMIT_WAIT_SECONDS = _metric(
+    Histogram, 'arb_rate_limit_wait_seconds', 'Time requests waited for a rate-limiter token', ['limiter'],
+    buckets=WAIT_BUCKETS)
+
+# Dashboards
+UPDATE_LOOP_SECONDS = _metric(
+    Histogram, 'arb_update_loop_seconds', 'Dashboard update-loop iteration duration', ['dashboard'], buckets=LOOP_BUCKETS)
+
+
+def route(buy_exchange: str, sell_exchange: str) -> str:
+    """Label for a buy/sell exchange pair"""
+    return f"{buy_exchange}->{sell_exchange}"
+
+
+class StreamStats:
+    """Message rate, inter-message gaps and last-seen time per exchange for one kind of stream"""
+
+    def __init__(self, stream: str):
+        """
+        Args:
+            stream: Stream label, e.g. 'ticker' or 'book'
+        """
+        self.stream = stream
+        self._children = {}
+        self._last_ns = {}
+
+    def message(self, exchange: str, received_ns: int) -> None:
+        """Count a message received at time.perf_counter_ns() `received_ns`"""
+        children = self._children.get(exchange)
+        if children is None:
+            labels = {'exchange': exchange, 'stream': self.stream}
+            children = self._children[exchange] = (
+                WS_MESSAGES.labels(**labels), WS_MESSAGE_GAP_SECONDS.labels(**labels), WS_LAST_MESSAGE.labels(**labels)
+            )
+        messages, gaps, last_seen = children
+
+        messages.inc()
+        previous = self._last_ns.get(exchange)
+        if previous is not None:
+            gaps.observe((received_ns - previous) / 1e9)
+        self._last_ns[exchange] = received_ns
+        last_seen.set_to_current_time()
+
+
+def observe_update_loop(dashboard: str, started: float, opportunities: Optional[int] = None) -> None:
+    """Record one dashboard update-loop iteration that began at time.perf_counter() `started`"""
+    UPDATE_LOOP_SECONDS.labels(dashboard=dashboard).observe(time.perf_counter() - started)
+    if opportunities is not None:
+        CURRENT_OPPORTUNITIES.labels(dashboard=dashboard).set(opportunities)
+
+
+def metrics_response():
+    """Flask response for a /metrics route"""
+    return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+
+
+def start_metrics_server(port: int = METRICS_PORT) -> bool:
+    """
+    Serve /metrics on its own port for entry points without a web server
+
+    Returns:
+        True if the exporter is running
+    """
+    if not PROMETHEUS_AVAILABLE:
+        print("⚠️  prometheus_client not installed; metrics disabled")
+        return False
+    try:
+        start_http_server(port)
+    except OSError as e:
+        print(f"⚠️  Could not start metrics server on port {port}: {e}")
+        return False
+    print(f"📈 Metrics on http://localhost:{port}/metrics")
+    return True
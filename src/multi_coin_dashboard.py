@@ -7,6 +7,10 @@ from flask import Flask, render_template, jsonify
 import ccxt
 import time
 from datetime import datetime
+from async_fetcher import get_fetcher
+from market_cache import get_market_cache
+from metrics import metrics_response, observe_update_loop
+from quote_board import QuoteBoard
 import threading
 from collections import deque
 import random
@@ -43,6 +47,10 @@ for name, exchange_class in exchange_configs:
     except Exception as e:
         print(f"  ❌ {name} failed: {e}")
 
+# Warm market metadata from the on-disk cache (stale entries refresh in the background)
+print("📦 Loading markets...")
+get_market_cache().load_all(exchanges)
+
 # Top 25 cryptocurrencies to monitor
 SYMBOLS = [
     'BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'BNB/USDT', 'XRP/USDT',
@@ -54,6 +62,10 @@ SYMBOLS = [
 
 FEE_PERCENT = 0.2
 UPDATE_INTERVAL = 20  # Longer interval since we're checking many coins
+TOP_OPPORTUNITIES = 20
+
+# Per-symbol sorted bid/ask sides and a heap of the best routes, updated as each coin is fetched
+board = QuoteBoard(fee_percent=FEE_PERCENT)
 
 
 def add_demo_variation(prices, symbol):
@@ -98,29 +110,11 @@ def add_demo_variation(prices, symbol):
 
 def fetch_prices_for_symbol(symbol, demo_mode=False):
     """Fetch prices for a single symbol"""
-    prices = {}
-
-    for exchange_name, exchange in exchanges.items():
-        try:
-            ticker = exchange.fetch_ticker(symbol)
-            prices[exchange_name] = {
-                'bid': ticker['bid'],
-                'ask': ticker['ask'],
-                'last': ticker['last'],
-                'timestamp': ticker['timestamp']
-            }
-        except Exception:
-            # Try USD version
-            try:
-                ticker = exchange.fetch_ticker(symbol.replace('USDT', 'USD'))
-                prices[exchange_name] = {
-                    'bid': ticker['bid'],
-                    'ask': ticker['ask'],
-                    'last': ticker['last'],
-                    'timestamp': ticker['timestamp']
-                }
-            except:
-                pass
+    # Try USD version if USDT fails
+    prices = get_fetcher(exchanges).fetch_prices(
+        symbol, fallback_symbol=symbol.replace('USDT', 'USD'),
+        skip_failed=True, verbose=False
+    )
 
     if demo_mode and prices:
         prices = add_demo_variation(prices, symbol)
@@ -128,35 +122,10 @@ def fetch_prices_for_symbol(symbol, demo_mode=False):
     return prices
 
 
-def calculate_arbitrage(symbol, prices, fee_percent=FEE_PERCENT):
-    """Calculate arbitrage for a symbol"""
-    opportunities = []
-    exchange_names = list(prices.keys())
-
-    for i, buy_exchange in enumerate(exchange_names):
-        for sell_exchange in exchange_names[i+1:]:
-            if prices[buy_exchange] and prices[sell_exchange]:
-                # Try both directions
-                for buy_ex, sell_ex, buy_p, sell_p in [
-                    (buy_exchange, sell_exchange, prices[buy_exchange]['ask'], prices[sell_exchange]['bid']),
-                    (sell_exchange, buy_exchange, prices[sell_exchange]['ask'], prices[buy_exchange]['bid'])
-                ]:
-                    if buy_p and sell_p and buy_p > 0:
-                        gross_profit = ((sell_p - buy_p) / buy_p) * 100
-                        net_profit = gross_profit - (fee_percent * 2)
-
-                        if net_profit > 0:
-                            opportunities.append({
-                                'symbol': symbol,
-                                'buy_from': buy_ex,
-                                'sell_to': sell_ex,
-                                'buy_price': buy_p,
-                                'sell_price': sell_p,
-                                'gross_profit_pct': gross_profit,
-                                'net_profit_pct': net_profit
-                            })
-
-    return opportunities
+def calculate_arbitrage(symbol, prices):
+    """Apply a symbol's prices to the quote board and return its opportunities, best first"""
+    board.update_prices(symbol, prices)
+    return board.opportunities(symbol)
 
 
 def calculate_coin_stats(symbol, prices):
@@ -187,6 +156,7 @@ def update_data_loop():
 
     while True:
         try:
+            started = time.perf_counter()
             with data_lock:
                 demo_mode = latest_data['demo_mode']
 
@@ -196,10 +166,10 @@ def update_data_loop():
             for symbol in symbols_to_check:
                 try:
                     prices = fetch_prices_for_symbol(symbol, demo_mode)
-                    opportunities = calculate_arbitrage(symbol, prices)
                     stats = calculate_coin_stats(symbol, prices)
 
                     with data_lock:
+                        opportunities = calculate_arbitrage(symbol, prices)
                         latest_data['coin_data'][symbol] = {
                             'prices': prices,
                             'opportunities': opportunities,
@@ -208,29 +178,24 @@ def update_data_loop():
                 except Exception as e:
                     print(f"Error processing {symbol}: {e}")
 
-                time.sleep(0.5)  # Rate limiting
-
-            # Update aggregated opportunities
+            # Update aggregated opportunities from the board's heap (no rebuild or re-sort)
             with data_lock:
-                all_opps = []
-                for coin_data in latest_data['coin_data'].values():
-                    if coin_data.get('opportunities'):
-                        all_opps.extend(coin_data['opportunities'])
-
-                all_opps.sort(key=lambda x: x['net_profit_pct'], reverse=True)
-                latest_data['all_opportunities'] = all_opps[:20]  # Top 20
+                latest_data['all_opportunities'] = board.top(TOP_OPPORTUNITIES)
                 latest_data['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 latest_data['iteration'] += 1
 
                 # Calculate global stats
+                best = board.best()
+                total_opps = board.total_routes
                 latest_data['stats'] = {
                     'total_coins': len(latest_data['coin_data']),
-                    'coins_with_opps': sum(1 for cd in latest_data['coin_data'].values()
-                                          if cd.get('opportunities')),
-                    'total_opps': len(all_opps),
-                    'best_profit': all_opps[0]['net_profit_pct'] if all_opps else 0
+                    'coins_with_opps': board.symbols_with_opportunities(),
+                    'total_opps': total_opps,
+                    'best_profit': best['net_profit_pct'] if best else 0
                 }
 
+            observe_update_loop('multi_coin', started, total_opps)
+
             # Move to next batch
             coin_index = (coin_index + 5) % len(SYMBOLS)
 
@@ -266,12 +231,19 @@ def toggle_demo():
         latest_data['demo_mode'] = not latest_data['demo_mode']
         # Clear data to force refresh with new mode
         latest_data['coin_data'] = {}
+        board.clear()
         mode = latest_data['demo_mode']
 
     print(f"🎭 Demo mode: {'ON' if mode else 'OFF'}")
     return jsonify({'demo_mode': mode})
 
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint"""
+    return metrics_response()
+
+
 if __name__ == '__main__':
     print("\n" + "="*70)
     print("🚀 MULTI-COIN ARBITRAGE DASHBOARD")
@@ -8,53 +8,50 @@ import ccxt
 import time
 from datetime import datetime
 import json
+from async_fetcher import get_fetcher
+from market_cache import get_market_cache, usd_symbol_filter
+from rate_limiter import limiter_for_exchange
+from spread_engine import SpreadEngine, best_opportunity
+
+# Requests go through the shared token buckets, so ccxt's own throttler is off
+CCXT_CONFIG = {'enableRateLimit': False}
 
 # Initialize exchanges
 exchanges = {
-    'Binance': ccxt.binance(),
-    'Kraken': ccxt.kraken(),
-    'Coinbase': ccxt.coinbase(),
+    'Binance': ccxt.binance(CCXT_CONFIG),
+    'Kraken': ccxt.kraken(CCXT_CONFIG),
+    'Coinbase': ccxt.coinbase(CCXT_CONFIG),
 }
 
 # Configuration
 FEE_PERCENT = 0.2  # More realistic fee (0.1% each side)
 MIN_PROFIT = 0.3  # Minimum 0.3% profit to be worth it
 TOP_N = 200  # Number of coins to check
+BULK_SCAN = True  # One fetch_tickers() call per exchange instead of one fetch_ticker() per symbol
 
 
 def get_common_symbols():
     """Get symbols that exist on multiple exchanges"""
     print("🔍 Finding common trading pairs across exchanges...")
 
-    all_symbols = {}
-    for exchange_name, exchange in exchanges.items():
-        try:
-            markets = exchange.load_markets()
-            # Filter for USDT pairs (most liquid)
-            symbols = [s for s in markets.keys() if '/USDT' in s or '/USD' in s]
-            all_symbols[exchange_name] = set(symbols)
-            print(f"  ✓ {exchange_name}: {len(symbols)} USD(T) pairs")
-        except Exception as e:
-            print(f"  ❌ Error loading {exchange_name}: {str(e)[:100]}")
-            all_symbols[exchange_name] = set()
-
-    # Remove exchanges that failed to load
-    all_symbols = {k: v for k, v in all_symbols.items() if v}
-
-    if len(all_symbols) < 2:
+    # Markets come from the on-disk cache when warm; stale entries refresh in the background
+    cache = get_market_cache()
+    common = cache.common_symbols(exchanges, usd_symbol_filter)
+
+    if not common:
         print("❌ Need at least 2 working exchanges")
         return []
 
-    # Find intersection of working exchanges
-    common = set.intersection(*all_symbols.values())
-    print(f"\n✓ Found {len(common)} common pairs across {len(all_symbols)} exchanges")
-    print(f"  Working exchanges: {', '.join(all_symbols.keys())}")
-    return sorted(list(common))[:TOP_N]
+    working = [name for name, exchange in exchanges.items() if exchange.markets]
+    print(f"\n✓ Found {len(common)} common pairs across {len(working)} exchanges")
+    print(f"  Working exchanges: {', '.join(working)}")
+    return common[:TOP_N]
 
 
 def fetch_price(exchange, symbol):
     """Fetch price for a single symbol from an exchange"""
     try:
+        limiter_for_exchange(exchange).acquire()
         ticker = exchange.fetch_ticker(symbol)
         return {
             'bid': ticker['bid'],
@@ -75,61 +72,57 @@ def scan_symbol(symbol):
         if price:
             prices[exchange_name] = price
 
-    # Need at least 2 exchanges with data
-    if len(prices) < 2:
-        return None
+    return evaluate_symbol(symbol, prices)
+
+
+def evaluate_symbol(symbol, prices):
+    """Find the best arbitrage opportunity for a symbol from already-fetched prices"""
+    best = best_opportunity(prices, FEE_PERCENT, MIN_PROFIT, symbol)
+    if best:
+        best['price_difference'] = best['sell_price'] - best['buy_price']
+    return best
+
+
+def scan_symbols_bulk(symbols):
+    """Fetch every symbol with bulk ticker calls, then evaluate all of them in memory"""
+    start = time.time()
+    snapshot = get_fetcher(exchanges).fetch_tickers_sync(symbols)
+
+    for exchange_name, tickers in snapshot['tickers'].items():
+        error = snapshot['errors'].get(exchange_name)
+        if error:
+            print(f"  ❌ {exchange_name}: {error[:100]}")
+        else:
+            print(f"  ✓ {exchange_name}: {len(tickers)} tickers")
+    print(f"  Fetched in {snapshot['latency_ms'] / 1000:.1f}s\n")
+
+    # Every symbol on every exchange in one spread tensor
+    engine = SpreadEngine(symbols, list(snapshot['tickers']), FEE_PERCENT)
+    for exchange_name, tickers in snapshot['tickers'].items():
+        for symbol in symbols:
+            ticker = tickers.get(symbol)
+            if ticker:
+                engine.update(symbol, exchange_name, ticker['bid'], ticker['ask'])
+    best = engine.best(MIN_PROFIT)
+
+    opportunities = []
+    for symbol in symbols:
+        opp = best.get(symbol)
+        if opp:
+            opp['price_difference'] = opp['sell_price'] - opp['buy_price']
+            opportunities.append(opp)
+            print(f"✓ {symbol}: {opp['net_profit_pct']:.3f}% profit ({opp['buy_from']} → {opp['sell_to']})")
 
-    # Find best arbitrage opportunity for this symbol
-    best_opportunity = None
-    best_profit = 0
-
-    exchange_names = list(prices.keys())
-    for i, buy_exchange in enumerate(exchange_names):
-        for sell_exchange in exchange_names[i+1:]:
-            # Forward direction
-            buy_price = prices[buy_exchange]['ask']
-            sell_price = prices[sell_exchange]['bid']
-
-            gross_profit = ((sell_price - buy_price) / buy_price) * 100
-            net_profit = gross_profit - (FEE_PERCENT * 2)
-
-            if net_profit > best_profit and net_profit > MIN_PROFIT:
-                best_profit = net_profit
-                best_opportunity = {
-                    'symbol': symbol,
-                    'buy_from': buy_exchange,
-                    'sell_to': sell_exchange,
-                    'buy_price': buy_price,
-                    'sell_price': sell_price,
-                    'gross_profit_pct': gross_profit,
-                    'net_profit_pct': net_profit,
-                    'price_difference': sell_price - buy_price
-                }
-
-            # Reverse direction
-            buy_price_rev = prices[sell_exchange]['ask']
-            sell_price_rev = prices[buy_exchange]['bid']
-
-            gross_profit_rev = ((sell_price_rev - buy_price_rev) / buy_price_rev) * 100
-            net_profit_rev = gross_profit_rev - (FEE_PERCENT * 2)
-
-            if net_profit_rev > best_profit and net_profit_rev > MIN_PROFIT:
-                best_profit = net_profit_rev
-                best_opportunity = {
-                    'symbol': symbol,
-                    'buy_from': sell_exchange,
-                    'sell_to': buy_exchange,
-                    'buy_price': buy_price_rev,
-                    'sell_price': sell_price_rev,
-                    'gross_profit_pct': gross_profit_rev,
-                    'net_profit_pct': net_profit_rev,
-                    'price_difference': sell_price_rev - buy_price_rev
-                }
-
-    return best_opportunity
-
-
-def scan_all_symbols():
+    print("="*80)
+    print(f"\n✅ Scan complete! Checked {len(symbols)} symbols in {time.time() - start:.1f}s")
+    print(f"🎯 Found {len(opportunities)} profitable arbitrage opportunities\n")
+
+    opportunities.sort(key=lambda x: x['net_profit_pct'], reverse=True)
+
+    return opportunities
+
+
+def scan_all_symbols(bulk=BULK_SCAN):
     """Scan all common symbols and return best opportunities"""
     print("\n🚀 Starting multi-coin arbitrage scan...")
     print(f"Configuration: {FEE_PERCENT}% fees, minimum {MIN_PROFIT}% profit\n")
@@ -143,6 +136,9 @@ def scan_all_symbols():
     print(f"\n📊 Scanning {len(symbols)} symbols for arbitrage opportunities...")
     print("="*80)
 
+    if bulk:
+        return scan_symbols_bulk(symbols)
+
     opportunities = []
     checked = 0
 
@@ -156,9 +152,6 @@ def scan_all_symbols():
             opportunities.append(opp)
             print(f"✓ {symbol}: {opp['net_profit_pct']:.3f}% profit ({opp['buy_from']} → {opp['sell_to']})")
 
-        # Rate limiting - be nice to the APIs
-        time.sleep(0.5)
-
     print("="*80)
     print(f"\n✅ Scan complete! Checked {checked} symbols")
     print(f"🎯 Found {len(opportunities)} profitable arbitrage opportunities\n")
@@ -208,7 +201,8 @@ def save_opportunities(opportunities, filename='data/arbitrage_opportunities.jso
         'config': {
             'fee_percent': FEE_PERCENT,
             'min_profit': MIN_PROFIT,
-            'top_n': TOP_N
+            'top_n': TOP_N,
+            'bulk_scan': BULK_SCAN
         },
         'opportunities': opportunities
     }
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Append-only journal of arbitrage opportunities
+One JSON record per line, written in batches off the event loop with a
+periodic fsync, plus a bounded in-memory window of recent records
+"""
+
+import glob
+import json
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    from tick_recorder import TickRecorder, JSONLSink
+except ImportError:  # imported as src.opportunity_journal
+    from src.tick_recorder import TickRecorder, JSONLSink
+
+
+RECENT_WINDOW = 1000      # Records kept in memory for display
+FSYNC_INTERVAL = 1.0      # Seconds between flush + fsync
+MAX_QUEUE = 1_000_000     # Opportunities are rare; effectively never drop
+
+
+class OpportunityJournal:
+    """
+    Append-only JSONL journal
+
+    append() costs the same no matter how long the session runs: the record
+    goes into a bounded deque of recent records and onto the recorder queue,
+    and a background thread writes and fsyncs the batch every
+    ``fsync_interval`` seconds. Use read_journal() to rebuild the full
+    history lazily from disk.
+    """
+
+    def __init__(self, data_dir: str = 'data', prefix: str = 'arbitrage',
+                 window: int = RECENT_WINDOW, fsync_interval: float = FSYNC_INTERVAL):
+        """
+        Initialize the journal and open its file
+
+        Args:
+            data_dir: Directory for the journal file
+            prefix: File name prefix, e.g. 'arbitrage' -> arbitrage_20240101_120000.jsonl
+            window: Number of recent records kept in memory
+            fsync_interval: Seconds between flush + fsync
+        """
+        self.recent = deque(maxlen=window)
+        self.count = 0
+        self.recorder = TickRecorder(
+            data_dir, prefix=prefix, sink=JSONLSink(fsync=True),
+            flush_interval=fsync_interval, max_queue=MAX_QUEUE,
+            max_file_bytes=0, rotate_hourly=False
+        )
+
+    @property
+    def path(self) -> Path:
+        return self.recorder.path
+
+    def append(self, record: Dict) -> None:
+        """Add a record to the journal"""
+        self.recent.append(record)
+        self.count += 1
+        self.recorder.record(record)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Every record written so far, read back from disk"""
+        self.recorder.flush()
+        for path in self.recorder.files:
+            yield from read_journal(path)
+
+    def close(self) -> None:
+        self.recorder.close()
+
+
+def read_journal(paths: Union[str, Path, Iterable[Union[str, Path]]]) -> Iterator[Dict]:
+    """
+    Lazily yield records from journal files
+
+    Args:
+        paths: A file, a glob pattern (e.g. 'data/arbitrage_*.jsonl') or a list of files.
+            Legacy arbitrage_*.json files (one JSON array) are read too.
+
+    Yields:
+        One record at a time; a partially written last line is skipped
+    """
+    if isinstance(paths, (str, Path)):
+        paths = sorted(glob.glob(str(paths))) or [paths]
+
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            continue
+
+        if path.suffix == '.json':
+            with open(path, 'r') as f:
+                try:
+                    yield from json.load(f)
+                except json.JSONDecodeError:
+                    print(f"Warning: could not parse {path}")
+            continue
+
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def load_journal(paths: Union[str, Path, Iterable[Union[str, Path]]], limit: Optional[int] = None) -> List[Dict]:
+    """
+    Rebuild the list of records from journal files
+
+    Args:
+        paths: Same as read_journal()
+        limit: Keep only the most recent `limit` records
+
+    Returns:
+        List of records in file order
+    """
+    if limit is not None:
+        return list(deque(read_journal(paths), maxlen=limit))
+    return list(read_journal(paths))
+
+
+def summarize_journal(pattern: str = 'data/arbitrage_*.jsonl'):
+    """Count the journaled opportunities and show the best one"""
+    records = 0
+    best = None
+    for record in read_journal(pattern):
+        records += 1
+        if best is None or record.get('net_profit_pct', 0) > best.get('net_profit_pct', 0):
+            best = record
+
+    print(f"{records} opportunities in {pattern}")
+    if best:
+        print(f"Best: {best.get('symbol', '')} buy {best.get('buy_from')} @ {best.get('buy_price')} "
+              f"sell {best.get('sell_to')} @ {best.get('sell_price')} "
+              f"net {best.get('net_profit_pct', 0):.3f}%")
+
+
+if __name__ == "__main__":
+    import sys
+
+    summarize_journal(*sys.argv[1:2])
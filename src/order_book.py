@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+"""
+Local L2 order books maintained from incremental WebSocket depth streams
+Binance @depth (REST snapshot + update-id sequencing), Kraken book (CRC32
+checksums) and Coinbase level2 feeds, stored as sorted NumPy arrays so depth
+and fill-price queries need no REST round trips
+"""
+
+import asyncio
+import json
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+import websockets
+
+try:
+    from rate_limiter import limiter_for_url
+    from websocket_monitor import to_binance_stream, to_kraken_pair, coinbase_product_map
+    from metrics import StreamStats, start_metrics_server
+    from depth_arbitrage import DEFAULT_FEE_PERCENT, evaluate_books
+except ImportError:  # imported as src.order_book
+    from src.rate_limiter import limiter_for_url
+    from src.websocket_monitor import to_binance_stream, to_kraken_pair, coinbase_product_map
+    from src.metrics import StreamStats, start_metrics_server
+    from src.depth_arbitrage import DEFAULT_FEE_PERCENT, evaluate_books
+
+
+BINANCE_WS_URL = "wss://stream.binance.com:9443/stream"
+BINANCE_DEPTH_URL = "https://api.binance.com/api/v3/depth"
+BINANCE_SNAPSHOT_LIMIT = 1000
+
+KRAKEN_WS_URL = "wss://ws.kraken.com"
+KRAKEN_DEPTH = 10            # Kraken checksums cover the top 10 levels of each side
+
+COINBASE_WS_URL = "wss://ws-feed.exchange.coinbase.com"
+COINBASE_CHANNEL = "level2_batch"  # Unauthenticated level2 (updates batched every 50ms)
+
+INITIAL_CAPACITY = 256       # Levels preallocated per side, grown by doubling
+
+
+class BookSide:
+    """
+    One side of an order book as parallel sorted arrays
+
+    Prices are stored as sort keys (negated for bids) so both sides are
+    ascending from the best level, and lookups are a single searchsorted.
+    Cumulative size and notional are cached until the next update.
+    """
+
+    def __init__(self, is_bid: bool, capacity: int = INITIAL_CAPACITY):
+        self.is_bid = is_bid
+        self._keys = np.empty(capacity, dtype=np.float64)
+        self._sizes = np.empty(capacity, dtype=np.float64)
+        self.n = 0
+        self._cum = None
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _key(self, price: float) -> float:
+        return -price if self.is_bid else price
+
+    def _grow(self, capacity: int) -> None:
+        new_capacity = max(capacity, 2 * len(self._keys))
+        keys = np.empty(new_capacity, dtype=np.float64)
+        sizes = np.empty(new_capacity, dtype=np.float64)
+        keys[:self.n] = self._keys[:self.n]
+        sizes[:self.n] = self._sizes[:self.n]
+        self._keys, self._sizes = keys, sizes
+
+    def load(self, prices, sizes) -> None:
+        """Replace the side with a snapshot (any order, zero sizes dropped)"""
+        prices = np.asarray(prices, dtype=np.float64)
+        sizes = np.asarray(sizes, dtype=np.float64)
+        mask = sizes > 0
+        keys = -prices[mask] if self.is_bid else prices[mask]
+        sizes = sizes[mask]
+        order = np.argsort(keys, kind='stable')
+
+        if len(keys) > len(self._keys):
+            self._grow(len(keys))
+        self.n = len(keys)
+        self._keys[:self.n] = keys[order]
+        self._sizes[:self.n] = sizes[order]
+        self._cum = None
+
+    def update(self, price: float, size: float) -> None:
+        """Set the size at a price level (size 0 removes the level)"""
+        key = self._key(price)
+        n = self.n
+        i = int(np.searchsorted(self._keys[:n], key))
+
+        if i < n and self._keys[i] == key:
+            if size > 0:
+                self._sizes[i] = size
+            else:
+                self._keys[i:n - 1] = self._keys[i + 1:n]
+                self._sizes[i:n - 1] = self._sizes[i + 1:n]
+                self.n -= 1
+        elif size > 0:
+            if n == len(self._keys):
+                self._grow(n + 1)
+            self._keys[i + 1:n + 1] = self._keys[i:n]
+            self._sizes[i + 1:n + 1] = self._sizes[i:n]
+            self._keys[i] = key
+            self._sizes[i] = size
+            self.n += 1
+
+        self._cum = None
+
+    def truncate(self, depth: int) -> None:
+        """Keep only the best `depth` levels"""
+        if self.n > depth:
+            self.n = depth
+            self._cum = None
+
+    @property
+    def prices(self) -> np.ndarray:
+        """Prices from best to worst"""
+        keys = self._keys[:self.n]
+        return -keys if self.is_bid else keys.copy()
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """Sizes from best to worst"""
+        return self._sizes[:self.n].copy()
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        """Best (price, size) or None if the side is empty"""
+        if not self.n:
+            return None
+        return float(self._key(self._keys[0])), float(self._sizes[0])
+
+    def top(self, depth: int) -> List[Tuple[float, float]]:
+        """Best `depth` levels as (price, size) tuples"""
+        n = min(depth, self.n)
+        prices = -self._keys[:n] if self.is_bid else self._keys[:n]
+        return list(zip(prices.tolist(), self._sizes[:n].tolist()))
+
+    def _cumulative(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._cum is None:
+            sizes = self._sizes[:self.n]
+            prices = np.abs(self._keys[:self.n])
+            self._cum = (np.cumsum(sizes), np.cumsum(prices * sizes))
+        return self._cum
+
+    def size_through(self, price: float) -> float:
+        """Total size at prices at or better than `price`"""
+        i = int(np.searchsorted(self._keys[:self.n], self._key(price), side='right'))
+        if i == 0:
+            return 0.0
+        return float(self._cumulative()[0][i - 1])
+
+    def fill(self, quantity: float) -> Tuple[float, float, Optional[float]]:
+        """
+        Walk the side to fill `quantity`
+
+        Returns:
+            (filled quantity, notional, worst price touched) - filled is less
+            than quantity when the book is too thin
+        """
+        if not self.n or quantity <= 0:
+            return 0.0, 0.0, None
+
+        cum_size, cum_notional = self._cumulative()
+        i = int(np.searchsorted(cum_size, quantity))
+
+        if i >= self.n:
+            return float(cum_size[-1]), float(cum_notional[-1]), float(abs(self._keys[self.n - 1]))
+
+        price = abs(self._keys[i])
+        filled_before = cum_size[i - 1] if i else 0.0
+        notional_before = cum_notional[i - 1] if i else 0.0
+        notional = notional_before + (quantity - filled_before) * price
+
+        return float(quantity), float(notional), float(price)
+
+
+class OrderBook:
+    """Bids and asks for one (exchange, symbol)"""
+
+    def __init__(self, symbol: str, exchange: str):
+        self.symbol = symbol
+        self.exchange = exchange
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+
+        self.sequence = None      # Last applied update id (Binance)
+        self.synced = False       # False until a snapshot has been applied
+        self.updated_at = None
+        self.updates = 0
+        self.resyncs = 0
+
+    def load_snapshot(self, bids, asks, sequence: Optional[int] = None) -> None:
+        """
+        Replace the book with a snapshot
+
+        Args:
+            bids: Iterable of [price, size] (strings or numbers)
+            asks: Iterable of [price, size]
+            sequence: Update id the snapshot corresponds to
+        """
+        bids = np.array([[float(level[0]), float(level[1])] for level in bids]).reshape(-1, 2)
+        asks = np.array([[float(level[0]), float(level[1])] for level in asks]).reshape(-1, 2)
+        self.bids.load(bids[:, 0], bids[:, 1])
+        self.asks.load(asks[:, 0], asks[:, 1])
+
+        self.sequence = sequence
+        self.synced = True
+        self.updated_at = datetime.now()
+
+    def update(self, side: str, price: float, size: float) -> None:
+        """Apply one level change; side is 'bid' or 'ask'"""
+        (self.bids if side == 'bid' else self.asks).update(float(price), float(size))
+        self.updates += 1
+        self.updated_at = datetime.now()
+
+    def best_bid(self) -> Optional[float]:
+        best = self.bids.best()
+        return best[0] if best else None
+
+    def best_ask(self) -> Optional[float]:
+        best = self.asks.best()
+        return best[0] if best else None
+
+    def mid(self) -> Optional[float]:
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def spread_pct(self) -> Optional[float]:
+        bid, ask = self.best_bid(), self.best_ask()
+        if not bid or not ask:
+            return None
+        return (ask - bid) / bid * 100
+
+    def depth_at_price(self, side: str, price: float) -> float:
+        """
+        Quantity available to a taker up to a limit price
+
+        Args:
+            side: 'buy' (consumes asks at or below price) or 'sell' (hits bids at or above price)
+            price: Limit price
+
+        Returns:
+            Base-currency quantity
+        """
+        return (self.asks if side == 'buy' else self.bids).size_through(price)
+
+    def fill_price(self, side: str, quantity: float) -> Optional[Dict]:
+        """
+        Average price for a market order of `quantity`
+
+        Args:
+            side: 'buy' or 'sell'
+            quantity: Base-currency quantity
+
+        Returns:
+            Dict with avg_price, worst_price, filled and notional, or None if the side is empty
+        """
+        filled, notional, worst = (self.asks if side == 'buy' else self.bids).fill(quantity)
+        if not filled:
+            return None
+
+        return {
+            'avg_price': notional / filled,
+            'worst_price': worst,
+            'filled': filled,
+            'notional': notional,
+            'complete': filled >= quantity,
+        }
+
+    def to_dict(self, depth: int = 10) -> Dict:
+        """Top of the book for JSON output"""
+        return {
+            'exchange': self.exchange,
+            'symbol': self.symbol,
+            'bids': self.bids.top(depth),
+            'asks': self.asks.top(depth),
+            'synced': self.synced,
+            'updates': self.updates,
+            'resyncs': self.resyncs,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+def kraken_checksum(book: OrderBook, price_decimals: int, volume_decimals: int) -> int:
+    """
+    CRC32 of the top 10 asks then top 10 bids, as Kraken computes it
+
+    Each price and volume is printed at the pair's precision, the decimal point
+    removed and leading zeros stripped, and everything concatenated.
+    """
+    def fmt(value: float, decimals: int) -> str:
+        return f"{value:.{decimals}f}".replace('.', '').lstrip('0')
+
+    parts = [fmt(price, price_decimals) + fmt(size, volume_decimals)
+             for price, size in book.asks.top(10) + book.bids.top(10)]
+    return zlib.crc32(''.join(parts).encode())
+
+
+def _decimals(value: str) -> int:
+    return len(value.split('.')[1]) if '.' in value else 0
+
+
+class OrderBookMonitor:
+    """
+    Maintain local order books for several symbols on Binance, Kraken and Coinbase
+
+    One multiplexed socket per exchange, like WebSocketPriceMonitor. Books
+    resync automatically: Binance on an update-id gap, Kraken on a checksum
+    mismatch, Coinbase on reconnect.
+    """
+
+    def __init__(self, symbols: List[str], kraken_depth: int = KRAKEN_DEPTH):
+        """
+        Initialize the monitor
+
+        Args:
+            symbols: Symbols to track, e.g. ['BTC/USDT', 'ETH/USDT']
+            kraken_depth: Kraken subscription depth (10, 25, 100, 500 or 1000)
+        """
+        self.symbols = list(symbols)
+        self.kraken_depth = kraken_depth
+
+        self.binance_streams = {to_binance_stream(s): s for s in self.symbols}
+        self.kraken_pairs = {to_kraken_pair(s): s for s in self.symbols}
+        self.coinbase_products = coinbase_product_map(self.symbols)
+
+        self.books = {
+            exchange: {s: OrderBook(s, exchange) for s in self.symbols}
+            for exchange in ['binance', 'kraken', 'coinbase']
+        }
+
+        # Binance diffs received while a snapshot is in flight
+        self._binance_buffers = {s: [] for s in self.symbols}
+        self._binance_resyncing = set()
+
+        # Kraken price/volume decimals per pair, learned from the snapshot
+        self._kraken_precision = {}
+
+        # Prometheus message rate/gap metrics per exchange
+        self.stream_stats = StreamStats('book')
+
+    def get_book(self, exchange: str, symbol: str) -> Optional[OrderBook]:
+        """Return the book for (exchange, symbol) if it is in sync"""
+        book = self.books.get(exchange, {}).get(symbol)
+        return book if book is not None and book.synced else None
+
+    def depth_opportunities(self, symbol: str, fee_percent: float = DEFAULT_FEE_PERCENT,
+                            max_notional: Optional[float] = None) -> List[Dict]:
+        """Executable routes for a symbol across the synced books, ranked by dollar PnL"""
+        books = {exchange: self.get_book(exchange, symbol) for exchange in self.books}
+        return evaluate_books(books, fee_percent, max_notional, symbol=symbol)
+
+    # ------------------------------------------------------------------
+    # Binance: REST snapshot + @depth diffs sequenced by update id
+    # ------------------------------------------------------------------
+
+    def _apply_binance_event(self, book: OrderBook, event: Dict) -> bool:
+        """Apply one depth diff; returns False on a sequence gap"""
+        if event['u'] <= book.sequence:
+            return True  # Already contained in the snapshot
+        if event['U'] > book.sequence + 1:
+            return False
+
+        for price, size in event['b']:
+            book.update('bid', price, size)
+        for price, size in event['a']:
+            book.update('ask', price, size)
+        book.sequence = event['u']
+        return True
+
+    async def _resync_binance(self, session: aiohttp.ClientSession, symbol: str) -> None:
+        """Fetch a snapshot and replay buffered diffs until the book is continuous"""
+        book = self.books['binance'][symbol]
+        url = f"{BINANCE_DEPTH_URL}?symbol={symbol.replace('/', '')}&limit={BINANCE_SNAPSHOT_LIMIT}"
+
+        try:
+            while True:
+                try:
+                    await limiter_for_url(url).acquire_async()
+                    async with session.get(url) as response:
+                        response.raise_for_status()
+                        snapshot = await response.json()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    print(f"❌ Binance snapshot error for {symbol}: {e}")
+                    await asyncio.sleep(1)
+                    continue
+
+                buffered = self._binance_buffers[symbol]
+                self._binance_buffers[symbol] = []
+                book.load_snapshot(snapshot['bids'], snapshot['asks'], sequence=snapshot['lastUpdateId'])
+
+                if all(self._apply_binance_event(book, event) for event in buffered):
+                    return
+
+                # Buffer starts after the snapshot - keep it for a newer one
+                self._binance_buffers[symbol] = buffered + self._binance_buffers[symbol]
+                book.synced = False
+        finally:
+            self._binance_resyncing.discard(symbol)
+
+    async def connect_binance_depth(self):
+        """Connect to Binance combined depth streams for all symbols"""
+        streams = '/'.join(f"{stream}@depth@100ms" for stream in self.binance_streams)
+        uri = f"{BINANCE_WS_URL}?streams={streams}"
+
+        try:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
+                async with websockets.connect(uri) as websocket:
+                    print(f"✅ Connected to Binance depth streams ({len(self.binance_streams)} symbols)")
+
+                    while True:
+                        message = json.loads(await websocket.recv())
+                        self.stream_stats.message('binance', time.perf_counter_ns())
+                        symbol = self.binance_streams.get(message.get('stream', '').split('@')[0])
+                        event = message.get('data')
+                        if symbol is None or not event:
+                            continue
+
+                        book = self.books['binance'][symbol]
+                        if book.synced and self._apply_binance_event(book, event):
+                            continue
+
+                        if book.synced:
+                            print(f"⚠️  Binance {symbol} sequence gap, resyncing")
+                            book.synced = False
+                            book.resyncs += 1
+
+                        self._binance_buffers[symbol].append(event)
+                        if symbol not in self._binance_resyncing:
+                            self._binance_resyncing.add(symbol)
+                            asyncio.create_task(self._resync_binance(session, symbol))
+
+        except Exception as e:
+            error_msg = str(e)
+            if "451" in error_msg:
+                print(f"⚠️  Binance depth stream unavailable (geo-restricted)")
+            else:
+                print(f"❌ Binance depth stream error: {e}")
+            for book in self.books['binance'].values():
+                book.synced = False
+
+    # ------------------------------------------------------------------
+    # Kraken: book snapshot + diffs verified with CRC32 checksums
+    # ------------------------------------------------------------------
+
+    def _book_subscription(self, event: str, pairs: List[str]) -> str:
+        return json.dumps({
+            "event": event,
+            "pair": pairs,
+            "subscription": {"name": "book", "depth": self.kraken_depth}
+        })
+
+    def _apply_kraken_message(self, data: list) -> Optional[str]:
+        """
+        Apply a Kraken book message
+
+        Returns:
+            The Kraken pair name if its checksum failed and it needs a resync
+        """
+        pair = data[-1]
+        symbol = self.kraken_pairs.get(pair)
+        if symbol is None:
+            return None
+
+        book = self.books['kraken'][symbol]
+        payloads = [part for part in data[1:-2] if isinstance(part, dict)]
+
+        # Snapshot: {"as": [[price, volume, timestamp], ...], "bs": [...]}
+        if payloads and ('as' in payloads[0] or 'bs' in payloads[0]):
+            snapshot = payloads[0]
+            levels = snapshot.get('as') or snapshot.get('bs')
+            if levels:
+                self._kraken_precision[pair] = (_decimals(levels[0][0]), _decimals(levels[0][1]))
+            book.load_snapshot(
+                [level[:2] for level in snapshot.get('bs', [])],
+                [level[:2] for level in snapshot.get('as', [])]
+            )
+            return None
+
+        if not book.synced:
+            return None
+
+        checksum = None
+        for payload in payloads:
+            for price, volume, *_ in payload.get('a', []):
+                book.update('ask', price, volume)
+            for price, volume, *_ in payload.get('b', []):
+                book.update('bid', price, volume)
+            checksum = payload.get('c', checksum)
+
+        # Kraken only maintains the subscribed depth
+        book.asks.truncate(self.kraken_depth)
+        book.bids.truncate(self.kraken_depth)
+
+        if checksum is not None and pair in self._kraken_precision:
+            if kraken_checksum(book, *self._kraken_precision[pair]) != int(checksum):
+                book.synced = False
+                book.resyncs += 1
+                return pair
+
+        return None
+
+    async def connect_kraken_book(self):
+        """Connect to Kraken book channel for all symbols"""
+        try:
+            async with websockets.connect(KRAKEN_WS_URL) as websocket:
+                await websocket.send(self._book_subscription("subscribe", list(self.kraken_pairs)))
+                print(f"✅ Connected to Kraken book feed ({len(self.kraken_pairs)} pairs)")
+
+                while True:
+                    data = json.loads(await websocket.recv())
+                    self.stream_stats.message('kraken', time.perf_counter_ns())
+
+                    # Book messages: [channelID, {...}, ({...},) "book-10", "XBT/USDT"]
+                    if not isinstance(data, list) or len(data) < 4:
+                        continue
+
+                    stale_pair = self._apply_kraken_message(data)
+                    if stale_pair:
+                        print(f"⚠️  Kraken {stale_pair} checksum mismatch, resubscribing")
+                        await websocket.send(self._book_subscription("unsubscribe", [stale_pair]))
+                        await websocket.send(self._book_subscription("subscribe", [stale_pair]))
+
+        except Exception as e:
+            print(f"❌ Kraken book feed error: {e}")
+            for book in self.books['kraken'].values():
+                book.synced = False
+            await asyncio.sleep(5)
+
+    # ------------------------------------------------------------------
+    # Coinbase: level2 snapshot + l2update changes
+    # ------------------------------------------------------------------
+
+    def _apply_coinbase_message(self, data: Dict) -> None:
+        # One product can stand in for several symbols (BTC/USDT and BTC/USD)
+        for symbol in self.coinbase_products.get(data.get('product_id'), ()):
+            book = self.books['coinbase'][symbol]
+
+            if data['type'] == 'snapshot':
+                book.load_snapshot(data['bids'], data['asks'])
+            elif data['type'] == 'l2update' and book.synced:
+                for side, price, size in data['changes']:
+                    book.update('bid' if side == 'buy' else 'ask', price, size)
+
+    async def connect_coinbase_level2(self):
+        """Connect to Coinbase level2 channel for all symbols"""
+        try:
+            async with websockets.connect(COINBASE_WS_URL, max_size=None) as websocket:
+                subscribe_msg = {
+                    "type": "subscribe",
+                    "product_ids": list(self.coinbase_products),
+                    "channels": [COINBASE_CHANNEL]
+                }
+                await websocket.send(json.dumps(subscribe_msg))
+                print(f"✅ Connected to Coinbase level2 feed ({len(self.coinbase_products)} products)")
+
+                while True:
+                    data = json.loads(await websocket.recv())
+                    self.stream_stats.message('coinbase', time.perf_counter_ns())
+
+                    if data.get('type') == 'error':
+                        print(f"❌ Coinbase level2 error: {data.get('message')} {data.get('reason', '')}")
+                    elif data.get('type') in ('snapshot', 'l2update'):
+                        self._apply_coinbase_message(data)
+
+        except Exception as e:
+            print(f"❌ Coinbase level2 feed error: {e}")
+            for book in self.books['coinbase'].values():
+                book.synced = False
+            await asyncio.sleep(5)
+
+    # ------------------------------------------------------------------
+
+    async def _keep_connected(self, connect):
+        """Reconnect a feed whenever it drops; a fresh snapshot resyncs the books"""
+        while True:
+            await connect()
+            await asyncio.sleep(1)
+
+    def display_books(self, trade_size_usd: float = 10000):
+        """Display top of book and the cost of a market order per book"""
+        print("\n" + "="*100)
+        print(f"Order Books at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} (fill prices for ${trade_size_usd:,.0f})")
+        print("="*100)
+        print(f"{'Symbol':<12} {'Exchange':<10} {'Bid':<12} {'Ask':<12} {'Spread':<9} {'Buy fill':<12} {'Sell fill':<12} {'Levels':<10}")
+        print("-"*100)
+
+        for symbol in self.symbols:
+            for exchange, books in self.books.items():
+                book = books[symbol]
+                if not book.synced or book.mid() is None:
+                    print(f"{symbol:<12} {exchange.capitalize():<10} {'SYNCING...':>12}")
+                    continue
+
+                quantity = trade_size_usd / book.mid()
+                buy = book.fill_price('buy', quantity)
+                sell = book.fill_price('sell', quantity)
+                print(f"{symbol:<12} {exchange.capitalize():<10} ${book.best_bid():<11.2f} ${book.best_ask():<11.2f} "
+                      f"{book.spread_pct():<8.4f}% ${buy['avg_price']:<11.2f} ${sell['avg_price']:<11.2f} "
+                      f"{len(book.bids)}/{len(book.asks)}")
+
+        print(f"\nExecutable arbitrage ({DEFAULT_FEE_PERCENT}% fee per trade, largest profitable size):")
+        for symbol in self.symbols:
+            routes = self.depth_opportunities(symbol)
+            if not routes:
+                print(f"  {symbol:<12} none")
+                continue
+            route = routes[0]
+            print(f"  {symbol:<12} {route['buy_from']} → {route['sell_to']}: {route['quantity']:.6f} "
+                  f"for ${route['pnl_usd']:,.2f} ({route['pnl_pct']:.3f}% on ${route['cost_usd']:,.0f})")
+
+    async def display_loop(self, interval: float = 5):
+        """Periodically display the books"""
+        await asyncio.sleep(3)  # Wait for snapshots
+
+        while True:
+            self.display_books()
+            await asyncio.sleep(interval)
+
+    async def run(self, display: bool = True):
+        """Start all depth feeds"""
+        tasks = [
+            asyncio.create_task(self.connect_binance_depth()),  # Not retried: usually geo-blocked
+            asyncio.create_task(self._keep_connected(self.connect_kraken_book)),
+            asyncio.create_task(self._keep_connected(self.connect_coinbase_level2)),
+        ]
+        if display:
+            tasks.append(asyncio.create_task(self.display_loop()))
+
+        await asyncio.gather(*tasks)
+
+
+async def main():
+    """Main entry point"""
+    print("📚 Crypto Arbitrage Bot - Order Book Monitor")
+    print("="*80)
+    print("Press Ctrl+C to stop\n")
+
+    start_metrics_server()
+    monitor = OrderBookMonitor(symbols=['BTC/USDT', 'ETH/USDT', 'SOL/USDT'])
+    await monitor.run()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nExiting...")
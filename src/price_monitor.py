@@ -8,25 +8,19 @@ import ccxt
 import time
 from datetime import datetime
 
+try:
+    from async_fetcher import get_fetcher
+    from metrics import OPPORTUNITIES, route, start_metrics_server
+    from spread_engine import find_opportunities
+except ImportError:  # imported as src.price_monitor
+    from src.async_fetcher import get_fetcher
+    from src.metrics import OPPORTUNITIES, route, start_metrics_server
+    from src.spread_engine import find_opportunities
 
-def fetch_prices(exchanges, symbol='BTC/USDT'):
-    """Fetch current price for a symbol from multiple exchanges"""
-    prices = {}
-
-    for exchange_name, exchange in exchanges.items():
-        try:
-            ticker = exchange.fetch_ticker(symbol)
-            prices[exchange_name] = {
-                'bid': ticker['bid'],
-                'ask': ticker['ask'],
-                'last': ticker['last'],
-                'timestamp': ticker['timestamp']
-            }
-        except Exception as e:
-            print(f"Error fetching from {exchange_name}: {e}")
-            prices[exchange_name] = None
 
-    return prices
+def fetch_prices(exchanges, symbol='BTC/USDT'):
+    """Fetch current price for a symbol from all exchanges concurrently"""
+    return get_fetcher(exchanges).fetch_prices(symbol)
 
 
 def calculate_arbitrage(prices, fee_percent=0.1):
@@ -34,31 +28,7 @@ def calculate_arbitrage(prices, fee_percent=0.1):
     Calculate potential arbitrage opportunities
     fee_percent: Trading fee percentage (default 0.1% = Binance fee)
     """
-    opportunities = []
-    exchange_names = list(prices.keys())
-
-    for i, buy_exchange in enumerate(exchange_names):
-        for sell_exchange in exchange_names[i+1:]:
-            if prices[buy_exchange] and prices[sell_exchange]:
-                buy_price = prices[buy_exchange]['ask']
-                sell_price = prices[sell_exchange]['bid']
-
-                # Calculate profit percentage after fees
-                gross_profit = ((sell_price - buy_price) / buy_price) * 100
-                fees = fee_percent * 2  # Buy fee + sell fee
-                net_profit = gross_profit - fees
-
-                if net_profit > 0:
-                    opportunities.append({
-                        'buy_from': buy_exchange,
-                        'sell_to': sell_exchange,
-                        'buy_price': buy_price,
-                        'sell_price': sell_price,
-                        'gross_profit_pct': gross_profit,
-                        'net_profit_pct': net_profit
-                    })
-
-    return opportunities
+    return find_opportunities(prices, fee_percent)
 
 
 def display_prices(prices, symbol):
@@ -98,6 +68,7 @@ def main():
     """Main monitoring loop"""
     print("🤖 Crypto Arbitrage Bot - Price Monitor")
     print("Starting up...\n")
+    start_metrics_server()
 
     # Initialize exchanges (using public APIs, no authentication needed)
     exchanges = {
@@ -132,6 +103,8 @@ def main():
             # Calculate and display arbitrage opportunities
             opportunities = calculate_arbitrage(prices, fee_percent)
             display_opportunities(opportunities)
+            for opp in opportunities:
+                OPPORTUNITIES.labels(symbol=symbol, route=route(opp['buy_from'], opp['sell_to'])).inc()
 
             # Wait before next iteration
             print(f"\n⏳ Waiting 10 seconds before next check...")
@@ -8,6 +8,8 @@ import time
 from datetime import datetime
 import threading
 from pump_fun_monitor import PumpFunMonitor
+from http_client import get_http_client
+from metrics import metrics_response, observe_update_loop
 
 app = Flask(__name__)
 
@@ -88,13 +90,17 @@ def update_data_loop():
     """Background thread to update token data"""
     while True:
         try:
+            started = time.perf_counter()
             tokens = []
             all_opportunities = []
 
+            # Fetch all tokens in batched DexScreener requests
+            token_pairs = monitor.fetch_dexscreener_pairs_batch([t['address'] for t in TOKEN_LIST])
+
             for token_info in TOKEN_LIST:
                 try:
                     # Fetch token data
-                    data = monitor.fetch_dexscreener_pairs(token_info['address'])
+                    data = token_pairs.get(token_info['address'])
 
                     if data and 'pairs' in data:
                         pairs = data['pairs']
@@ -128,8 +134,6 @@ def update_data_loop():
                 except Exception as e:
                     print(f"Error fetching {token_info['symbol']}: {e}")
 
-                time.sleep(0.3)  # Rate limiting
-
             # Sort opportunities by profit
             all_opportunities.sort(key=lambda x: x['net_profit_pct'], reverse=True)
 
@@ -138,6 +142,7 @@ def update_data_loop():
                 latest_data['arbitrage_opportunities'] = all_opportunities[:10]  # Top 10
                 latest_data['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 latest_data['iteration'] += 1
+            observe_update_loop('pump_fun', started, len(all_opportunities))
 
         except Exception as e:
             print(f"Error in update loop: {e}")
@@ -156,6 +161,18 @@ def get_data():
         return jsonify(latest_data)
 
 
+@app.route('/api/http_stats')
+def get_http_stats():
+    """Connection reuse counters for the shared HTTP client"""
+    return jsonify(get_http_client().stats())
+
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint"""
+    return metrics_response()
+
+
 if __name__ == '__main__':
     print("\n" + "="*70)
     print("🚀 PUMP.FUN DEX DASHBOARD")
@@ -164,6 +181,10 @@ if __name__ == '__main__':
     print(f"Tokens: {', '.join([t['symbol'] for t in TOKEN_LIST])}")
     print("="*70)
 
+    # Open keep-alive connections before the first refresh
+    get_http_client().preconnect()
+    print("✓ Pre-connected to DEX APIs")
+
     # Start background thread
     update_thread = threading.Thread(target=update_data_loop, daemon=True)
     update_thread.start()
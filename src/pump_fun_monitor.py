@@ -4,13 +4,19 @@ Pump.fun Monitor - Price monitoring for Solana memecoins on Pump.fun
 Integrates with existing arbitrage bot infrastructure for DEX monitoring
 """
 
-import requests
-import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, getcontext
 
+try:
+    from http_client import get_http_client
+    from rate_limiter import limiter_for_url
+except ImportError:  # imported as src.pump_fun_monitor
+    from src.http_client import get_http_client
+    from src.rate_limiter import limiter_for_url
+
 # Try importing Solana libraries (optional for enhanced features)
 try:
     from solders.pubkey import Pubkey
@@ -31,9 +37,12 @@ PUMP_PROGRAM_ADDRESS = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
 SOLANA_RPC_ENDPOINT = "https://api.mainnet-beta.solana.com"
 PUMP_CURVE_TOKEN_DECIMALS = 6
 
-# Rate limiting
-REQUESTS_PER_MINUTE = 60
-REQUEST_INTERVAL = 60.0 / REQUESTS_PER_MINUTE  # 1 second between requests
+# Rate limiting is handled by the shared per-host token buckets in rate_limiter.py,
+# applied by the pooled HTTP client for DexScreener requests
+
+# DexScreener accepts up to 30 comma-separated token addresses per request
+MAX_TOKENS_PER_REQUEST = 30
+MAX_CONCURRENT_REQUESTS = 8
 
 
 class PumpFunMonitor:
@@ -41,22 +50,15 @@ class PumpFunMonitor:
 
     def __init__(self, demo_mode=False):
         self.demo_mode = demo_mode
-        self.last_request_time = 0
         self.solana_client = None
 
+        # Shared keep-alive HTTP client (rate limited per host)
+        self.http = get_http_client()
+        self.rpc_limiter = limiter_for_url(SOLANA_RPC_ENDPOINT)
+
         if SOLANA_AVAILABLE:
             self.solana_client = AsyncClient(SOLANA_RPC_ENDPOINT)
 
-    def _rate_limit(self):
-        """Enforce rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-
-        if time_since_last < REQUEST_INTERVAL:
-            time.sleep(REQUEST_INTERVAL - time_since_last)
-
-        self.last_request_time = time.time()
-
     def fetch_dexscreener_pairs(self, token_address: str) -> Optional[Dict]:
         """
         Fetch token pair data from DexScreener API
@@ -67,11 +69,9 @@ class PumpFunMonitor:
         Returns:
             Dictionary with pair data or None on error
         """
-        self._rate_limit()
-
         try:
             url = f"{DEXSCREENER_BASE_URL}/tokens/{token_address}"
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -84,6 +84,66 @@ class PumpFunMonitor:
             print(f"Error fetching from DexScreener: {e}")
             return None
 
+    def _fetch_token_batch(self, token_addresses: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Fetch pairs for up to MAX_TOKENS_PER_REQUEST tokens in one request
+
+        Args:
+            token_addresses: Solana token mint addresses
+
+        Returns:
+            Dictionary mapping each requested address to its pairs
+        """
+        results = {address: [] for address in token_addresses}
+
+        try:
+            url = f"{DEXSCREENER_BASE_URL}/tokens/{','.join(token_addresses)}"
+            response = self.http.get(url, timeout=10)
+
+            if response.status_code != 200:
+                print(f"DexScreener API error: {response.status_code}")
+                return results
+
+            for pair in response.json().get('pairs') or []:
+                # A pair belongs to the requested token on either side
+                for side in ('baseToken', 'quoteToken'):
+                    address = pair.get(side, {}).get('address')
+                    if address in results:
+                        results[address].append(pair)
+
+        except Exception as e:
+            print(f"Error fetching from DexScreener: {e}")
+
+        return results
+
+    def fetch_dexscreener_pairs_batch(self, token_addresses: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch pair data for many tokens with batched, concurrent requests
+
+        Args:
+            token_addresses: Solana token mint addresses
+
+        Returns:
+            Dictionary mapping addresses to ``{'pairs': [...]}`` (same shape as
+            fetch_dexscreener_pairs); tokens without pairs are omitted
+        """
+        addresses = list(dict.fromkeys(token_addresses))
+        batches = [
+            addresses[i:i + MAX_TOKENS_PER_REQUEST]
+            for i in range(0, len(addresses), MAX_TOKENS_PER_REQUEST)
+        ]
+        if not batches:
+            return {}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(len(batches), MAX_CONCURRENT_REQUESTS)) as executor:
+            for batch_results in executor.map(self._fetch_token_batch, batches):
+                for address, pairs in batch_results.items():
+                    if pairs:
+                        results[address] = {'pairs': pairs}
+
+        return results
+
     def fetch_trending_pumpfun_tokens(self) -> List[Dict]:
         """
         Fetch trending Pump.fun tokens from DexScreener
@@ -92,12 +152,10 @@ class PumpFunMonitor:
         Returns:
             List of token dictionaries
         """
-        self._rate_limit()
-
         try:
             # Search for pump.fun tokens
             url = f"{DEXSCREENER_BASE_URL}/search?q=pump.fun"
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -139,8 +197,10 @@ class PumpFunMonitor:
             return None
 
         # Use first pair (usually highest liquidity)
-        pair = pairs[0]
+        return self._parse_token_pair(pairs[0], token_address)
 
+    def _parse_token_pair(self, pair: Dict, token_address: str) -> Dict:
+        """Extract price data for a token from a DexScreener pair object"""
         return {
             'symbol': pair.get('baseToken', {}).get('symbol', 'UNKNOWN'),
             'name': pair.get('baseToken', {}).get('name', 'Unknown'),
@@ -213,6 +273,7 @@ class PumpFunMonitor:
         ])
 
         try:
+            await self.rpc_limiter.acquire_async()
             resp = await self.solana_client.get_account_info(curve_address)
             value = resp.value
 
@@ -280,6 +341,9 @@ class PumpFunMonitor:
         """
         Fetch prices for multiple tokens
 
+        Tokens are looked up in batches of MAX_TOKENS_PER_REQUEST, so large
+        watchlists take a handful of concurrent requests.
+
         Args:
             token_addresses: List of token mint addresses
 
@@ -288,11 +352,13 @@ class PumpFunMonitor:
         """
         results = {}
 
-        for address in token_addresses:
-            price_data = self.fetch_token_price_dexscreener(address)
-            if price_data:
-                results[address] = price_data
-            time.sleep(REQUEST_INTERVAL)  # Rate limiting
+        for address, data in self.fetch_dexscreener_pairs_batch(token_addresses).items():
+            # Use the most liquid pair for each token
+            pair = max(data['pairs'], key=lambda p: float((p.get('liquidity') or {}).get('usd') or 0))
+            try:
+                results[address] = self._parse_token_pair(pair, address)
+            except (TypeError, ValueError) as e:
+                print(f"Error parsing {address}: {e}")
 
         return results
 
@@ -422,8 +488,6 @@ def main():
             else:
                 print(f"  ❌ Token not found or no active pairs")
 
-            time.sleep(1)  # Rate limiting
-
         print(f"\n✓ Successfully fetched {token_count}/{len(EXAMPLE_TOKENS)} tokens")
 
         # Fetch trending tokens
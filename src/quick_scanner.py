@@ -4,8 +4,13 @@ Quick Arbitrage Scanner - Top coins only
 """
 
 import ccxt
-import time
 from datetime import datetime
+from market_cache import get_market_cache
+from rate_limiter import limiter_for_exchange
+from spread_engine import best_opportunity
+
+# Requests go through the shared token buckets, so ccxt's own throttler is off
+CCXT_CONFIG = {'enableRateLimit': False}
 
 # Initialize exchanges - only use ones that work
 exchanges = {}
@@ -13,23 +18,27 @@ exchanges = {}
 print("🔧 Initializing exchanges...")
 
 try:
-    exchanges['Kraken'] = ccxt.kraken()
+    exchanges['Kraken'] = ccxt.kraken(CCXT_CONFIG)
     print("  ✓ Kraken initialized")
 except Exception as e:
     print(f"  ❌ Kraken failed: {e}")
 
 try:
-    exchanges['Coinbase'] = ccxt.coinbase()
+    exchanges['Coinbase'] = ccxt.coinbase(CCXT_CONFIG)
     print("  ✓ Coinbase initialized")
 except Exception as e:
     print(f"  ❌ Coinbase failed: {e}")
 
 try:
-    exchanges['Binance'] = ccxt.binance()
+    exchanges['Binance'] = ccxt.binance(CCXT_CONFIG)
     print("  ✓ Binance initialized")
 except Exception as e:
     print(f"  ❌ Binance failed: {e}")
 
+# Load markets from the on-disk cache so unlisted symbols are skipped without a request
+print("📦 Loading markets...")
+get_market_cache().load_all(exchanges)
+
 # Top cryptocurrencies to check (symbols that should exist on most exchanges)
 TOP_COINS = [
     'BTC/USDT', 'ETH/USDT', 'BTC/USD', 'ETH/USD',
@@ -51,7 +60,11 @@ def check_arbitrage(symbol):
 
     # Fetch from all exchanges
     for exchange_name, exchange in exchanges.items():
+        if exchange.markets and symbol not in exchange.markets:
+            continue
+
         try:
+            limiter_for_exchange(exchange).acquire()
             ticker = exchange.fetch_ticker(symbol)
             prices[exchange_name] = {
                 'bid': ticker['bid'],
@@ -67,35 +80,9 @@ def check_arbitrage(symbol):
         return None
 
     # Find best opportunity
-    best_opp = None
-    best_profit = 0
-
-    exchange_names = list(prices.keys())
-    for i, buy_ex in enumerate(exchange_names):
-        for sell_ex in exchange_names[i+1:]:
-            # Try both directions
-            for direction in [
-                (buy_ex, sell_ex, prices[buy_ex]['ask'], prices[sell_ex]['bid']),
-                (sell_ex, buy_ex, prices[sell_ex]['ask'], prices[buy_ex]['bid'])
-            ]:
-                buy_from, sell_to, buy_price, sell_price = direction
-
-                if buy_price and sell_price and buy_price > 0:
-                    gross_profit = ((sell_price - buy_price) / buy_price) * 100
-                    net_profit = gross_profit - (FEE_PERCENT * 2)
-
-                    if net_profit > best_profit and net_profit > MIN_PROFIT:
-                        best_profit = net_profit
-                        best_opp = {
-                            'symbol': symbol,
-                            'buy_from': buy_from,
-                            'sell_to': sell_to,
-                            'buy_price': buy_price,
-                            'sell_price': sell_price,
-                            'gross_profit_pct': gross_profit,
-                            'net_profit_pct': net_profit,
-                            'exchanges_checked': len(prices)
-                        }
+    best_opp = best_opportunity(prices, FEE_PERCENT, MIN_PROFIT, symbol)
+    if best_opp:
+        best_opp['exchanges_checked'] = len(prices)
 
     return best_opp
 
@@ -127,8 +114,6 @@ def main():
         except Exception as e:
             print(f"❌ Error: {str(e)[:50]}")
 
-        time.sleep(0.3)  # Rate limiting
-
     print(f"\n{'='*80}")
     print(f"📊 RESULTS")
     print(f"{'='*80}")
@@ -140,7 +125,7 @@ def main():
         print(f"\n💡 Tips for finding arbitrage:")
         print(f"   • Check less popular altcoins (lower liquidity)")
         print(f"   • Use faster data (WebSockets instead of REST)")
-        print(f"   • Look for triangle arbitrage (same exchange)")
+        print(f"   • Look for triangle arbitrage (same exchange): python src/triangular_arbitrage.py")
         print(f"   • Monitor during high volatility periods")
     else:
         # Sort by profit
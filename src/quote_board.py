@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Quote board: ordered best-bid/best-ask sides per symbol and an indexed heap
+of the top cross-exchange opportunities across all symbols
+A quote update touches one symbol's sides (bisect, O(log N) search) and one
+heap entry (O(log M)); nothing is rebuilt or re-sorted from scratch.
+"""
+
+import heapq
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from spread_engine import DEFAULT_FEE_PERCENT
+except ImportError:  # imported as src.quote_board
+    from src.spread_engine import DEFAULT_FEE_PERCENT
+
+
+class IndexedMaxHeap:
+    """
+    Binary max-heap with a key -> position index, so any entry's priority can
+    be changed or removed in O(log n)
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.priorities: List[float] = []
+        self.position: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.position
+
+    def _swap(self, i: int, j: int) -> None:
+        keys, priorities = self.keys, self.priorities
+        keys[i], keys[j] = keys[j], keys[i]
+        priorities[i], priorities[j] = priorities[j], priorities[i]
+        self.position[keys[i]] = i
+        self.position[keys[j]] = j
+
+    def _sift_up(self, i: int) -> None:
+        priorities = self.priorities
+        while i:
+            parent = (i - 1) >> 1
+            if priorities[parent] >= priorities[i]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int) -> None:
+        priorities, n = self.priorities, len(self.priorities)
+        while True:
+            largest, left = i, 2 * i + 1
+            if left < n and priorities[left] > priorities[largest]:
+                largest = left
+            if left + 1 < n and priorities[left + 1] > priorities[largest]:
+                largest = left + 1
+            if largest == i:
+                return
+            self._swap(i, largest)
+            i = largest
+
+    def set(self, key: str, priority: float) -> None:
+        """Insert the key or change its priority"""
+        i = self.position.get(key)
+        if i is None:
+            self.keys.append(key)
+            self.priorities.append(priority)
+            i = self.position[key] = len(self.keys) - 1
+            self._sift_up(i)
+            return
+
+        old = self.priorities[i]
+        self.priorities[i] = priority
+        if priority > old:
+            self._sift_up(i)
+        elif priority < old:
+            self._sift_down(i)
+
+    def remove(self, key: str) -> None:
+        i = self.position.pop(key, None)
+        if i is None:
+            return
+        last = len(self.keys) - 1
+        if i != last:
+            self.keys[i] = self.keys[last]
+            self.priorities[i] = self.priorities[last]
+            self.position[self.keys[i]] = i
+        self.keys.pop()
+        self.priorities.pop()
+        if i < len(self.keys):
+            self._sift_up(i)
+            self._sift_down(i)
+
+    def peek(self) -> Optional[Tuple[str, float]]:
+        return (self.keys[0], self.priorities[0]) if self.keys else None
+
+    def descending(self) -> Iterator[Tuple[str, float]]:
+        """Yield (key, priority) from highest to lowest without modifying the heap (O(log k) per item)"""
+        if not self.keys:
+            return
+        frontier = [(-self.priorities[0], 0)]
+        while frontier:
+            negative, i = heapq.heappop(frontier)
+            yield self.keys[i], -negative
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self.keys):
+                    heapq.heappush(frontier, (-self.priorities[child], child))
+
+    def clear(self) -> None:
+        self.__init__()
+
+
+class SymbolSides:
+    """Bid and ask sides for one symbol across exchanges, best first"""
+
+    def __init__(self):
+        self.bids: List[Tuple[float, str]] = []     # (-price, exchange): highest bid first
+        self.asks: List[Tuple[float, str]] = []     # (price, exchange): lowest ask first
+        self.quotes: Dict[str, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.quotes)
+
+    @staticmethod
+    def _discard(side: List[Tuple[float, str]], entry: Tuple[float, str]) -> None:
+        i = bisect_left(side, entry)
+        if i < len(side) and side[i] == entry:
+            del side[i]
+
+    def remove(self, exchange: str) -> None:
+        quote = self.quotes.pop(exchange, None)
+        if quote is not None:
+            bid, ask = quote
+            self._discard(self.bids, (-bid, exchange))
+            self._discard(self.asks, (ask, exchange))
+
+    def set(self, exchange: str, bid: float, ask: float) -> None:
+        self.remove(exchange)
+        self.quotes[exchange] = (bid, ask)
+        insort(self.bids, (-bid, exchange))
+        insort(self.asks, (ask, exchange))
+
+
+class QuoteBoard:
+    """
+    Latest quotes per (symbol, exchange) with incrementally maintained opportunities
+
+    With one fee for every exchange, the best route for a symbol is always the
+    lowest ask against the highest bid on another exchange, so each symbol's
+    profitable routes are read off the front of its sorted sides. Each
+    symbol's routes are kept sorted and the symbols sit in an indexed max-heap
+    keyed by their best route, which top() merges lazily. (For per-exchange
+    fees use spread_engine.SpreadEngine.)
+    """
+
+    def __init__(self, fee_percent: float = DEFAULT_FEE_PERCENT, min_profit: float = 0.0):
+        """
+        Args:
+            fee_percent: Taker fee (%) per trade on every exchange
+            min_profit: Minimum net profit (%) for a route to count, exclusive
+        """
+        self.fee_percent = fee_percent
+        self.min_profit = min_profit
+        # bid / ask must exceed this for net profit > min_profit
+        self.min_ratio = 1 + (2 * fee_percent + min_profit) / 100
+
+        self.sides: Dict[str, SymbolSides] = {}
+        self.routes: Dict[str, List[Dict]] = {}     # symbol -> profitable routes, best first
+        self.heap = IndexedMaxHeap()
+        self.total_routes = 0
+        self.updates = 0
+
+    def update(self, symbol: str, exchange: str, bid: Optional[float], ask: Optional[float]) -> None:
+        """Apply one quote; a missing or non-positive side removes the exchange's quote"""
+        self._apply(self._sides(symbol), exchange, bid, ask)
+        self._refresh(symbol)
+
+    def update_prices(self, symbol: str, prices: Dict[str, Optional[Dict]]) -> None:
+        """Replace one symbol's quotes with a {exchange: {'bid': ..., 'ask': ...} or None} snapshot"""
+        sides = self._sides(symbol)
+        for exchange in list(sides.quotes):
+            if exchange not in prices:
+                sides.remove(exchange)
+
+        for exchange, quote in prices.items():
+            self._apply(sides, exchange, quote.get('bid') if quote else None, quote.get('ask') if quote else None)
+        self._refresh(symbol)
+
+    def _sides(self, symbol: str) -> SymbolSides:
+        sides = self.sides.get(symbol)
+        if sides is None:
+            sides = self.sides[symbol] = SymbolSides()
+        return sides
+
+    def _apply(self, sides: SymbolSides, exchange: str, bid: Optional[float], ask: Optional[float]) -> None:
+        if bid and ask and bid > 0 and ask > 0:
+            sides.set(exchange, bid, ask)
+        else:
+            sides.remove(exchange)
+        self.updates += 1
+
+    def remove_symbol(self, symbol: str) -> None:
+        self.sides.pop(symbol, None)
+        self.total_routes -= len(self.routes.pop(symbol, []))
+        self.heap.remove(symbol)
+
+    def clear(self) -> None:
+        self.sides.clear()
+        self.routes.clear()
+        self.heap.clear()
+        self.total_routes = 0
+
+    def _refresh(self, symbol: str) -> None:
+        """Recompute one symbol's routes from the front of its sides and repair its heap entry"""
+        routes = self._profitable_routes(symbol, self.sides[symbol])
+        self.total_routes += len(routes) - len(self.routes.get(symbol, ()))
+
+        if routes:
+            self.routes[symbol] = routes
+            self.heap.set(symbol, routes[0]['net_profit_pct'])
+        else:
+            self.routes.pop(symbol, None)
+            self.heap.remove(symbol)
+
+    def _profitable_routes(self, symbol: str, sides: SymbolSides) -> List[Dict]:
+        """Every route above min_profit, walking asks up and bids down until the spread closes"""
+        bids, asks = sides.bids, sides.asks
+        if not bids or -bids[0][0] <= asks[0][0] * self.min_ratio:
+            return []
+
+        fees = 2 * self.fee_percent
+        routes = []
+        for ask, buy_exchange in asks:
+            limit = ask * self.min_ratio
+            if -bids[0][0] <= limit:
+                break
+            for negative_bid, sell_exchange in bids:
+                bid = -negative_bid
+                if bid <= limit:
+                    break
+                if sell_exchange == buy_exchange:
+                    continue
+                gross_profit = (bid / ask - 1) * 100
+                routes.append({
+                    'symbol': symbol,
+                    'buy_from': buy_exchange,
+                    'sell_to': sell_exchange,
+                    'buy_price': ask,
+                    'sell_price': bid,
+                    'gross_profit_pct': gross_profit,
+                    'net_profit_pct': gross_profit - fees
+                })
+
+        routes.sort(key=lambda x: x['net_profit_pct'], reverse=True)
+        return routes
+
+    def best_bid(self, symbol: str) -> Optional[Tuple[str, float]]:
+        sides = self.sides.get(symbol)
+        if not sides or not sides.bids:
+            return None
+        negative_bid, exchange = sides.bids[0]
+        return exchange, -negative_bid
+
+    def best_ask(self, symbol: str) -> Optional[Tuple[str, float]]:
+        sides = self.sides.get(symbol)
+        if not sides or not sides.asks:
+            return None
+        ask, exchange = sides.asks[0]
+        return exchange, ask
+
+    def opportunities(self, symbol: str) -> List[Dict]:
+        """Profitable routes for one symbol, best first"""
+        return self.routes.get(symbol, [])
+
+    def best(self, symbol: Optional[str] = None) -> Optional[Dict]:
+        """Best route for a symbol, or across every symbol"""
+        if symbol is None:
+            top = self.heap.peek()
+            symbol = top[0] if top else None
+        routes = self.routes.get(symbol)
+        return routes[0] if routes else None
+
+    def top(self, k: int = 20) -> List[Dict]:
+        """
+        The k most profitable routes across all symbols, best first
+
+        Merges the per-symbol route lists in heap order, so it visits
+        O(k) heap nodes instead of sorting every route.
+        """
+        result = []
+        symbols = self.heap.descending()
+        frontier = []   # (-net profit, tiebreak, symbol, index into that symbol's routes)
+        counter = 0
+
+        next_symbol = next(symbols, None)
+        while len(result) < k:
+            # Pull symbols in until no unvisited symbol can beat the frontier
+            while next_symbol is not None and (not frontier or next_symbol[1] >= -frontier[0][0]):
+                counter += 1
+                heapq.heappush(frontier, (-next_symbol[1], counter, next_symbol[0], 0))
+                next_symbol = next(symbols, None)
+            if not frontier:
+                break
+
+            _, _, symbol, i = heapq.heappop(frontier)
+            routes = self.routes[symbol]
+            result.append(routes[i])
+            if i + 1 < len(routes):
+                counter += 1
+                heapq.heappush(frontier, (-routes[i + 1]['net_profit_pct'], counter, symbol, i + 1))
+
+        return result
+
+    def symbols_with_opportunities(self) -> int:
+        return len(self.heap)
+
+
+def demo_quote_board(n_symbols: int = 500, exchanges: int = 8, updates: int = 100_000):
+    """Demo: stream random quotes into a board and compare top() with a full re-sort"""
+    import random
+
+    rng = random.Random(11)
+    symbols = [f"COIN{i}/USDT" for i in range(n_symbols)]
+    venues = [f"venue{i}" for i in range(exchanges)]
+    mids = {symbol: rng.lognormvariate(3, 2) for symbol in symbols}
+    board = QuoteBoard(fee_percent=0.1)
+
+    started = time.perf_counter()
+    for _ in range(updates):
+        symbol = rng.choice(symbols)
+        mid = mids[symbol] * (1 + rng.gauss(0, 0.002))
+        board.update(symbol, rng.choice(venues), mid * 0.9999, mid * 1.0001)
+    update_us = (time.perf_counter() - started) / updates * 1e6
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        top = board.top(20)
+    top_us = (time.perf_counter() - started) / 1000 * 1e6
+
+    started = time.perf_counter()
+    for _ in range(100):
+        resorted = sorted((route for routes in board.routes.values() for route in routes),
+                          key=lambda x: x['net_profit_pct'], reverse=True)[:20]
+    resort_us = (time.perf_counter() - started) / 100 * 1e6
+
+    assert [r['net_profit_pct'] for r in top] == [r['net_profit_pct'] for r in resorted]
+    print(f"📋 {n_symbols} symbols x {exchanges} exchanges, {board.total_routes} profitable routes "
+          f"on {board.symbols_with_opportunities()} symbols")
+    print(f"   update():        {update_us:8.1f}µs per quote")
+    print(f"   top(20):         {top_us:8.1f}µs")
+    print(f"   full re-sort:    {resort_us:8.1f}µs")
+    for route in top[:5]:
+        print(f"   {route['symbol']:<12} {route['buy_from']} → {route['sell_to']}: {route['net_profit_pct']:.3f}%")
+
+
+if __name__ == "__main__":
+    demo_quote_board()
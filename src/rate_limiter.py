@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Shared token-bucket rate limiting for every HTTP client
+One bucket per host (DexScreener, Jupiter, Solana RPC, each ccxt exchange),
+usable from both threaded and async code
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    from metrics import RATE_LIMIT_WAIT_SECONDS
+except ImportError:  # imported as src.rate_limiter
+    from src.metrics import RATE_LIMIT_WAIT_SECONDS
+
+
+# Default budgets per host: (requests per second, burst capacity)
+DEFAULT_LIMITS = {
+    'api.dexscreener.com': (300 / 60, 10),       # 300 requests/minute
+    'quote-api.jup.ag': (600 / 60, 10),          # 600 requests/minute
+    'api.mainnet-beta.solana.com': (40 / 10, 10),  # 40 requests/10s per method
+}
+
+# Fallback budget for hosts without an entry above
+FALLBACK_LIMIT = (2.0, 5)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Requests reserve tokens up front, so callers that fit inside the burst
+    run concurrently and the rest are queued fairly instead of all sleeping
+    the worst-case interval.
+    """
+
+    def __init__(self, rate: float, capacity: float, name: str = ''):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens (burst size)
+            name: Label used in stats output
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Stats
+        self.requests = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self._wait_metric = RATE_LIMIT_WAIT_SECONDS.labels(limiter=name or 'unnamed')
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take tokens now and return how long the caller must wait before using them
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds to wait (0 if the tokens were already available)
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+
+            self.requests += 1
+            if wait > 0:
+                self.waits += 1
+                self.total_wait += wait
+
+        self._wait_metric.observe(wait)
+        return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Block the calling thread until tokens are available; returns time waited"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """Wait on the event loop until tokens are available; returns time waited"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def available(self) -> float:
+        """Tokens left in the bucket right now (0 when requests are queued)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, self._tokens)
+
+    def stats(self) -> Dict:
+        return {
+            'rate_per_sec': self.rate,
+            'capacity': self.capacity,
+            'available': self.available(),
+            'requests': self.requests,
+            'waits': self.waits,
+            'total_wait_sec': self.total_wait,
+        }
+
+
+# Process-wide registry of buckets keyed by host (or ccxt:<exchange id>)
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(key: str, rate: Optional[float] = None, capacity: Optional[float] = None) -> TokenBucket:
+    """
+    Return the shared bucket for a host, creating it on first use
+
+    Args:
+        key: Host name (e.g. 'api.dexscreener.com') or other limiter key
+        rate: Requests per second (defaults to DEFAULT_LIMITS / FALLBACK_LIMIT)
+        capacity: Burst size
+
+    Returns:
+        The shared TokenBucket
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            default_rate, default_capacity = DEFAULT_LIMITS.get(key, FALLBACK_LIMIT)
+            limiter = TokenBucket(
+                rate if rate is not None else default_rate,
+                capacity if capacity is not None else default_capacity,
+                name=key
+            )
+            _limiters[key] = limiter
+        return limiter
+
+
+def limiter_for_url(url: str) -> TokenBucket:
+    """Return the shared bucket for a URL's host"""
+    return get_limiter(urlparse(url).hostname or url)
+
+
+def limiter_for_exchange(exchange) -> TokenBucket:
+    """
+    Return the shared bucket for a ccxt exchange
+
+    Sync and async ccxt clients for the same venue share one budget, sized
+    from the exchange's own ``rateLimit`` (milliseconds between requests).
+    """
+    rate_limit_ms = getattr(exchange, 'rateLimit', None) or 500
+    rate = 1000.0 / rate_limit_ms
+    return get_limiter(f"ccxt:{exchange.id}", rate=rate, capacity=max(1.0, rate))
+
+
+def limiter_stats() -> Dict[str, Dict]:
+    """Stats for every bucket created so far"""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {key: limiter.stats() for key, limiter in limiters.items()}
+
+
+def demo_rate_limiter():
+    """Demo: 20 concurrent requests against a 5/s bucket with a burst of 5"""
+    bucket = TokenBucket(rate=5, capacity=5, name='demo')
+
+    async def fake_request(i: int) -> Tuple[int, float]:
+        waited = await bucket.acquire_async()
+        return i, waited
+
+    async def run():
+        started = time.monotonic()
+        results = await asyncio.gather(*[fake_request(i) for i in range(20)])
+        for i, waited in results:
+            print(f"  request #{i:<3} waited {waited:.2f}s")
+        print(f"\n20 requests in {time.monotonic() - started:.2f}s "
+              f"(first 5 run at once, the rest are paced at 5/s)")
+        print(f"Stats: {bucket.stats()}")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    demo_rate_limiter()
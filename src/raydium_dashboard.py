@@ -4,11 +4,14 @@ Raydium Dashboard - Monitor Raydium DEX pools and liquidity
 """
 
 from flask import Flask, render_template, jsonify
+import asyncio
 import time
 from datetime import datetime
 import threading
-from raydium_monitor import RaydiumMonitor
-import ccxt
+from raydium_monitor import AsyncRaydiumMonitor
+from websocket_monitor import WebSocketPriceMonitor
+from http_client import get_http_client
+from metrics import metrics_response, observe_update_loop
 
 app = Flask(__name__)
 
@@ -22,8 +25,8 @@ latest_data = {
 
 data_lock = threading.Lock()
 
-# Initialize monitors
-raydium = RaydiumMonitor()
+# CEX feed monitor, set once the event loop starts (exposes /api/latency)
+cex_monitor = None
 
 # Pool list from raydium_monitor.py
 POOL_LIST = [
@@ -39,8 +42,10 @@ POOL_LIST = [
     {'symbol': 'WIF/USDC', 'pool_id': 'EP2ib6dYdEeqD8MfE2ezHCxX3kP3K2eLKkirfPm5eyMx'},
 ]
 
-# Initialize exchange for CEX comparison
-exchange = ccxt.kraken()
+# CEX symbols streamed from Kraken for comparison
+CEX_SYMBOLS = ['SOL/USDT', 'RAY/USDT']
+
+UPDATE_INTERVAL = 15  # seconds between pool refreshes
 
 
 def calculate_slippage(trade_size_usd, liquidity_usd):
@@ -54,31 +59,38 @@ def calculate_slippage(trade_size_usd, liquidity_usd):
     return slippage * 100
 
 
-def fetch_cex_prices():
-    """Fetch CEX prices for comparison"""
+def get_cex_prices(cex):
+    """Latest Kraken prices from the WebSocket feed"""
     prices = {}
-    symbols_to_check = ['SOL/USDT', 'RAY/USDT']
 
-    for symbol in symbols_to_check:
-        try:
-            ticker = exchange.fetch_ticker(symbol)
-            prices[symbol] = ticker['last']
-        except:
-            pass
+    for symbol in CEX_SYMBOLS:
+        data = cex.quotes[symbol].get('kraken')
+        if data:
+            prices[symbol] = data['last']
 
     return prices
 
 
-def update_data_loop():
-    """Background thread to update pool data"""
+async def kraken_feed(cex):
+    """Keep the Kraken ticker feed connected"""
+    while True:
+        await cex.connect_kraken()
+        await asyncio.sleep(5)
+
+
+async def update_data_loop(raydium, cex):
+    """Refresh pool data on the shared event loop"""
     while True:
         try:
+            started = time.perf_counter()
             pools = []
 
-            # Fetch all pools
+            # Fetch all pools in batched DexScreener requests
+            pairs = await raydium.fetch_pools({p['symbol']: p['pool_id'] for p in POOL_LIST})
+
             for pool_info in POOL_LIST:
                 try:
-                    pair = raydium.fetch_pool_data(pool_info['pool_id'], pool_info['symbol'])
+                    pair = pairs.get(pool_info['symbol'])
 
                     if pair:
                         price_usd = float(pair.get('price_usd', 0))
@@ -113,21 +125,38 @@ def update_data_loop():
                 except Exception as e:
                     print(f"Error fetching {pool_info['symbol']}: {e}")
 
-                time.sleep(0.3)  # Rate limiting
-
-            # Fetch CEX prices
-            cex_prices = fetch_cex_prices()
+            # Latest CEX prices from the WebSocket feeds
+            cex_prices = get_cex_prices(cex)
 
             with data_lock:
                 latest_data['pools'] = pools
                 latest_data['cex_prices'] = cex_prices
                 latest_data['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 latest_data['iteration'] += 1
+            observe_update_loop('raydium', started)
 
         except Exception as e:
             print(f"Error in update loop: {e}")
 
-        time.sleep(15)  # Update every 15 seconds
+        await asyncio.sleep(UPDATE_INTERVAL)
+
+
+async def run_monitors():
+    """Run the DEX pool refresh and the CEX WebSocket feeds on one event loop"""
+    global cex_monitor
+
+    raydium = AsyncRaydiumMonitor()
+    cex = cex_monitor = WebSocketPriceMonitor(symbols=CEX_SYMBOLS)
+
+    tasks = [
+        asyncio.create_task(kraken_feed(cex)),
+        asyncio.create_task(update_data_loop(raydium, cex)),
+    ]
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await raydium.close()
 
 
 @app.route('/')
@@ -141,6 +170,26 @@ def get_data():
         return jsonify(latest_data)
 
 
+@app.route('/api/http_stats')
+def get_http_stats():
+    """Connection reuse counters for the shared HTTP client"""
+    return jsonify(get_http_client().stats())
+
+
+@app.route('/api/latency')
+def get_latency():
+    """Per-exchange network/decode/evaluation latency percentiles for the CEX feed"""
+    if cex_monitor is None:
+        return jsonify({})
+    return jsonify(cex_monitor.latency.snapshot())
+
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint"""
+    return metrics_response()
+
+
 if __name__ == '__main__':
     print("\n" + "="*70)
     print("🚀 RAYDIUM DEX DASHBOARD")
@@ -149,13 +198,23 @@ if __name__ == '__main__':
     print(f"Pools: {', '.join([p['symbol'] for p in POOL_LIST])}")
     print("="*70)
 
-    # Start background thread
-    update_thread = threading.Thread(target=update_data_loop, daemon=True)
-    update_thread.start()
-    print("✓ Background update thread started")
+    # Open keep-alive connections before the first refresh
+    get_http_client().preconnect()
+    print("✓ Pre-connected to DEX APIs")
+
+    # Flask serves from its own thread; the monitors own the main thread's event loop
+    server_thread = threading.Thread(
+        target=app.run,
+        kwargs={'debug': True, 'host': '0.0.0.0', 'port': 5003, 'use_reloader': False},
+        daemon=True
+    )
+    server_thread.start()
 
     print("\n🌐 Starting web server...")
     print("📊 Dashboard: http://localhost:5003")
     print("\nPress Ctrl+C to stop\n")
 
-    app.run(debug=True, host='0.0.0.0', port=5003, use_reloader=False)
+    try:
+        asyncio.run(run_monitors())
+    except KeyboardInterrupt:
+        print("\nExiting...")
@@ -4,12 +4,21 @@ Raydium DEX Monitor for Arbitrage Detection
 Monitors Raydium liquidity pools and detects arbitrage opportunities vs CEX
 """
 
-import requests
-import time
+import asyncio
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import json
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+try:
+    from http_client import get_http_client, HTTPError
+    from rate_limiter import limiter_for_url
+except ImportError:  # imported as src.raydium_monitor
+    from src.http_client import get_http_client, HTTPError
+    from src.rate_limiter import limiter_for_url
 
 
 class RaydiumMonitor:
@@ -105,6 +114,9 @@ class RaydiumMonitor:
     # DexScreener API
     DEXSCREENER_API = "https://api.dexscreener.com/latest/dex"
 
+    # DexScreener accepts up to 30 comma-separated pair addresses per request
+    MAX_PAIRS_PER_REQUEST = 30
+
     # Jupiter API for price quotes
     JUPITER_QUOTE_API = "https://quote-api.jup.ag/v6/quote"
 
@@ -113,23 +125,12 @@ class RaydiumMonitor:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
 
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Shared keep-alive client; applies the per-host rate limit (~300 requests per minute)
+        self.http = get_http_client()
+        self.headers = {
             'User-Agent': 'RaydiumMonitor/1.0',
             'Accept': 'application/json'
-        })
-
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.21  # ~300 requests per minute = 0.2s per request
-
-    def _rate_limit(self):
-        """Enforce rate limiting"""
-        now = time.time()
-        time_since_last = now - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
-        self.last_request_time = time.time()
+        }
 
     def fetch_pool_data(self, pool_id: str, symbol: str) -> Optional[Dict]:
         """
@@ -142,11 +143,9 @@ class RaydiumMonitor:
         Returns:
             Pool data dictionary or None if error
         """
-        self._rate_limit()
-
         try:
             url = f"{self.DEXSCREENER_API}/pairs/solana/{pool_id}"
-            response = self.session.get(url, timeout=10)
+            response = self.http.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
 
             data = response.json()
@@ -161,32 +160,98 @@ class RaydiumMonitor:
                 print(f"  Warning: Pair is None for {symbol}")
                 return None
 
-            # Extract relevant data
-            pool_info = {
-                'symbol': symbol,
-                'pool_id': pool_id,
-                'price_usd': float(pair.get('priceUsd', 0)),
-                'price_native': float(pair.get('priceNative', 0)),
-                'liquidity_usd': float(pair.get('liquidity', {}).get('usd', 0)),
-                'volume_24h': float(pair.get('volume', {}).get('h24', 0)),
-                'price_change_24h': float(pair.get('priceChange', {}).get('h24', 0)),
-                'txns_24h_buys': int(pair.get('txns', {}).get('h24', {}).get('buys', 0)),
-                'txns_24h_sells': int(pair.get('txns', {}).get('h24', {}).get('sells', 0)),
-                'fdv': float(pair.get('fdv', 0)),
-                'market_cap': float(pair.get('marketCap', 0)),
-                'timestamp': datetime.now().isoformat(),
-                'dex': pair.get('dexId', 'raydium'),
-            }
-
-            return pool_info
-
-        except requests.exceptions.RequestException as e:
+            return self._parse_pair(pair, pool_id, symbol)
+
+        except HTTPError as e:
             print(f"  Error fetching {symbol}: {e}")
             return None
         except (KeyError, ValueError, TypeError) as e:
             print(f"  Error parsing {symbol} data: {e}")
             return None
 
+    def _parse_pair(self, pair: Dict, pool_id: str, symbol: str) -> Dict:
+        """Extract the fields we use from a DexScreener pair object"""
+        return {
+            'symbol': symbol,
+            'pool_id': pool_id,
+            'price_usd': float(pair.get('priceUsd', 0)),
+            'price_native': float(pair.get('priceNative', 0)),
+            'liquidity_usd': float(pair.get('liquidity', {}).get('usd', 0)),
+            'volume_24h': float(pair.get('volume', {}).get('h24', 0)),
+            'price_change_24h': float(pair.get('priceChange', {}).get('h24', 0)),
+            'txns_24h_buys': int(pair.get('txns', {}).get('h24', {}).get('buys', 0)),
+            'txns_24h_sells': int(pair.get('txns', {}).get('h24', {}).get('sells', 0)),
+            'fdv': float(pair.get('fdv', 0)),
+            'market_cap': float(pair.get('marketCap', 0)),
+            'timestamp': datetime.now().isoformat(),
+            'dex': pair.get('dexId', 'raydium'),
+        }
+
+    def fetch_pairs_batch(self, pool_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch up to MAX_PAIRS_PER_REQUEST pools in a single DexScreener request
+
+        Args:
+            pool_ids: Pool (pair) addresses
+
+        Returns:
+            Raw DexScreener pair objects keyed by pool address
+        """
+        try:
+            url = f"{self.DEXSCREENER_API}/pairs/solana/{','.join(pool_ids)}"
+            response = self.http.get(url, headers=self.headers, timeout=10)
+            response.raise_for_status()
+
+            data = response.json() or {}
+            pairs = data.get('pairs') or ([data['pair']] if data.get('pair') else [])
+
+            return {pair['pairAddress']: pair for pair in pairs if pair and pair.get('pairAddress')}
+
+        except HTTPError as e:
+            print(f"  Error fetching pool batch ({len(pool_ids)} pools): {e}")
+            return {}
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"  Error parsing pool batch: {e}")
+            return {}
+
+    def fetch_pools(self, pools: Dict[str, str]) -> Dict[str, Dict]:
+        """
+        Fetch many pools with as few requests as possible
+
+        Pools are grouped into maximal DexScreener batches, the batches are
+        fetched concurrently and the results fanned back out per symbol.
+
+        Args:
+            pools: Dictionary of symbol -> pool ID
+
+        Returns:
+            Dictionary of pool data keyed by symbol (missing pools are omitted)
+        """
+        pool_ids = list(dict.fromkeys(pools.values()))
+        batches = [
+            pool_ids[i:i + self.MAX_PAIRS_PER_REQUEST]
+            for i in range(0, len(pool_ids), self.MAX_PAIRS_PER_REQUEST)
+        ]
+        if not batches:
+            return {}
+
+        pairs = {}
+        with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+            for batch_pairs in executor.map(self.fetch_pairs_batch, batches):
+                pairs.update(batch_pairs)
+
+        pools_data = {}
+        for symbol, pool_id in pools.items():
+            pair = pairs.get(pool_id)
+            if pair is None:
+                continue
+            try:
+                pools_data[symbol] = self._parse_pair(pair, pool_id, symbol)
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"  Error parsing {symbol} data: {e}")
+
+        return pools_data
+
     def fetch_all_pools(self) -> Dict[str, Dict]:
         """
         Fetch data for all major pools
@@ -197,14 +262,14 @@ class RaydiumMonitor:
         print(f"\nFetching Raydium pool data at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*80)
 
-        pools_data = {}
+        pools_data = self.fetch_pools({
+            symbol: pool_config['pool_id'] for symbol, pool_config in self.MAJOR_POOLS.items()
+        })
 
-        for symbol, pool_config in self.MAJOR_POOLS.items():
-            pool_id = pool_config['pool_id']
-            data = self.fetch_pool_data(pool_id, symbol)
+        for symbol in self.MAJOR_POOLS:
+            data = pools_data.get(symbol)
 
             if data:
-                pools_data[symbol] = data
                 print(f"  {symbol:<12} ${data['price_usd']:<12.6f} Liquidity: ${data['liquidity_usd']:>12,.0f}")
             else:
                 print(f"  {symbol:<12} ERROR")
@@ -447,6 +512,163 @@ class RaydiumMonitor:
         print(f"\nSnapshot saved to {filepath}")
 
 
+class AsyncRaydiumMonitor(RaydiumMonitor):
+    """
+    Asyncio variant of RaydiumMonitor built on aiohttp
+
+    The fetch methods are coroutines so pool refreshes can share an event
+    loop with the WebSocket price feeds. Requests go through the shared
+    per-host token bucket and at most ``max_concurrent`` are in flight.
+    Slippage, CEX comparison and display helpers are inherited unchanged.
+    """
+
+    MAX_CONCURRENT_REQUESTS = 8
+
+    def __init__(self, data_dir: str = "data", max_concurrent: int = MAX_CONCURRENT_REQUESTS):
+        """
+        Initialize the async monitor
+
+        Args:
+            data_dir: Directory for snapshots
+            max_concurrent: Maximum in-flight HTTP requests
+        """
+        super().__init__(data_dir)
+        self.max_concurrent = max_concurrent
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the keep-alive session on first use (must run inside the loop)"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.max_concurrent),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self.session
+
+    async def _get_json(self, url: str) -> Dict:
+        """GET a URL under the rate limit and concurrency cap and decode the JSON body"""
+        session = await self._get_session()
+        await limiter_for_url(url).acquire_async()
+
+        async with self.semaphore:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+    async def fetch_pool_data(self, pool_id: str, symbol: str) -> Optional[Dict]:
+        """
+        Fetch pool data from DexScreener API
+
+        Args:
+            pool_id: Raydium pool ID
+            symbol: Trading pair symbol (e.g., 'SOL/USDC')
+
+        Returns:
+            Pool data dictionary or None if error
+        """
+        try:
+            data = await self._get_json(f"{self.DEXSCREENER_API}/pairs/solana/{pool_id}")
+
+            if not data or not data.get('pair'):
+                print(f"  Warning: No pair data for {symbol}")
+                return None
+
+            return self._parse_pair(data['pair'], pool_id, symbol)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"  Error fetching {symbol}: {e}")
+            return None
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"  Error parsing {symbol} data: {e}")
+            return None
+
+    async def fetch_pairs_batch(self, pool_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch up to MAX_PAIRS_PER_REQUEST pools in a single DexScreener request
+
+        Args:
+            pool_ids: Pool (pair) addresses
+
+        Returns:
+            Raw DexScreener pair objects keyed by pool address
+        """
+        try:
+            data = await self._get_json(f"{self.DEXSCREENER_API}/pairs/solana/{','.join(pool_ids)}") or {}
+            pairs = data.get('pairs') or ([data['pair']] if data.get('pair') else [])
+
+            return {pair['pairAddress']: pair for pair in pairs if pair and pair.get('pairAddress')}
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"  Error fetching pool batch ({len(pool_ids)} pools): {e}")
+            return {}
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"  Error parsing pool batch: {e}")
+            return {}
+
+    async def fetch_pools(self, pools: Dict[str, str]) -> Dict[str, Dict]:
+        """
+        Fetch many pools with as few requests as possible
+
+        Args:
+            pools: Dictionary of symbol -> pool ID
+
+        Returns:
+            Dictionary of pool data keyed by symbol (missing pools are omitted)
+        """
+        pool_ids = list(dict.fromkeys(pools.values()))
+        batches = [
+            pool_ids[i:i + self.MAX_PAIRS_PER_REQUEST]
+            for i in range(0, len(pool_ids), self.MAX_PAIRS_PER_REQUEST)
+        ]
+
+        pairs = {}
+        for batch_pairs in await asyncio.gather(*[self.fetch_pairs_batch(batch) for batch in batches]):
+            pairs.update(batch_pairs)
+
+        pools_data = {}
+        for symbol, pool_id in pools.items():
+            pair = pairs.get(pool_id)
+            if pair is None:
+                continue
+            try:
+                pools_data[symbol] = self._parse_pair(pair, pool_id, symbol)
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"  Error parsing {symbol} data: {e}")
+
+        return pools_data
+
+    async def fetch_all_pools(self) -> Dict[str, Dict]:
+        """
+        Fetch data for all major pools
+
+        Returns:
+            Dictionary of pool data keyed by symbol
+        """
+        print(f"\nFetching Raydium pool data at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("="*80)
+
+        pools_data = await self.fetch_pools({
+            symbol: pool_config['pool_id'] for symbol, pool_config in self.MAJOR_POOLS.items()
+        })
+
+        for symbol in self.MAJOR_POOLS:
+            data = pools_data.get(symbol)
+
+            if data:
+                print(f"  {symbol:<12} ${data['price_usd']:<12.6f} Liquidity: ${data['liquidity_usd']:>12,.0f}")
+            else:
+                print(f"  {symbol:<12} ERROR")
+
+        return pools_data
+
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+
 def demo_monitor():
     """Demo function showing Raydium monitor capabilities"""
     print("="*120)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Vectorized cross-exchange spread engine
+Keeps bids and asks in (symbol x exchange) NumPy arrays and evaluates every
+buy-on-one / sell-on-another route for every symbol in one step
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+DEFAULT_FEE_PERCENT = 0.1   # Taker fee per trade (%), charged on both the buy and the sell
+
+Fees = Union[float, Dict[str, float]]
+
+
+def fee_vector(exchanges: Sequence[str], fees: Fees) -> np.ndarray:
+    """
+    Per-exchange taker fee (%) vector
+
+    Args:
+        exchanges: Exchange names, in column order
+        fees: One fee for every exchange, or {exchange: fee} (case-insensitive;
+            missing exchanges use DEFAULT_FEE_PERCENT)
+    """
+    if isinstance(fees, dict):
+        lookup = {name.lower(): fee for name, fee in fees.items()}
+        return np.array([lookup.get(exchange.lower(), DEFAULT_FEE_PERCENT) for exchange in exchanges],
+                        dtype=np.float64)
+    return np.full(len(exchanges), float(fees))
+
+
+class SpreadEngine:
+    """
+    Net-profit tensor for N exchanges x M symbols
+
+    net[s, b, k] is the profit (%) of buying symbol s at exchange b's ask and
+    selling it at exchange k's bid, after exchange b's and exchange k's
+    taker fees. Missing or non-positive quotes are NaN and never produce an
+    opportunity; the b == k diagonal is excluded.
+    """
+
+    def __init__(self, symbols: Sequence[str], exchanges: Sequence[str], fees: Fees = DEFAULT_FEE_PERCENT):
+        """
+        Args:
+            symbols: Symbols, one row each
+            exchanges: Exchange names, one column each
+            fees: Taker fee (%) for every exchange, or {exchange: fee}; exchanges
+                missing from the dict use DEFAULT_FEE_PERCENT
+        """
+        self.symbols = list(symbols)
+        self.exchanges = list(exchanges)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.exchange_index = {exchange: i for i, exchange in enumerate(self.exchanges)}
+
+        shape = (len(self.symbols), len(self.exchanges))
+        self.bids = np.full(shape, np.nan)
+        self.asks = np.full(shape, np.nan)
+
+        self.set_fees(fees)
+
+    def fee_vector(self, fees: Fees) -> np.ndarray:
+        """Per-exchange fee (%) vector in column order"""
+        return fee_vector(self.exchanges, fees)
+
+    def _fee_matrix(self, fees: Fees) -> np.ndarray:
+        fee = self.fee_vector(fees)
+        matrix = fee[:, None] + fee[None, :]   # [buy, sell]
+        np.fill_diagonal(matrix, np.inf)       # Same-exchange "routes" can never clear the threshold
+        return matrix
+
+    def set_fees(self, fees: Fees) -> None:
+        self.fees = self.fee_vector(fees)
+        self.fee_matrix = self._fee_matrix(fees)
+
+    def update(self, symbol: str, exchange: str, bid: Optional[float], ask: Optional[float]) -> None:
+        """Store one quote; a missing or non-positive side clears it"""
+        s = self.symbol_index[symbol]
+        e = self.exchange_index[exchange]
+        self.bids[s, e] = bid if bid and bid > 0 else np.nan
+        self.asks[s, e] = ask if ask and ask > 0 else np.nan
+
+    def clear(self) -> None:
+        self.bids.fill(np.nan)
+        self.asks.fill(np.nan)
+
+    def load(self, quotes: Dict[str, Dict[str, Optional[Dict]]]) -> None:
+        """
+        Replace every quote from {symbol: {exchange: {'bid': ..., 'ask': ...} or None}}
+
+        Symbols and exchanges the engine does not track are ignored.
+        """
+        self.clear()
+        for symbol, prices in quotes.items():
+            s = self.symbol_index.get(symbol)
+            if s is None:
+                continue
+            for exchange, quote in prices.items():
+                e = self.exchange_index.get(exchange)
+                if e is None or not quote:
+                    continue
+                bid, ask = quote.get('bid'), quote.get('ask')
+                self.bids[s, e] = bid if bid and bid > 0 else np.nan
+                self.asks[s, e] = ask if ask and ask > 0 else np.nan
+
+    def _rows(self, symbol: Optional[str]):
+        return slice(None) if symbol is None else slice(self.symbol_index[symbol], self.symbol_index[symbol] + 1)
+
+    def _ratio(self, rows) -> np.ndarray:
+        """bid / ask for every route, shaped (buy exchange, sell exchange, symbol)"""
+        # Symbols on the last, contiguous axis keeps the broadcast inner loop long
+        bids = np.ascontiguousarray(self.bids[rows].T)
+        asks = np.ascontiguousarray(self.asks[rows].T)
+        return bids[None, :, :] / asks[:, None, :]
+
+    def net_profit(self, fees: Optional[Fees] = None, symbol: Optional[str] = None):
+        """
+        Gross and net profit tensors
+
+        Args:
+            fees: Override the engine's fees for this evaluation
+            symbol: Only evaluate this symbol
+
+        Returns:
+            (gross, net), each shaped (symbols, buy exchange, sell exchange), in %
+        """
+        fee_matrix = self.fee_matrix if fees is None else self._fee_matrix(fees)
+        gross = self._ratio(self._rows(symbol))
+        gross -= 1
+        gross *= 100
+        net = gross - fee_matrix[:, :, None]
+        return gross.transpose(2, 0, 1), net.transpose(2, 0, 1)
+
+    def opportunities(self, min_profit: float = 0.0, fees: Optional[Fees] = None,
+                      symbol: Optional[str] = None) -> List[Dict]:
+        """
+        Every route whose net profit is above min_profit, best first
+
+        Args:
+            min_profit: Minimum net profit (%), exclusive
+            fees: Override the engine's fees for this evaluation
+            symbol: Only evaluate this symbol
+
+        Returns:
+            Opportunity dicts with symbol, buy_from, sell_to, buy_price,
+            sell_price, gross_profit_pct and net_profit_pct
+        """
+        rows = self._rows(symbol)
+        fee_matrix = self.fee_matrix if fees is None else self._fee_matrix(fees)
+        ratio = self._ratio(rows)
+
+        # net > min_profit  <=>  bid / ask > 1 + (fees + min_profit) / 100; NaN quotes compare False
+        threshold = 1 + (fee_matrix + min_profit) / 100
+        with np.errstate(invalid='ignore'):
+            hits = np.flatnonzero(ratio > threshold[:, :, None])
+        if not len(hits):
+            return []
+
+        b, k, s = np.unravel_index(hits, ratio.shape)
+        gross = (ratio.reshape(-1)[hits] - 1) * 100
+        net = gross - fee_matrix[b, k]
+
+        order = np.argsort(-net, kind='stable')
+        b, k, s, gross, net = b[order], k[order], s[order], gross[order], net[order]
+
+        symbols = self.symbols[rows]
+        asks, bids = self.asks[rows], self.bids[rows]
+        return [
+            {
+                'symbol': symbols[si],
+                'buy_from': self.exchanges[bi],
+                'sell_to': self.exchanges[ki],
+                'buy_price': buy_price,
+                'sell_price': sell_price,
+                'gross_profit_pct': gross_profit,
+                'net_profit_pct': net_profit
+            }
+            for si, bi, ki, buy_price, sell_price, gross_profit, net_profit in zip(
+                s.tolist(), b.tolist(), k.tolist(),
+                asks[s, b].tolist(), bids[s, k].tolist(),
+                gross.tolist(), net.tolist()
+            )
+        ]
+
+    def best(self, min_profit: float = 0.0, fees: Optional[Fees] = None) -> Dict[str, Dict]:
+        """Most profitable route above min_profit for each symbol that has one"""
+        best = {}
+        for opportunity in self.opportunities(min_profit, fees):
+            best.setdefault(opportunity['symbol'], opportunity)
+        return best
+
+    def quoted_exchanges(self, symbol: str) -> int:
+        """Number of exchanges with a full quote for the symbol"""
+        s = self.symbol_index[symbol]
+        return int(np.count_nonzero(~np.isnan(self.bids[s]) & ~np.isnan(self.asks[s])))
+
+
+def find_opportunities(prices: Dict[str, Optional[Dict]], fee_percent: Fees = DEFAULT_FEE_PERCENT,
+                       min_profit: float = 0.0, symbol: Optional[str] = None) -> List[Dict]:
+    """
+    Every profitable route for one symbol's {exchange: ticker} prices, best first
+
+    Args:
+        prices: {exchange: {'bid': ..., 'ask': ...} or None}
+        fee_percent: Taker fee (%) per trade, or {exchange: fee}
+        min_profit: Minimum net profit (%), exclusive
+        symbol: Symbol to tag the opportunities with (omitted when None)
+    """
+    engine = SpreadEngine([symbol], list(prices), fee_percent)
+    engine.load({symbol: prices})
+    opportunities = engine.opportunities(min_profit)
+    if symbol is None:
+        for opportunity in opportunities:
+            del opportunity['symbol']
+    return opportunities
+
+
+def best_opportunity(prices: Dict[str, Optional[Dict]], fee_percent: Fees = DEFAULT_FEE_PERCENT,
+                     min_profit: float = 0.0, symbol: Optional[str] = None) -> Optional[Dict]:
+    """Most profitable route for one symbol above min_profit, or None"""
+    opportunities = find_opportunities(prices, fee_percent, min_profit, symbol)
+    return opportunities[0] if opportunities else None
+
+
+def demo_spread_engine(n_symbols: int = 500, n_exchanges: int = 8, rounds: int = 1000):
+    """Demo: evaluate n_symbols x n_exchanges random quotes and time the full tensor"""
+    rng = np.random.default_rng(7)
+    symbols = [f"COIN{i}/USDT" for i in range(n_symbols)]
+    exchanges = [f"venue{i}" for i in range(n_exchanges)]
+    fees = {exchange: fee for exchange, fee in zip(exchanges, rng.choice([0.04, 0.075, 0.1, 0.2], n_exchanges))}
+
+    engine = SpreadEngine(symbols, exchanges, fees)
+    # Venues mostly agree to within a few basis points; a few quotes lag
+    mid = rng.lognormal(3, 2, size=(n_symbols, 1)) * (1 + rng.normal(0, 0.0005, size=(n_symbols, n_exchanges)))
+    lagging = rng.random(mid.shape) < 0.01
+    mid[lagging] *= 1 + rng.normal(0, 0.005, size=lagging.sum())
+    half_spread = mid * rng.uniform(0.0001, 0.0005, size=mid.shape)
+    engine.bids[:] = mid - half_spread
+    engine.asks[:] = mid + half_spread
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        engine.net_profit()
+    tensor_us = (time.perf_counter() - started) / rounds * 1e6
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        opportunities = engine.opportunities(min_profit=0.1)
+    total_us = (time.perf_counter() - started) / rounds * 1e6
+
+    print(f"📐 {n_symbols} symbols x {n_exchanges} exchanges = {n_symbols * n_exchanges * (n_exchanges - 1):,} routes")
+    print(f"   Net-profit tensor:              {tensor_us:8.1f}µs")
+    print(f"   Thresholded, {len(opportunities):>4} opportunities: {total_us:8.1f}µs")
+    for opp in opportunities[:5]:
+        print(f"   {opp['symbol']:<12} {opp['buy_from']} → {opp['sell_to']}: {opp['net_profit_pct']:.3f}%")
+
+
+if __name__ == "__main__":
+    demo_spread_engine()
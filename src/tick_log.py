@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped binary tick log
+Fixed-width 48-byte records behind a header that carries the schema
+version and the exchange/symbol dictionaries (4 KiB, grown in 4 KiB steps
+as the dictionaries outgrow it). Readers map the file as a NumPy
+structured array without copying, even while the monitor appends
+"""
+
+import json
+import os
+import shutil
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+
+MAGIC = b'ARBTICK\x00'
+VERSION = 1
+HEADER_SIZE = 4096                      # Initial header size and the step it grows by
+MAX_DICTIONARY_SIZE = 1 << 16           # exchange/symbol ids are u2
+HEADER_STRUCT = struct.Struct('<8sHHII')  # magic, version, record size, header size, JSON length
+
+# One record: 8 + 2 + 2 + 4 + 4 * 8 = 48 bytes, all fields naturally aligned
+TICK_DTYPE = np.dtype([
+    ('timestamp', '<i8'),   # ns since epoch
+    ('exchange', '<u2'),    # index into header['exchanges']
+    ('symbol', '<u2'),      # index into header['symbols']
+    ('flags', '<u4'),       # reserved
+    ('bid', '<f8'),
+    ('ask', '<f8'),
+    ('last', '<f8'),
+    ('volume', '<f8'),
+])
+RECORD_SIZE = TICK_DTYPE.itemsize
+
+
+def _read_header(f) -> Dict:
+    f.seek(0)
+    raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_STRUCT.size:
+        raise ValueError("Tick log header is truncated")
+
+    magic, version, record_size, header_size, json_length = HEADER_STRUCT.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError("Not a tick log (bad magic)")
+    if (version != VERSION or record_size != RECORD_SIZE
+            or header_size < HEADER_SIZE or header_size % HEADER_SIZE):
+        raise ValueError(f"Unsupported tick log: version {version}, record size {record_size}")
+    if HEADER_STRUCT.size + json_length > header_size:
+        raise ValueError("Tick log header is corrupt (dictionaries overrun the header)")
+
+    if header_size > len(raw):
+        raw += f.read(header_size - len(raw))
+    payload = raw[HEADER_STRUCT.size:HEADER_STRUCT.size + json_length]
+    if len(payload) < json_length:
+        raise ValueError("Tick log header is truncated")
+
+    meta = json.loads(payload.decode())
+    meta['version'] = version
+    meta['header_size'] = header_size
+    return meta
+
+
+class TickLogWriter:
+    """Append fixed-width tick records to a log file"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a log for appending, creating it with an empty header if needed
+
+        Args:
+            path: Log file path
+        """
+        self.path = Path(path)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        self._file = open(self.path, 'w+b' if is_new else 'r+b')
+
+        if is_new:
+            self.meta = {'exchanges': [], 'symbols': [], 'created': datetime.now().isoformat()}
+            self.header_size = HEADER_SIZE
+            self._write_header(self._payload(self.meta['exchanges'], self.meta['symbols']))
+        else:
+            self.meta = _read_header(self._file)
+            self.header_size = self.meta['header_size']
+            # Drop a partially written trailing record
+            records = max(self.path.stat().st_size - self.header_size, 0) // RECORD_SIZE
+            self._file.truncate(self.header_size + records * RECORD_SIZE)
+
+        self._exchange_ids = {name: i for i, name in enumerate(self.meta['exchanges'])}
+        self._symbol_ids = {name: i for i, name in enumerate(self.meta['symbols'])}
+        self._file.seek(0, 2)
+
+    def _payload(self, exchanges: List[str], symbols: List[str]) -> bytes:
+        return json.dumps({'exchanges': exchanges, 'symbols': symbols, 'created': self.meta['created']}).encode()
+
+    def _write_header(self, payload: bytes) -> None:
+        """Write the header in place; the caller has made sure the payload fits"""
+        header = HEADER_STRUCT.pack(MAGIC, VERSION, RECORD_SIZE, self.header_size, len(payload)) + payload
+        self._file.seek(0)
+        self._file.write(header.ljust(self.header_size, b'\x00'))
+        self._file.seek(0, 2)
+
+    def _grow_header(self, header_size: int) -> None:
+        """
+        Rewrite the log with a bigger header, moving the records after it
+
+        The new file replaces the old one atomically, so readers that still
+        map the old file keep a consistent view until they refresh().
+        """
+        self._file.flush()
+        resized = self.path.with_name(self.path.name + '.resize')
+        with open(resized, 'wb') as out:
+            out.seek(header_size)
+            self._file.seek(self.header_size)
+            shutil.copyfileobj(self._file, out, 1 << 20)
+        self._file.close()
+        os.replace(resized, self.path)
+        self._file = open(self.path, 'r+b')
+        self.header_size = header_size
+
+    def _id(self, ids: Dict[str, int], key: str, name: str) -> int:
+        i = ids.get(name)
+        if i is not None:
+            return i
+
+        names = self.meta[key] + [name]
+        if len(names) > MAX_DICTIONARY_SIZE:
+            raise ValueError(f"Tick log holds at most {MAX_DICTIONARY_SIZE} {key}")
+
+        payload = self._payload(names if key == 'exchanges' else self.meta['exchanges'],
+                                names if key == 'symbols' else self.meta['symbols'])
+        required = HEADER_STRUCT.size + len(payload)
+        if required > self.header_size:
+            # Round up to the next step and at least double, so growth stays rare
+            self._grow_header(max(-(-required // HEADER_SIZE) * HEADER_SIZE, 2 * self.header_size))
+
+        # The header is written before any record can reference the new id
+        self._write_header(payload)
+        self.meta[key] = names
+        i = ids[name] = len(names) - 1
+        return i
+
+    def exchange_id(self, name: str) -> int:
+        return self._id(self._exchange_ids, 'exchanges', name)
+
+    def symbol_id(self, name: str) -> int:
+        return self._id(self._symbol_ids, 'symbols', name)
+
+    def write_rows(self, rows: List[Dict]) -> None:
+        """Encode dict rows (timestamp_ns, exchange, symbol, bid, ask, last, volume) and append them"""
+        records = np.array([
+            (row['timestamp_ns'], self.exchange_id(row['exchange']), self.symbol_id(row['symbol']), 0,
+             row.get('bid') or 0, row.get('ask') or 0, row.get('last') or 0, row.get('volume') or 0)
+            for row in rows
+        ], dtype=TICK_DTYPE)
+        self.write_records(records)
+
+    def write_records(self, records: np.ndarray) -> None:
+        """Append an already-encoded TICK_DTYPE array with one write"""
+        self._file.write(records.tobytes())
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def size(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.flush()
+            self._file.close()
+
+
+class TickLogSink:
+    """TickRecorder sink that writes binary tick logs"""
+
+    extension = 'ticklog'
+
+    def __init__(self):
+        self.writer = None
+
+    def open(self, path: Path) -> None:
+        self.writer = TickLogWriter(path)
+
+    def write(self, rows: List[Dict]) -> None:
+        self.writer.write_rows(rows)
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def size(self) -> int:
+        return self.writer.size()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+class TickLogReader:
+    """
+    Zero-copy reader for a binary tick log
+
+    ``records`` is a read-only np.memmap over the file; call refresh() to
+    pick up records (and new dictionary entries) appended since opening.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.records = None
+        self.refresh()
+
+    def refresh(self) -> int:
+        """
+        Re-read the header and re-map the file to include newly appended records
+
+        Returns:
+            Number of complete records
+        """
+        with open(self.path, 'rb') as f:
+            self.meta = _read_header(f)
+            # Size from the same open file: the writer may swap in a resized log meanwhile
+            size = os.fstat(f.fileno()).st_size
+            header_size = self.meta['header_size']
+            count = max(size - header_size, 0) // RECORD_SIZE
+            if count > 0:
+                self.records = np.memmap(f, dtype=TICK_DTYPE, mode='r', offset=header_size, shape=(count,))
+            else:
+                self.records = np.zeros(0, dtype=TICK_DTYPE)
+        return count
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def exchanges(self) -> List[str]:
+        return self.meta['exchanges']
+
+    @property
+    def symbols(self) -> List[str]:
+        return self.meta['symbols']
+
+    def select(self, symbol: Optional[str] = None, exchange: Optional[str] = None,
+               start_ns: Optional[int] = None, end_ns: Optional[int] = None) -> np.ndarray:
+        """
+        Records matching the filters
+
+        With only a time range the result is a zero-copy slice (records are
+        appended in time order); symbol/exchange filters return a copy.
+        """
+        records = self.records
+        if start_ns is not None or end_ns is not None:
+            timestamps = records['timestamp']
+            lo = np.searchsorted(timestamps, start_ns, side='left') if start_ns is not None else 0
+            hi = np.searchsorted(timestamps, end_ns, side='left') if end_ns is not None else len(records)
+            records = records[lo:hi]
+
+        mask = None
+        if symbol is not None:
+            if symbol not in self.symbols:
+                return records[:0]
+            mask = records['symbol'] == self.symbols.index(symbol)
+        if exchange is not None:
+            if exchange not in self.exchanges:
+                return records[:0]
+            exchange_mask = records['exchange'] == self.exchanges.index(exchange)
+            mask = exchange_mask if mask is None else mask & exchange_mask
+
+        return records if mask is None else records[mask]
+
+    def to_pandas(self, records: Optional[np.ndarray] = None):
+        """Decode records into a DataFrame with exchange/symbol names as categoricals"""
+        import pandas as pd
+
+        records = self.records if records is None else records
+        frame = pd.DataFrame({name: records[name] for name in ('timestamp', 'bid', 'ask', 'last', 'volume')})
+        frame['exchange'] = pd.Categorical.from_codes(records['exchange'].astype(np.int32), categories=self.exchanges)
+        frame['symbol'] = pd.Categorical.from_codes(records['symbol'].astype(np.int32), categories=self.symbols)
+        return frame
+
+
+def demo_tick_log(rows: int = 5_000_000, path: str = 'data/demo.ticklog'):
+    """Demo: write millions of ticks, then map and query them"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).unlink(missing_ok=True)
+
+    writer = TickLogWriter(path)
+    exchanges = [writer.exchange_id(name) for name in ('binance', 'kraken', 'coinbase')]
+    symbols = [writer.symbol_id(name) for name in ('BTC/USDT', 'ETH/USDT', 'SOL/USDT')]
+
+    started = time.perf_counter()
+    records = np.zeros(rows, dtype=TICK_DTYPE)
+    records['timestamp'] = time.time_ns() + np.arange(rows) * 1_000_000
+    records['exchange'] = np.array(exchanges)[np.arange(rows) % 3]
+    records['symbol'] = np.array(symbols)[(np.arange(rows) // 3) % 3]
+    records['bid'] = 100 + np.random.random(rows)
+    records['ask'] = records['bid'] + 0.1
+    records['last'] = records['bid'] + 0.05
+    writer.write_records(records)
+    writer.close()
+    print(f"Wrote {rows:,} ticks ({Path(path).stat().st_size / 1e6:.0f} MB) in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    reader = TickLogReader(path)
+    print(f"Mapped {len(reader):,} ticks in {(time.perf_counter() - started) * 1000:.2f}ms")
+
+    started = time.perf_counter()
+    kraken_btc = reader.select(symbol='BTC/USDT', exchange='kraken')
+    print(f"Selected {len(kraken_btc):,} kraken BTC/USDT ticks in {(time.perf_counter() - started) * 1000:.1f}ms, "
+          f"mean spread {np.mean(kraken_btc['ask'] - kraken_btc['bid']):.4f}")
+
+
+if __name__ == "__main__":
+    demo_tick_log()
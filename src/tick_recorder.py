@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Buffered, batched tick recorder
+Keeps file I/O out of the WebSocket receive loop: rows go into an in-memory
+queue and a background writer flushes them in batches to a pluggable sink,
+rotating files by size or by hour
+"""
+
+import atexit
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+
+# Defaults
+FLUSH_INTERVAL = 1.0                 # Seconds between flushes
+BATCH_SIZE = 1000                    # Rows that trigger an early flush
+MAX_QUEUE = 100_000                  # Rows buffered before new rows are dropped
+MAX_FILE_BYTES = 100 * 1024 * 1024   # Rotate after 100 MB
+ROTATE_HOURLY = True
+
+
+class CSVSink:
+    """Writes rows to CSV files with a header"""
+
+    extension = 'csv'
+
+    def __init__(self, fieldnames: List[str]):
+        self.fieldnames = fieldnames
+        self._file = None
+        self._writer = None
+
+    def open(self, path: Path) -> None:
+        is_new = not path.exists() or path.stat().st_size == 0
+        self._file = open(path, 'a', newline='', buffering=1 << 16)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction='ignore')
+        if is_new:
+            self._writer.writeheader()
+
+    def write(self, rows: List[Dict]) -> None:
+        self._writer.writerows(rows)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def size(self) -> int:
+        """Bytes written to the current file"""
+        return self._file.tell()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class JSONLSink:
+    """Writes one JSON object per line, optionally fsyncing on every flush"""
+
+    extension = 'jsonl'
+
+    def __init__(self, fsync: bool = False):
+        self.fsync = fsync
+        self._file = None
+
+    def open(self, path: Path) -> None:
+        self._file = open(path, 'a', buffering=1 << 16)
+
+    def write(self, rows: List[Dict]) -> None:
+        self._file.write(''.join(json.dumps(row, default=str) + '\n' for row in rows))
+
+    def flush(self) -> None:
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def size(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+class TickRecorder:
+    """
+    Asynchronous tick recorder
+
+    record() only appends to a bounded in-memory queue, so it is safe to call
+    from the receive coroutine. A writer thread drains the queue every
+    ``flush_interval`` seconds (or as soon as ``batch_size`` rows are waiting)
+    and writes each batch with one call into the sink. When the writer falls
+    behind and the queue is full, new rows are dropped and counted.
+    """
+
+    def __init__(self, data_dir: str = 'data', prefix: str = 'prices', sink=None,
+                 flush_interval: float = FLUSH_INTERVAL, batch_size: int = BATCH_SIZE,
+                 max_queue: int = MAX_QUEUE, max_file_bytes: int = MAX_FILE_BYTES,
+                 rotate_hourly: bool = ROTATE_HOURLY):
+        """
+        Initialize the recorder and open the first file
+
+        Args:
+            data_dir: Directory for output files
+            prefix: File name prefix, e.g. 'prices' -> prices_20240101_120000.csv
+            sink: Object with extension, open(path), write(rows), flush(), size() and close()
+            flush_interval: Seconds between flushes
+            batch_size: Queue length that triggers an early flush
+            max_queue: Rows buffered before new rows are dropped
+            max_file_bytes: Rotate to a new file after this many bytes (0 disables)
+            rotate_hourly: Rotate to a new file when the hour changes
+        """
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.max_file_bytes = max_file_bytes
+        self.rotate_hourly = rotate_hourly
+
+        self._queue = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        # Counters
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.rotations = 0
+        self.write_errors = 0
+
+        self.files = []
+        self.path = None
+        self._opened_hour = None
+        self._open_file()
+
+        self._thread = threading.Thread(target=self._writer_loop, name=f"{prefix}-recorder", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, row: Dict) -> bool:
+        """
+        Queue a row for writing without touching the filesystem
+
+        Returns:
+            False if the row was dropped because the queue is full
+        """
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return False
+
+        self._queue.append(row)
+        self.recorded += 1
+
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def _open_file(self) -> None:
+        """Open a new file named after the current time"""
+        now = datetime.now()
+        path = self.data_dir / f"{self.prefix}_{now.strftime('%Y%m%d_%H%M%S')}.{self.sink.extension}"
+        suffix = 1
+        while path in self.files or path.exists():
+            path = self.data_dir / f"{self.prefix}_{now.strftime('%Y%m%d_%H%M%S')}_{suffix}.{self.sink.extension}"
+            suffix += 1
+
+        self.sink.open(path)
+        self.path = path
+        self.files.append(path)
+        self._opened_hour = now.strftime('%Y%m%d%H')
+
+    def _should_rotate(self) -> bool:
+        if self.rotate_hourly and datetime.now().strftime('%Y%m%d%H') != self._opened_hour:
+            return True
+        return bool(self.max_file_bytes) and self.sink.size() >= self.max_file_bytes
+
+    def _rotate(self) -> None:
+        self.sink.close()
+        self._open_file()
+        self.rotations += 1
+
+    def _drain(self) -> List[Dict]:
+        return [self._queue.popleft() for _ in range(len(self._queue))]
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        try:
+            if self._should_rotate():
+                self._rotate()
+            self.sink.write(rows)
+            self.sink.flush()
+            self.written += len(rows)
+            self.batches += 1
+        except Exception as e:
+            self.write_errors += 1
+            self.dropped += len(rows)
+            print(f"Error writing {len(rows)} rows to {self.path}: {e}")
+
+    def _writer_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+
+            rows = self._drain()
+            if rows:
+                self._write_batch(rows)
+
+        # Final flush on close
+        rows = self._drain()
+        if rows:
+            self._write_batch(rows)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wake the writer and wait until everything queued so far is written"""
+        target = self.recorded
+        self._wake.set()
+        deadline = time.monotonic() + timeout
+        while self.written + self.dropped < target and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def close(self) -> None:
+        """Flush remaining rows and close the sink"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=10)
+        self.sink.close()
+
+    def stats(self) -> Dict:
+        return {
+            'path': str(self.path),
+            'files': len(self.files),
+            'queued': len(self._queue),
+            'recorded': self.recorded,
+            'written': self.written,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'rotations': self.rotations,
+            'write_errors': self.write_errors,
+        }
+
+
+def demo_recorder():
+    """Demo: record 200k rows and compare with one-open-per-row writes"""
+    fieldnames = ['timestamp', 'symbol', 'exchange', 'bid', 'ask', 'last', 'volume']
+    row = {'timestamp': datetime.now().isoformat(), 'symbol': 'BTC/USDT', 'exchange': 'kraken',
+           'bid': 50000.0, 'ask': 50000.1, 'last': 50000.05, 'volume': 1234.5}
+
+    recorder = TickRecorder('data/demo_recorder', prefix='prices', sink=CSVSink(fieldnames),
+                            max_file_bytes=5 * 1024 * 1024)
+
+    started = time.perf_counter()
+    for _ in range(200_000):
+        recorder.record(dict(row))
+    enqueue_time = time.perf_counter() - started
+    recorder.close()
+
+    print(f"Queued 200,000 rows in {enqueue_time:.3f}s ({enqueue_time / 200_000 * 1e6:.2f}µs per row)")
+    print(f"Stats: {recorder.stats()}")
+
+    path = Path('data/demo_recorder/per_row.csv')
+    started = time.perf_counter()
+    for _ in range(20_000):
+        with open(path, 'a', newline='') as f:
+            csv.DictWriter(f, fieldnames=fieldnames).writerow(row)
+    per_row_time = time.perf_counter() - started
+    print(f"Open/write/close per row: {per_row_time / 20_000 * 1e6:.2f}µs per row")
+
+
+if __name__ == "__main__":
+    demo_recorder()
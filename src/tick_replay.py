@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Tick replay engine
+Streams recorded ticks (prices_*.csv, Parquet tick store or binary tick
+logs) into the same update_quote() interface the WebSocket feeds use, in
+real time, N times faster or as fast as possible, on a simulated clock so
+runs are reproducible offline
+"""
+
+import argparse
+import glob
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from tick_log import TICK_DTYPE, TickLogReader
+except ImportError:  # imported as src.tick_replay
+    from src.tick_log import TICK_DTYPE, TickLogReader
+
+
+CHUNK_SIZE = 65_536       # Ticks converted to Python values at a time
+MIN_SLEEP = 0.001         # Don't sleep for less than 1ms when pacing
+DEFAULT_SYMBOL = 'BTC/USDT'  # For CSV files recorded before the symbol column existed
+
+
+class SimulatedClock:
+    """Clock that only moves when the replay advances it to the next tick"""
+
+    def __init__(self, start_ns: int = 0):
+        self.ns = start_ns
+
+    def time_ns(self) -> int:
+        return self.ns
+
+    def time(self) -> float:
+        return self.ns / 1e9
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.ns / 1e9)
+
+
+def _names_to_codes(values) -> Tuple[np.ndarray, List[str]]:
+    names, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return codes.astype(np.uint16), [str(name) for name in names]
+
+
+def _records_from_columns(timestamps, exchanges, symbols, bid, ask, last, volume) -> Tuple[np.ndarray, List[str], List[str]]:
+    """Pack columns into TICK_DTYPE records plus the exchange/symbol dictionaries"""
+    records = np.zeros(len(timestamps), dtype=TICK_DTYPE)
+    records['timestamp'] = timestamps
+    records['exchange'], exchange_names = _names_to_codes(exchanges)
+    records['symbol'], symbol_names = _names_to_codes(symbols)
+    for name, column in (('bid', bid), ('ask', ask), ('last', last), ('volume', volume)):
+        records[name] = np.nan_to_num(np.asarray(column, dtype=np.float64))
+    return records, exchange_names, symbol_names
+
+
+def load_csv(path: Union[str, Path], default_symbol: str = DEFAULT_SYMBOL):
+    """
+    Load a prices_*.csv recording
+
+    Timestamps are naive local ISO strings, as written by the monitor.
+    """
+    import pandas as pd
+
+    frame = pd.read_csv(path)
+    if frame.empty:
+        return np.zeros(0, dtype=TICK_DTYPE), [], []
+
+    local_tz = datetime.now().astimezone().tzinfo
+    timestamps = pd.to_datetime(frame['timestamp']).dt.tz_localize(local_tz).astype('int64')
+    symbols = frame['symbol'] if 'symbol' in frame else [default_symbol] * len(frame)
+    return _records_from_columns(timestamps, frame['exchange'], symbols, frame['bid'], frame['ask'],
+                                 frame['last'], frame.get('volume', 0.0))
+
+
+def load_parquet(root: Union[str, Path], start=None, end=None, symbols: Optional[List[str]] = None):
+    """Load ticks from a Parquet tick store"""
+    try:
+        from tick_store import read_ticks
+    except ImportError:
+        from src.tick_store import read_ticks
+
+    table = read_ticks(root, start, end, symbols=symbols)
+    columns = {name: table.column(name).to_numpy() if name in ('timestamp', 'bid', 'ask', 'last', 'volume')
+               else table.column(name).cast('string').to_numpy(zero_copy_only=False)
+               for name in table.column_names}
+    return _records_from_columns(columns['timestamp'], columns['exchange'], columns['symbol'],
+                                 columns['bid'], columns['ask'], columns['last'], columns['volume'])
+
+
+def load_ticklog(path: Union[str, Path]):
+    """Map a binary tick log (no copy)"""
+    reader = TickLogReader(path)
+    return reader.records, list(reader.exchanges), list(reader.symbols)
+
+
+def load_ticks(paths: Union[str, Path, Iterable[Union[str, Path]]]):
+    """
+    Load and merge recordings in timestamp order
+
+    Args:
+        paths: Files or glob patterns: *.csv, *.ticklog, or a Parquet tick store directory
+
+    Returns:
+        (records, exchanges, symbols): TICK_DTYPE records whose exchange/symbol
+        fields index into the two name lists
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+
+    files = []
+    for pattern in paths:
+        files.extend(sorted(glob.glob(str(pattern))) or [pattern])
+
+    loaded = []
+    for path in files:
+        path = Path(path)
+        if path.is_dir():
+            loaded.append(load_parquet(path))
+        elif path.suffix == '.ticklog':
+            loaded.append(load_ticklog(path))
+        elif path.suffix == '.csv':
+            loaded.append(load_csv(path))
+        else:
+            print(f"⚠️  Skipping {path}: unknown tick format")
+
+    if len(loaded) == 1:
+        return loaded[0]
+
+    # Merge: remap every file's ids onto shared dictionaries, then sort by time
+    exchanges, symbols, parts = [], [], []
+    for records, file_exchanges, file_symbols in loaded:
+        exchange_map = np.array([_index(exchanges, name) for name in file_exchanges] or [0], dtype=np.uint16)
+        symbol_map = np.array([_index(symbols, name) for name in file_symbols] or [0], dtype=np.uint16)
+        part = np.array(records)
+        part['exchange'] = exchange_map[part['exchange']]
+        part['symbol'] = symbol_map[part['symbol']]
+        parts.append(part)
+
+    records = np.concatenate(parts) if parts else np.zeros(0, dtype=TICK_DTYPE)
+    records = records[np.argsort(records['timestamp'], kind='stable')]
+    return records, exchanges, symbols
+
+
+def _index(names: List[str], name: str) -> int:
+    if name not in names:
+        names.append(name)
+    return names.index(name)
+
+
+class TickReplayer:
+    """
+    Replay recorded ticks into anything with update_quote()
+
+    speed=1 replays in real time, speed=10 ten times faster and speed=None
+    (or 0) as fast as possible. Before each tick the simulated clock is set
+    to the tick's recorded timestamp, so everything that reads the clock sees
+    the same times on every run.
+    """
+
+    def __init__(self, records: np.ndarray, exchanges: List[str], symbols: List[str],
+                 speed: Optional[float] = None, clock: Optional[SimulatedClock] = None):
+        """
+        Initialize the replayer
+
+        Args:
+            records: TICK_DTYPE records in timestamp order (see load_ticks)
+            exchanges: Exchange names indexed by records['exchange']
+            symbols: Symbol names indexed by records['symbol']
+            speed: Replay speed multiplier; None or 0 for as fast as possible
+            clock: Simulated clock to drive (a new one by default)
+        """
+        self.records = records
+        self.exchanges = exchanges
+        self.symbols = symbols
+        self.speed = speed or None
+        self.clock = clock or SimulatedClock(int(records['timestamp'][0]) if len(records) else 0)
+
+        self.replayed = 0
+        self.wall_seconds = 0.0
+
+    @classmethod
+    def from_files(cls, paths, speed: Optional[float] = None) -> 'TickReplayer':
+        """Build a replayer from recordings (see load_ticks)"""
+        return cls(*load_ticks(paths), speed=speed)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def iter_ticks(self, limit: Optional[int] = None) -> Iterator[Tuple]:
+        """
+        Yield (timestamp_ns, symbol, exchange, bid, ask, last, volume), pacing
+        and advancing the clock
+        """
+        records = self.records[:limit] if limit else self.records
+        if not len(records):
+            return
+
+        exchanges, symbols, clock = self.exchanges, self.symbols, self.clock
+        first_ns = int(records['timestamp'][0])
+        wall_start = time.perf_counter()
+
+        for offset in range(0, len(records), CHUNK_SIZE):
+            chunk = records[offset:offset + CHUNK_SIZE]
+            columns = zip(chunk['timestamp'].tolist(), chunk['symbol'].tolist(), chunk['exchange'].tolist(),
+                          chunk['bid'].tolist(), chunk['ask'].tolist(), chunk['last'].tolist(),
+                          chunk['volume'].tolist())
+
+            for ns, symbol, exchange, bid, ask, last, volume in columns:
+                if self.speed:
+                    delay = wall_start + (ns - first_ns) / 1e9 / self.speed - time.perf_counter()
+                    if delay >= MIN_SLEEP:
+                        time.sleep(delay)
+
+                clock.ns = ns
+                self.replayed += 1
+                yield ns, symbols[symbol], exchanges[exchange], bid, ask, last, volume
+
+        self.wall_seconds = time.perf_counter() - wall_start
+
+    def replay(self, target, limit: Optional[int] = None,
+               on_tick: Optional[Callable[[Tuple], None]] = None) -> Dict:
+        """
+        Feed every tick into target.update_quote()
+
+        If the target has now/time_ns attributes (WebSocketPriceMonitor does),
+        they are pointed at the simulated clock for the duration of the replay.
+
+        Args:
+            target: Object with update_quote(symbol, exchange, bid, ask, last, volume, received_ns)
+            limit: Replay only the first `limit` ticks
+            on_tick: Called with each tick tuple after update_quote
+
+        Returns:
+            Replay statistics
+        """
+        watched = getattr(target, 'quotes', None)
+        saved = {name: getattr(target, name) for name in ('now', 'time_ns') if hasattr(target, name)}
+        if 'now' in saved:
+            target.now = self.clock.now
+        if 'time_ns' in saved:
+            target.time_ns = self.clock.time_ns
+
+        update_quote = target.update_quote
+        skipped = 0
+        try:
+            for tick in self.iter_ticks(limit):
+                _, symbol, exchange, bid, ask, last, volume = tick
+                if watched is not None and symbol not in watched:
+                    skipped += 1
+                    continue
+                update_quote(symbol, exchange, bid, ask, last, volume, time.perf_counter_ns())
+                if on_tick:
+                    on_tick(tick)
+        finally:
+            for name, value in saved.items():
+                setattr(target, name, value)
+
+        return self.stats(skipped=skipped)
+
+    def stats(self, **extra) -> Dict:
+        span = 0.0
+        if self.replayed:
+            span = (self.clock.ns - int(self.records['timestamp'][0])) / 1e9
+        return {
+            'ticks': self.replayed,
+            'wall_seconds': self.wall_seconds,
+            'ticks_per_second': self.replayed / self.wall_seconds if self.wall_seconds else 0.0,
+            'simulated_seconds': span,
+            'speedup': span / self.wall_seconds if self.wall_seconds else 0.0,
+            **extra,
+        }
+
+
+def record_to_analyzer(monitor, analyzer) -> None:
+    """Forward every opportunity the monitor opens to ArbitrageAnalyzer.record_opportunity"""
+    monitor.opportunity_callbacks.append(
+        lambda opportunity: analyzer.record_opportunity(
+            opportunity['symbol'], opportunity, timestamp=monitor.now()
+        )
+    )
+
+
+def main():
+    """Replay recordings into a WebSocketPriceMonitor and print what it found"""
+    parser = argparse.ArgumentParser(description='Replay recorded ticks through the arbitrage monitor')
+    parser.add_argument('paths', nargs='+', help='prices_*.csv, *.ticklog files or a Parquet tick store directory')
+    parser.add_argument('--speed', type=float, default=0, help='1 = real time, 10 = 10x, 0 = as fast as possible')
+    parser.add_argument('--limit', type=int, default=None, help='Replay only the first N ticks')
+    parser.add_argument('--fee', type=float, default=0.1, help='Taker fee per trade in percent')
+    parser.add_argument('--output', default='data/replay', help='Directory for the replay session logs')
+    parser.add_argument('--analyze', action='store_true', help='Also record opportunities with ArbitrageAnalyzer')
+    args = parser.parse_args()
+
+    try:
+        from websocket_monitor import WebSocketPriceMonitor
+        from arbitrage_analyzer import ArbitrageAnalyzer
+    except ImportError:
+        from src.websocket_monitor import WebSocketPriceMonitor
+        from src.arbitrage_analyzer import ArbitrageAnalyzer
+
+    replayer = TickReplayer.from_files(args.paths, speed=args.speed)
+    if not len(replayer):
+        print("❌ No ticks found")
+        return
+
+    print(f"▶️  Replaying {len(replayer):,} ticks ({', '.join(replayer.symbols)} on "
+          f"{', '.join(replayer.exchanges)}) at {f'{args.speed:g}x' if args.speed else 'max speed'}")
+
+    Path(args.output).mkdir(parents=True, exist_ok=True)
+    monitor = WebSocketPriceMonitor(symbols=replayer.symbols, data_dir=args.output, fee_percent=args.fee)
+    analyzer = None
+    if args.analyze:
+        analyzer = ArbitrageAnalyzer(data_dir=args.output)
+        record_to_analyzer(monitor, analyzer)
+
+    try:
+        stats = replayer.replay(monitor, limit=args.limit)
+    finally:
+        monitor.tick_recorder.close()
+        monitor.journal.close()
+
+    print(f"\n✅ {stats['ticks']:,} ticks in {stats['wall_seconds']:.2f}s "
+          f"({stats['ticks_per_second']:,.0f} ticks/s, {stats['speedup']:,.0f}x real time)")
+    print(f"   Opportunities opened: {monitor.opportunities_detected}")
+    for opportunity in monitor.active_opportunities.values():
+        print(f"   Open at end: {opportunity['symbol']} buy {opportunity['buy_from']} "
+              f"sell {opportunity['sell_to']} net {opportunity['net_profit_pct']:.3f}%")
+    if analyzer:
+        print(f"   Analyzer recorded {len(analyzer.opportunities)} opportunities, {len(analyzer.alerts)} alerts")
+
+
+if __name__ == "__main__":
+    main()
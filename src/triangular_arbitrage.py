@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Single-exchange triangular and multi-leg arbitrage
+Builds a currency graph from an exchange's spot markets with
+-log(rate x (1 - fee)) edge weights. Cycles of up to MAX_CYCLE_LENGTH legs
+are enumerated once, so each ticker refresh re-scores all of them in one
+vectorized pass; a Bellman-Ford search finds negative cycles of any length.
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from spread_engine import DEFAULT_FEE_PERCENT
+except ImportError:  # imported as src.triangular_arbitrage
+    from src.spread_engine import DEFAULT_FEE_PERCENT
+
+
+MAX_CYCLE_LENGTH = 4
+# Cycles must pass through one of these; every currency makes 4-leg enumeration explode on big venues
+START_CURRENCIES = ['USDT', 'USDC', 'USD', 'EUR', 'BTC', 'ETH']
+MIN_PROFIT = 0.0          # Net profit (%) per cycle, exclusive
+UPDATE_INTERVAL = 10      # Seconds between ticker refreshes in the CLI
+NEGATIVE_CYCLE_EPSILON = 1e-12
+
+
+class TriangularArbitrage:
+    """
+    Currency graph for one exchange
+
+    Every market BASE/QUOTE gives two edges: BASE -> QUOTE (sell at the
+    bid) and QUOTE -> BASE (buy at the ask). An edge's weight is
+    -log(rate x (1 - fee)), so a cycle whose weights sum below zero
+    returns more than it started with.
+    """
+
+    def __init__(self, markets: Dict[str, Dict], fee_percent: Optional[float] = None,
+                 start_currencies: Optional[Sequence[str]] = START_CURRENCIES,
+                 max_length: int = MAX_CYCLE_LENGTH):
+        """
+        Args:
+            markets: ccxt load_markets() result (non-spot and inactive markets are skipped)
+            fee_percent: Taker fee (%) per leg; defaults to each market's 'taker'
+                fee, or DEFAULT_FEE_PERCENT when the market has none
+            start_currencies: Only keep cycles through one of these (None: every currency)
+            max_length: Longest cycle to enumerate (2-4 legs)
+        """
+        self.symbols = []
+        fees = []
+        bases, quotes = [], []
+        for symbol, market in markets.items():
+            if not market.get('spot', True) or market.get('active') is False:
+                continue
+            base, quote = market.get('base'), market.get('quote')
+            if not base or not quote or base == quote:
+                continue
+            self.symbols.append(symbol)
+            bases.append(base)
+            quotes.append(quote)
+            taker = market.get('taker')
+            fees.append(fee_percent / 100 if fee_percent is not None else
+                        taker if taker is not None else DEFAULT_FEE_PERCENT / 100)
+
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.currencies = sorted(set(bases) | set(quotes))
+        self.currency_index = {currency: i for i, currency in enumerate(self.currencies)}
+
+        # Edge e: market e // 2; even edges sell the base at the bid, odd edges buy it at the ask
+        n = len(self.symbols)
+        base_ids = np.array([self.currency_index[c] for c in bases], dtype=np.int64)
+        quote_ids = np.array([self.currency_index[c] for c in quotes], dtype=np.int64)
+        self.edge_src = np.empty(2 * n, dtype=np.int64)
+        self.edge_dst = np.empty(2 * n, dtype=np.int64)
+        self.edge_src[0::2], self.edge_dst[0::2] = base_ids, quote_ids
+        self.edge_src[1::2], self.edge_dst[1::2] = quote_ids, base_ids
+        self.log_fee = np.log1p(-np.repeat(np.array(fees, dtype=np.float64), 2))
+
+        self.bids = np.full(n, np.nan)
+        self.asks = np.full(n, np.nan)
+
+        if start_currencies is None:
+            start_currencies = self.currencies
+        self.start_currencies = [c for c in start_currencies if c in self.currency_index]
+        self.cycles = self._enumerate_cycles(max_length)
+
+    def _enumerate_cycles(self, max_length: int) -> Dict[int, np.ndarray]:
+        """
+        Every simple cycle of 2..max_length edges through a start currency, as edge-index arrays
+
+        A cycle is rooted at its earliest start currency (in start_currencies
+        order), so each directed cycle appears exactly once.
+        """
+        adjacency = [[] for _ in self.currencies]
+        for e, (src, dst) in enumerate(zip(self.edge_src.tolist(), self.edge_dst.tolist())):
+            adjacency[src].append((e, dst))
+
+        cycles = {length: [] for length in range(2, max_length + 1)}
+        excluded = set()
+        for start_currency in self.start_currencies:
+            start = self.currency_index[start_currency]
+            into_start = {}
+            for e, (src, dst) in enumerate(zip(self.edge_src.tolist(), self.edge_dst.tolist())):
+                if dst == start and src not in excluded:
+                    into_start.setdefault(src, []).append(e)
+
+            def extend(node, path, visited):
+                for last in into_start.get(node, ()):
+                    if len(path) >= 1 and not (len(path) == 1 and last // 2 == path[0] // 2):
+                        cycles[len(path) + 1].append(path + [last])
+                if len(path) + 1 >= max_length:
+                    return
+                for e, nxt in adjacency[node]:
+                    if nxt == start or nxt in visited or nxt in excluded:
+                        continue
+                    visited.add(nxt)
+                    extend(nxt, path + [e], visited)
+                    visited.discard(nxt)
+
+            for e, nxt in adjacency[start]:
+                if nxt not in excluded:
+                    extend(nxt, [e], {start, nxt})
+            excluded.add(start)
+
+        return {length: np.array(paths, dtype=np.int64).reshape(-1, length)
+                for length, paths in cycles.items() if paths}
+
+    @property
+    def cycle_count(self) -> int:
+        return sum(len(paths) for paths in self.cycles.values())
+
+    def update_tickers(self, tickers: Dict[str, Dict]) -> int:
+        """
+        Apply {symbol: {'bid': ..., 'ask': ...}} (a fetch_tickers() result)
+
+        Returns:
+            Number of markets updated
+        """
+        updated = 0
+        for symbol, ticker in tickers.items():
+            i = self.symbol_index.get(symbol)
+            if i is None or not ticker:
+                continue
+            bid, ask = ticker.get('bid'), ticker.get('ask')
+            self.bids[i] = bid if bid and bid > 0 else np.nan
+            self.asks[i] = ask if ask and ask > 0 else np.nan
+            updated += 1
+        return updated
+
+    def log_rates(self) -> np.ndarray:
+        """log(rate x (1 - fee)) per edge; -inf where the market has no quote"""
+        rates = np.empty(len(self.edge_src))
+        rates[0::2] = np.log(self.bids)
+        rates[1::2] = -np.log(self.asks)
+        rates += self.log_fee
+        return np.nan_to_num(rates, nan=-np.inf)
+
+    def scan(self, min_profit: float = MIN_PROFIT, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Re-score every enumerated cycle against the current tickers
+
+        Args:
+            min_profit: Minimum net profit (%) after fees, exclusive
+            limit: Return at most this many, best first
+
+        Returns:
+            Opportunity dicts with path, legs, length and profit_pct
+        """
+        log_rates = self.log_rates()
+        threshold = np.log1p(min_profit / 100)
+
+        found = []
+        for length, paths in self.cycles.items():
+            totals = log_rates[paths].sum(axis=1)
+            hits = np.flatnonzero(totals > threshold)
+            found.extend((float(totals[i]), paths[i]) for i in hits.tolist())
+
+        found.sort(key=lambda x: x[0], reverse=True)
+        return [self._opportunity(edges, total) for total, edges in found[:limit]]
+
+    def _opportunity(self, edges: Sequence[int], log_return: float) -> Dict:
+        legs = []
+        for e in np.asarray(edges).tolist():
+            market = e // 2
+            sell = e % 2 == 0
+            legs.append({
+                'symbol': self.symbols[market],
+                'side': 'sell' if sell else 'buy',
+                'price': float(self.bids[market] if sell else self.asks[market]),
+                'from': self.currencies[self.edge_src[e]],
+                'to': self.currencies[self.edge_dst[e]],
+            })
+        return {
+            'path': [leg['from'] for leg in legs] + [legs[0]['from']],
+            'legs': legs,
+            'length': len(legs),
+            'profit_pct': float(np.expm1(log_return) * 100),
+        }
+
+    def negative_cycle(self) -> Optional[Dict]:
+        """
+        Bellman-Ford over all edges at once from a virtual source
+
+        Finds a profitable cycle of any length (not only the enumerated
+        ones), or returns None when the rates admit none.
+        """
+        weights = -self.log_rates()
+        usable = np.isfinite(weights)
+        src, dst, weights = self.edge_src[usable], self.edge_dst[usable], weights[usable]
+        edge_ids = np.flatnonzero(usable)
+        if not len(weights):
+            return None
+
+        n = len(self.currencies)
+        dist = np.zeros(n)
+        pred = np.full(n, -1, dtype=np.int64)     # Edge (into the full edge list) that last improved each node
+
+        changed_node = -1
+        for _ in range(n):
+            candidate = dist[src] + weights
+            improving = np.flatnonzero(candidate < dist[dst] - NEGATIVE_CYCLE_EPSILON)
+            if not len(improving):
+                return None
+
+            # Best improving edge per destination node
+            order = improving[np.lexsort((candidate[improving], dst[improving]))]
+            first = order[np.r_[True, dst[order][1:] != dst[order][:-1]]]
+            dist[dst[first]] = candidate[first]
+            pred[dst[first]] = edge_ids[first]
+            changed_node = int(dst[first[0]])
+
+        # Still relaxing after n rounds: walking predecessors back n steps lands on the cycle.
+        # A chain that ends at a never-relaxed node (pred -1) has no cycle to report
+        node = changed_node
+        for _ in range(n):
+            if pred[node] < 0:
+                return None
+            node = int(self.edge_src[pred[node]])
+
+        cycle = []
+        current = node
+        while True:
+            e = int(pred[current])
+            if e < 0 or len(cycle) >= n:
+                return None
+            cycle.append(e)
+            current = int(self.edge_src[e])
+            if current == node:
+                break
+        cycle.reverse()
+
+        log_return = float(self.log_rates()[cycle].sum())
+        return self._opportunity(cycle, log_return) if log_return > 0 else None
+
+
+def display_opportunities(opportunities: List[Dict], top_n: int = 15) -> None:
+    if not opportunities:
+        print("❌ No profitable cycles after fees")
+        return
+
+    print(f"{'#':<4} {'Profit':>9} {'Legs':>5}  Path")
+    print("-"*90)
+    for i, opp in enumerate(opportunities[:top_n], 1):
+        trades = ', '.join(f"{leg['side']} {leg['symbol']} @ {leg['price']:.8g}" for leg in opp['legs'])
+        print(f"{i:<4} {opp['profit_pct']:>8.4f}% {opp['length']:>5}  {' → '.join(opp['path'])}")
+        print(f"{'':<20} {trades}")
+
+
+def demo_markets(n_bases: int = 600, quotes: Sequence[str] = ('USDT', 'BTC', 'ETH', 'BNB', 'USDC', 'EUR'),
+                 seed: int = 3):
+    """Synthetic exchange: every base listed against a few quotes, with consistent prices and small noise"""
+    rng = np.random.default_rng(seed)
+    usd = {'USDT': 1.0, 'USDC': 1.0, 'EUR': 1.08, 'BTC': 60_000.0, 'ETH': 3_000.0, 'BNB': 550.0}
+    markets, tickers = {}, {}
+
+    def add(base, quote, noise=0.0004):
+        symbol = f"{base}/{quote}"
+        mid = usd[base] / usd[quote] * (1 + rng.normal(0, noise))
+        half_spread = mid * rng.uniform(0.00005, 0.0005)
+        markets[symbol] = {'symbol': symbol, 'base': base, 'quote': quote, 'spot': True, 'active': True, 'taker': 0.001}
+        tickers[symbol] = {'bid': mid - half_spread, 'ask': mid + half_spread}
+
+    for i, quote in enumerate(quotes):
+        for other in quotes[i + 1:]:
+            add(other, quote) if usd[other] > usd[quote] else add(quote, other)
+
+    for b in range(n_bases):
+        base = f"ALT{b}"
+        usd[base] = float(rng.lognormal(0, 2))
+        for quote in rng.choice(quotes, size=int(rng.integers(1, 4)), replace=False):
+            add(base, quote)
+
+    # One mispriced market so there is something to find
+    stale = next(symbol for symbol in tickers if symbol.endswith('/BTC') and symbol.startswith('ALT'))
+    tickers[stale] = {key: price * 1.006 for key, price in tickers[stale].items()}
+    return markets, tickers
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Triangular / multi-leg arbitrage on one exchange')
+    parser.add_argument('exchange', nargs='?', default='binance', help='ccxt exchange id')
+    parser.add_argument('--fee', type=float, default=None, help="Taker fee per leg (%%); default: market's fee")
+    parser.add_argument('--min-profit', type=float, default=MIN_PROFIT, help='Minimum net profit per cycle (%%)')
+    parser.add_argument('--max-length', type=int, default=MAX_CYCLE_LENGTH, help='Longest cycle to enumerate')
+    parser.add_argument('--start', nargs='+', default=START_CURRENCIES, help='Currencies cycles must pass through')
+    parser.add_argument('--interval', type=float, default=UPDATE_INTERVAL, help='Seconds between refreshes')
+    parser.add_argument('--once', action='store_true', help='Scan once and exit')
+    parser.add_argument('--demo', action='store_true', help='Use a synthetic exchange instead of fetching')
+    args = parser.parse_args()
+
+    print("🔺 TRIANGULAR ARBITRAGE SCANNER")
+    print("="*90)
+
+    if args.demo:
+        markets, tickers = demo_markets()
+        fetch = lambda: tickers
+        name = 'demo'
+    else:
+        import ccxt
+
+        try:
+            from async_fetcher import get_fetcher
+            from market_cache import get_market_cache
+        except ImportError:  # imported as src.triangular_arbitrage
+            from src.async_fetcher import get_fetcher
+            from src.market_cache import get_market_cache
+
+        exchange = getattr(ccxt, args.exchange)()
+        markets = get_market_cache().load_markets(exchange)
+        name = exchange.name
+        fetcher = get_fetcher({name: exchange})
+
+        def fetch():
+            snapshot = fetcher.fetch_tickers_sync(symbols)
+            for exchange_name, error in snapshot['errors'].items():
+                print(f"❌ {exchange_name}: {error[:100]}")
+            return snapshot['tickers'].get(name, {})
+
+    started = time.perf_counter()
+    detector = TriangularArbitrage(markets, args.fee, args.start, args.max_length)
+    symbols = detector.symbols
+    print(f"{name}: {len(detector.symbols)} markets, {len(detector.currencies)} currencies, "
+          f"{detector.cycle_count:,} cycles of ≤{args.max_length} legs "
+          f"(enumerated in {time.perf_counter() - started:.2f}s)")
+
+    try:
+        while True:
+            tickers = fetch()
+            detector.update_tickers(tickers)
+
+            started = time.perf_counter()
+            opportunities = detector.scan(args.min_profit)
+            scan_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            cycle = detector.negative_cycle()
+            bellman_ford_ms = (time.perf_counter() - started) * 1000
+
+            print(f"\n[{time.strftime('%H:%M:%S')}] {len(tickers)} tickers - re-scored {detector.cycle_count:,} cycles "
+                  f"in {scan_ms:.1f}ms, Bellman-Ford {bellman_ford_ms:.1f}ms")
+            display_opportunities(opportunities)
+            if cycle:
+                print(f"\n🔁 Bellman-Ford negative cycle: {' → '.join(cycle['path'])} ({cycle['profit_pct']:+.4f}%)")
+
+            if args.once or args.demo:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+
+
+if __name__ == "__main__":
+    main()
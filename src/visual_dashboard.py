@@ -7,6 +7,9 @@ from flask import Flask, render_template, jsonify
 import ccxt
 import time
 from datetime import datetime
+from async_fetcher import get_fetcher
+from metrics import metrics_response, observe_update_loop
+from spread_engine import find_opportunities
 import threading
 from collections import deque
 
@@ -55,78 +58,18 @@ UPDATE_INTERVAL = 15  # seconds
 
 def fetch_prices(symbol=SYMBOL):
     """Fetch current price for a symbol from multiple exchanges"""
-    prices = {}
-
-    for exchange_name, exchange in exchanges.items():
-        try:
-            ticker = exchange.fetch_ticker(symbol)
-            prices[exchange_name] = {
-                'bid': ticker['bid'],
-                'ask': ticker['ask'],
-                'last': ticker['last'],
-                'timestamp': ticker['timestamp']
-            }
-        except Exception as e:
-            # Try USD version if USDT fails
-            try:
-                ticker = exchange.fetch_ticker(symbol.replace('USDT', 'USD'))
-                prices[exchange_name] = {
-                    'bid': ticker['bid'],
-                    'ask': ticker['ask'],
-                    'last': ticker['last'],
-                    'timestamp': ticker['timestamp']
-                }
-            except:
-                pass
+    # Try USD version if USDT fails
+    prices = get_fetcher(exchanges).fetch_prices(
+        symbol, fallback_symbol=symbol.replace('USDT', 'USD'),
+        skip_failed=True, verbose=False
+    )
 
     return prices
 
 
 def calculate_arbitrage(prices, fee_percent=FEE_PERCENT):
-    """Calculate potential arbitrage opportunities"""
-    opportunities = []
-    exchange_names = list(prices.keys())
-
-    for i, buy_exchange in enumerate(exchange_names):
-        for sell_exchange in exchange_names[i+1:]:
-            if prices[buy_exchange] and prices[sell_exchange]:
-                # Forward direction
-                buy_price = prices[buy_exchange]['ask']
-                sell_price = prices[sell_exchange]['bid']
-
-                gross_profit = ((sell_price - buy_price) / buy_price) * 100
-                fees = fee_percent * 2
-                net_profit = gross_profit - fees
-
-                if net_profit > 0:
-                    opportunities.append({
-                        'buy_from': buy_exchange,
-                        'sell_to': sell_exchange,
-                        'buy_price': buy_price,
-                        'sell_price': sell_price,
-                        'gross_profit_pct': gross_profit,
-                        'net_profit_pct': net_profit
-                    })
-
-                # Reverse direction
-                buy_price_reverse = prices[sell_exchange]['ask']
-                sell_price_reverse = prices[buy_exchange]['bid']
-
-                gross_profit_reverse = ((sell_price_reverse - buy_price_reverse) / buy_price_reverse) * 100
-                net_profit_reverse = gross_profit_reverse - fees
-
-                if net_profit_reverse > 0:
-                    opportunities.append({
-                        'buy_from': sell_exchange,
-                        'sell_to': buy_exchange,
-                        'buy_price': buy_price_reverse,
-                        'sell_price': sell_price_reverse,
-                        'gross_profit_pct': gross_profit_reverse,
-                        'net_profit_pct': net_profit_reverse
-                    })
-
-    opportunities.sort(key=lambda x: x['net_profit_pct'], reverse=True)
-    return opportunities
+    """Calculate potential arbitrage opportunities, best first"""
+    return find_opportunities(prices, fee_percent)
 
 
 def calculate_spread_data(prices):
@@ -172,6 +115,7 @@ def update_data_loop():
     """Background thread to continuously update data"""
     while True:
         try:
+            started = time.perf_counter()
             prices = fetch_prices()
             opportunities = calculate_arbitrage(prices)
             spread_data = calculate_spread_data(prices)
@@ -183,6 +127,7 @@ def update_data_loop():
                 latest_data['spread_data'] = spread_data
                 latest_data['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 latest_data['iteration'] += 1
+            observe_update_loop('visual', started, len(opportunities))
 
         except Exception as e:
             print(f"Error in update loop: {e}")
@@ -234,6 +179,12 @@ def get_data():
         })
 
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint"""
+    return metrics_response()
+
+
 if __name__ == '__main__':
     print("\n" + "="*60)
     print("🚀 Enhanced Crypto Arbitrage Dashboard")
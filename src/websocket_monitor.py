@@ -6,108 +6,372 @@ Connects to exchange WebSocket APIs for instant price updates with data logging
 
 import asyncio
 import json
-import csv
 import os
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 import websockets
 import aiohttp
 
+try:
+    from tick_recorder import TickRecorder, CSVSink
+    from tick_store import ParquetSink
+    from tick_log import TickLogSink
+    from latency import LatencyTracker
+    from metrics import OPPORTUNITIES, StreamStats, route, start_metrics_server
+    from spread_engine import SpreadEngine
+    from opportunity_journal import OpportunityJournal
+except ImportError:  # imported as src.websocket_monitor
+    from src.tick_recorder import TickRecorder, CSVSink
+    from src.tick_store import ParquetSink
+    from src.tick_log import TickLogSink
+    from src.latency import LatencyTracker
+    from src.metrics import OPPORTUNITIES, StreamStats, route, start_metrics_server
+    from src.spread_engine import SpreadEngine
+    from src.opportunity_journal import OpportunityJournal
 
-class WebSocketPriceMonitor:
-    """Real-time price monitor using WebSocket connections"""
 
-    def __init__(self, symbol='BTC/USDT', data_dir='data'):
-        self.symbol = symbol
+EXCHANGES = ['binance', 'kraken', 'coinbase']
+
+# Public WebSocket endpoints; override per monitor with endpoints={...}
+# (e.g. exchange_simulator.py for local load tests)
+BINANCE_WS_URL = "wss://stream.binance.com:9443/stream"
+KRAKEN_WS_URL = "wss://ws.kraken.com"
+COINBASE_WS_URL = "wss://ws-feed.exchange.coinbase.com"
+
+# Number of recent latency samples kept for percentiles
+LATENCY_WINDOW = 10000
+
+# Seconds to back off after a Kraken/Coinbase connection error
+RECONNECT_DELAY = 5
+
+# Kraken's websocket pair names use legacy asset codes for a few coins
+KRAKEN_ASSET_ALIASES = {'BTC': 'XBT', 'DOGE': 'XDG'}
+
+
+def to_binance_stream(symbol):
+    """BTC/USDT -> btcusdt"""
+    return symbol.replace('/', '').lower()
+
+
+def to_kraken_pair(symbol):
+    """BTC/USDT -> XBT/USDT (Kraken wsname)"""
+    base, quote = symbol.split('/')
+    return f"{KRAKEN_ASSET_ALIASES.get(base, base)}/{KRAKEN_ASSET_ALIASES.get(quote, quote)}"
+
+
+def parse_exchange_time(value):
+    """ISO-8601 exchange timestamp (e.g. Coinbase '2024-01-01T12:00:00.123456Z') -> epoch ns"""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return int(moment.timestamp()) * 1_000_000_000 + moment.microsecond * 1000
+
+
+def to_coinbase_product(symbol):
+    """BTC/USDT -> BTC-USD (Coinbase quotes in USD)"""
+    return symbol.replace('/', '-').replace('USDT', 'USD')
+
+
+def coinbase_product_map(symbols):
+    """
+    Coinbase product -> every symbol it stands for
+
+    BTC/USDT and BTC/USD both become BTC-USD: the product is subscribed once
+    and each of its quotes is fanned out to all of those symbols.
+    """
+    products = {}
+    for symbol in symbols:
+        products.setdefault(to_coinbase_product(symbol), []).append(symbol)
+    for product, shared in products.items():
+        if len(shared) > 1:
+            print(f"⚠️  Coinbase {product} quotes stand in for {', '.join(shared)}")
+    return products
+
+
+class WebSocketPriceMonitor:
+    """
+    Real-time price monitor using WebSocket connections
+
+    All symbols are multiplexed over one connection per exchange (Binance
+    combined streams, one Kraken subscribe for every pair, one Coinbase
+    subscribe for every product), so the socket count stays at three no
+    matter how many symbols are watched.
+    """
+
+    def __init__(self, symbol='BTC/USDT', data_dir='data', symbols=None, fee_percent=0.1,
+                 tick_format='csv', endpoints=None, reconnect_delay=RECONNECT_DELAY):
+        """
+        Initialize the monitor
+
+        Args:
+            symbol: Single symbol to watch (ignored when symbols is given)
+            data_dir: Directory for CSV/JSON logs
+            symbols: List of symbols to watch, e.g. ['BTC/USDT', 'ETH/USDT']
+            fee_percent: Taker fee per trade in percent, used for per-tick evaluation
+            tick_format: 'csv' (prices_*.csv), 'parquet' (data_dir/ticks, needs pyarrow)
+                or 'binary' (fixed-width ticks_*.ticklog, read with tick_log.TickLogReader)
+            endpoints: Override WebSocket URLs per exchange, e.g. {'kraken': 'ws://127.0.0.1:8765/kraken'}
+            reconnect_delay: Seconds to back off after a Kraken/Coinbase connection error
+        """
+        self.tick_format = tick_format
+        self.symbols = list(symbols) if symbols else [symbol]
+        self.symbol = self.symbols[0]
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
 
-        # Convert symbol format for different exchanges
-        self.binance_symbol = symbol.replace('/', '').lower()  # btcusdt
-        self.kraken_symbol = symbol.replace('/', '').upper()   # BTCUSDT
+        # Exchange-specific names -> our symbol, for routing incoming messages
+        self.binance_streams = {to_binance_stream(s): s for s in self.symbols}
+        self.kraken_pairs = {to_kraken_pair(s): s for s in self.symbols}
+        self.coinbase_products = coinbase_product_map(self.symbols)
 
-        # Storage for latest prices
-        self.prices = {
-            'binance': None,
-            'kraken': None,
-            'coinbase': None
-        }
+        self.endpoints = {'binance': BINANCE_WS_URL, 'kraken': KRAKEN_WS_URL, 'coinbase': COINBASE_WS_URL}
+        self.endpoints.update(endpoints or {})
+        self.reconnect_delay = reconnect_delay
+
+        # Latest quote per (symbol, exchange)
+        self.quotes = {s: {exchange: None for exchange in EXCHANGES} for s in self.symbols}
+
+        # Quotes for the first symbol, kept for single-symbol callers
+        self.prices = self.quotes[self.symbol]
+
+        # Open opportunities keyed by (symbol, buy exchange, sell exchange)
+        self.fee_percent = fee_percent
+        self.active_opportunities = {}
+
+        # Vectorized (symbol x exchange) evaluation for full scans
+        self.spread = SpreadEngine(self.symbols, EXCHANGES, fee_percent)
+        self.opportunities_detected = 0
+
+        # Tick receipt -> evaluation done / opportunity emitted, in microseconds
+        self.evaluation_latencies_us = deque(maxlen=LATENCY_WINDOW)
+        self.detection_latencies_us = deque(maxlen=LATENCY_WINDOW)
+
+        # Per-exchange network/decode/evaluation histograms, queryable at runtime
+        self.latency = LatencyTracker()
+
+        # Prometheus message rate/gap metrics per exchange
+        self.stream_stats = StreamStats('ticker')
+
+        # Wall clock for quote/log timestamps; tick_replay swaps in a simulated clock
+        self.now = datetime.now
+        self.time_ns = time.time_ns
+
+        # Called with each newly opened opportunity after it is journaled
+        self.opportunity_callbacks = []
 
         # Initialize CSV loggers
         self.setup_logging()
 
     def setup_logging(self):
         """Set up CSV and JSON logging files"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-
-        # CSV file for price data
-        self.csv_file = self.data_dir / f'prices_{timestamp}.csv'
-        self.csv_headers = ['timestamp', 'exchange', 'bid', 'ask', 'last', 'volume']
-
-        with open(self.csv_file, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=self.csv_headers)
-            writer.writeheader()
-
-        # JSON file for arbitrage opportunities
-        self.json_file = self.data_dir / f'arbitrage_{timestamp}.json'
-        self.opportunities_log = []
+        # Price ticks are queued and written in batches by a background recorder
+        self.csv_headers = ['timestamp', 'symbol', 'exchange', 'bid', 'ask', 'last', 'volume']
+        if self.tick_format == 'parquet':
+            # Columnar store partitioned by day and pair; read back with tick_store.read_ticks()
+            tick_dir = self.data_dir / 'ticks'
+            self.tick_recorder = TickRecorder(tick_dir, prefix='ticks', sink=ParquetSink(tick_dir))
+        elif self.tick_format == 'binary':
+            # Fixed-width records that readers memory-map while they are being written
+            self.tick_recorder = TickRecorder(self.data_dir, prefix='ticks', sink=TickLogSink())
+        else:
+            self.tick_recorder = TickRecorder(self.data_dir, prefix='prices', sink=CSVSink(self.csv_headers))
+
+        # Append-only JSONL journal for arbitrage opportunities (recent ones kept in memory)
+        self.journal = OpportunityJournal(self.data_dir, prefix='arbitrage')
 
         print(f"📁 Logging prices to: {self.csv_file}")
         print(f"📁 Logging arbitrage to: {self.json_file}")
 
-    def log_price(self, exchange, bid, ask, last, volume=0):
-        """Log price data to CSV file"""
-        try:
-            with open(self.csv_file, 'a', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=self.csv_headers)
-                writer.writerow({
-                    'timestamp': datetime.now().isoformat(),
-                    'exchange': exchange,
-                    'bid': bid,
-                    'ask': ask,
-                    'last': last,
-                    'volume': volume
-                })
-        except Exception as e:
-            print(f"Error logging price: {e}")
+    @property
+    def csv_file(self):
+        """Tick file currently being written (the dataset directory for Parquet)"""
+        if self.tick_format == 'parquet':
+            return self.tick_recorder.sink.root
+        return self.tick_recorder.path
+
+    @property
+    def json_file(self):
+        """JSONL journal of arbitrage opportunities"""
+        return self.journal.path
+
+    @property
+    def opportunities_log(self):
+        """Most recent opportunities (bounded; read the journal for full history)"""
+        return self.journal.recent
+
+    def log_price(self, exchange, bid, ask, last, volume=0, symbol=None):
+        """Queue price data for the CSV recorder (never blocks on disk)"""
+        self.tick_recorder.record({
+            'timestamp_ns': self.time_ns(),
+            'timestamp': self.now().isoformat(),
+            'symbol': symbol or self.symbol,
+            'exchange': exchange,
+            'bid': bid,
+            'ask': ask,
+            'last': last,
+            'volume': volume
+        })
 
     def log_arbitrage(self, opportunity):
-        """Log arbitrage opportunity to JSON file"""
-        try:
-            opportunity['timestamp'] = datetime.now().isoformat()
-            self.opportunities_log.append(opportunity)
+        """Append arbitrage opportunity to the JSONL journal"""
+        opportunity['timestamp'] = self.now().isoformat()
+        self.journal.append(opportunity)
+        for callback in self.opportunity_callbacks:
+            callback(opportunity)
+
+    def update_quote(self, symbol, exchange, bid, ask, last, volume=0, received_ns=None,
+                     exchange_ns=None, decoded_ns=None):
+        """
+        Store the latest quote for a (symbol, exchange), log it and evaluate
+        the arbitrage pairs it affects
+
+        Args:
+            received_ns: time.perf_counter_ns() when the message was received
+            exchange_ns: Exchange event time in epoch ns, if the feed provides one
+            decoded_ns: time.perf_counter_ns() when the message was parsed
+        """
+        if received_ns is None:
+            received_ns = time.perf_counter_ns()
+        if decoded_ns is None:
+            decoded_ns = received_ns
+
+        quote = self.quotes[symbol][exchange] = {
+            'bid': bid,
+            'ask': ask,
+            'last': last,
+            'volume': volume,
+            'timestamp': self.now(),
+            'exchange_ns': exchange_ns,
+            'received_ns': received_ns,
+            'decoded_ns': decoded_ns,
+        }
 
-            with open(self.json_file, 'w') as f:
-                json.dump(self.opportunities_log, f, indent=2)
-        except Exception as e:
-            print(f"Error logging arbitrage: {e}")
+        self.evaluate_quote(symbol, exchange, received_ns)
+        quote['evaluated_ns'] = evaluated_ns = time.perf_counter_ns()
+        self.latency.record(exchange, exchange_ns, received_ns, decoded_ns, evaluated_ns)
+        self.stream_stats.message(exchange, received_ns)
+        self.log_price(exchange, bid, ask, last, volume, symbol=symbol)
+
+    def evaluate_quote(self, symbol, exchange, received_ns):
+        """Evaluate both directions of every pair that includes the exchange that just updated"""
+        quotes = self.quotes[symbol]
+        updated = quotes[exchange]
+        new_opportunities = []
+
+        for other, other_quote in quotes.items():
+            if other == exchange or other_quote is None:
+                continue
+            for opportunity in (self._check_pair(symbol, exchange, updated, other, other_quote, received_ns),
+                                self._check_pair(symbol, other, other_quote, exchange, updated, received_ns)):
+                if opportunity:
+                    new_opportunities.append(opportunity)
+
+        self.evaluation_latencies_us.append((time.perf_counter_ns() - received_ns) / 1000)
+
+        # File I/O only after every pair has been evaluated
+        for opportunity in new_opportunities:
+            self.log_arbitrage(dict(opportunity))
+
+    def _check_pair(self, symbol, buy_exchange, buy_quote, sell_exchange, sell_quote, received_ns):
+        """
+        Open, refresh or close the opportunity for buying on one exchange and selling on another
+
+        Returns:
+            The opportunity if it just opened, else None
+        """
+        key = (symbol, buy_exchange, sell_exchange)
+        buy_price = buy_quote['ask']
+        sell_price = sell_quote['bid']
+
+        if buy_price <= 0 or sell_price <= 0:
+            self.active_opportunities.pop(key, None)
+            return None
+
+        gross_profit = ((sell_price - buy_price) / buy_price) * 100
+        net_profit = gross_profit - self.fee_percent * 2  # Buy fee + sell fee
+
+        if net_profit <= 0:
+            self.active_opportunities.pop(key, None)
+            return None
+
+        opportunity = {
+            'symbol': symbol,
+            'buy_from': buy_exchange,
+            'sell_to': sell_exchange,
+            'buy_price': buy_price,
+            'sell_price': sell_price,
+            'gross_profit_pct': gross_profit,
+            'net_profit_pct': net_profit
+        }
+
+        # Still open from an earlier tick: refresh prices, don't re-emit
+        if key in self.active_opportunities:
+            self.active_opportunities[key].update(opportunity)
+            return None
+
+        latency_us = (time.perf_counter_ns() - received_ns) / 1000
+        opportunity['detection_latency_us'] = latency_us
+
+        self.active_opportunities[key] = opportunity
+        self.opportunities_detected += 1
+        OPPORTUNITIES.labels(symbol=symbol, route=route(buy_exchange, sell_exchange)).inc()
+        self.detection_latencies_us.append(latency_us)
+        return opportunity
+
+    def latency_stats(self):
+        """p50/p99/max of evaluation and detection latency in microseconds"""
+        stats = {}
+
+        for name, samples in [('evaluation', self.evaluation_latencies_us),
+                              ('detection', self.detection_latencies_us)]:
+            values = sorted(samples)
+            if not values:
+                stats[name] = None
+                continue
+            stats[name] = {
+                'count': len(values),
+                'p50_us': values[len(values) // 2],
+                'p99_us': values[min(len(values) - 1, int(len(values) * 0.99))],
+                'max_us': values[-1],
+            }
+
+        return stats
 
     async def connect_binance(self):
-        """Connect to Binance WebSocket stream"""
-        uri = f"wss://stream.binance.com:9443/ws/{self.binance_symbol}@ticker"
+        """Connect to Binance combined WebSocket stream for all symbols"""
+        streams = '/'.join(f"{stream}@ticker" for stream in self.binance_streams)
+        uri = f"{self.endpoints['binance']}?streams={streams}"
 
         try:
             async with websockets.connect(uri) as websocket:
-                print(f"✅ Connected to Binance WebSocket")
+                print(f"✅ Connected to Binance WebSocket ({len(self.binance_streams)} streams)")
 
                 while True:
                     msg = await websocket.recv()
-                    data = json.loads(msg)
-
-                    bid = float(data['b'])
-                    ask = float(data['a'])
-                    last = float(data['c'])
-                    volume = float(data['v'])
-
-                    self.prices['binance'] = {
-                        'bid': bid,
-                        'ask': ask,
-                        'last': last,
-                        'volume': volume,
-                        'timestamp': datetime.now()
-                    }
-
-                    self.log_price('binance', bid, ask, last, volume)
+                    received_ns = time.perf_counter_ns()
+                    message = json.loads(msg)
+
+                    # Combined streams wrap each payload: {"stream": "btcusdt@ticker", "data": {...}}
+                    symbol = self.binance_streams.get(message.get('stream', '').split('@')[0])
+                    data = message.get('data')
+                    if symbol is None or not data:
+                        continue
+
+                    self.update_quote(
+                        symbol, 'binance',
+                        bid=float(data['b']),
+                        ask=float(data['a']),
+                        last=float(data['c']),
+                        volume=float(data['v']),
+                        received_ns=received_ns,
+                        exchange_ns=data['E'] * 1_000_000 if 'E' in data else None,  # Event time (ms)
+                        decoded_ns=time.perf_counter_ns()
+                    )
 
         except Exception as e:
             error_msg = str(e)
@@ -120,142 +384,119 @@ class WebSocketPriceMonitor:
             return
 
     async def connect_kraken(self):
-        """Connect to Kraken WebSocket stream"""
-        uri = "wss://ws.kraken.com"
+        """Connect to Kraken WebSocket stream for all symbols"""
+        uri = self.endpoints['kraken']
 
         try:
             async with websockets.connect(uri) as websocket:
-                # Subscribe to ticker
+                # Subscribe to ticker for every pair at once
                 subscribe_msg = {
                     "event": "subscribe",
-                    "pair": [self.kraken_symbol],
+                    "pair": list(self.kraken_pairs),
                     "subscription": {"name": "ticker"}
                 }
                 await websocket.send(json.dumps(subscribe_msg))
-                print(f"✅ Connected to Kraken WebSocket")
+                print(f"✅ Connected to Kraken WebSocket ({len(self.kraken_pairs)} pairs)")
 
                 while True:
                     msg = await websocket.recv()
+                    received_ns = time.perf_counter_ns()
                     data = json.loads(msg)
 
-                    # Kraken sends various message types
-                    if isinstance(data, list) and len(data) >= 2:
+                    # Ticker updates: [channelID, {ticker}, "ticker", "XBT/USDT"]
+                    if isinstance(data, list) and len(data) >= 4:
                         ticker_data = data[1]
-                        if isinstance(ticker_data, dict) and 'b' in ticker_data:
-                            bid = float(ticker_data['b'][0])
-                            ask = float(ticker_data['a'][0])
-                            last = float(ticker_data['c'][0])
-                            volume = float(ticker_data['v'][1])  # 24h volume
-
-                            self.prices['kraken'] = {
-                                'bid': bid,
-                                'ask': ask,
-                                'last': last,
-                                'volume': volume,
-                                'timestamp': datetime.now()
-                            }
-
-                            self.log_price('kraken', bid, ask, last, volume)
+                        symbol = self.kraken_pairs.get(data[3])
+                        if symbol and isinstance(ticker_data, dict) and 'b' in ticker_data:
+                            self.update_quote(
+                                symbol, 'kraken',
+                                bid=float(ticker_data['b'][0]),
+                                ask=float(ticker_data['a'][0]),
+                                last=float(ticker_data['c'][0]),
+                                volume=float(ticker_data['v'][1]),  # 24h volume
+                                received_ns=received_ns,
+                                decoded_ns=time.perf_counter_ns()  # Kraken tickers carry no event time
+                            )
 
         except Exception as e:
             print(f"❌ Kraken WebSocket error: {e}")
-            await asyncio.sleep(5)
+            await asyncio.sleep(self.reconnect_delay)
 
     async def connect_coinbase(self):
-        """Connect to Coinbase WebSocket stream"""
-        uri = "wss://ws-feed.exchange.coinbase.com"
-
-        # Coinbase uses BTC-USD format
-        product_id = self.symbol.replace('/', '-').replace('USDT', 'USD')
+        """Connect to Coinbase WebSocket stream for all symbols"""
+        uri = self.endpoints['coinbase']
 
         try:
             async with websockets.connect(uri) as websocket:
-                # Subscribe to ticker
+                # Subscribe to ticker for every product at once (Coinbase uses BTC-USD format)
                 subscribe_msg = {
                     "type": "subscribe",
-                    "product_ids": [product_id],
+                    "product_ids": list(self.coinbase_products),
                     "channels": ["ticker"]
                 }
                 await websocket.send(json.dumps(subscribe_msg))
-                print(f"✅ Connected to Coinbase WebSocket")
+                print(f"✅ Connected to Coinbase WebSocket ({len(self.coinbase_products)} products)")
 
                 while True:
                     msg = await websocket.recv()
+                    received_ns = time.perf_counter_ns()
                     data = json.loads(msg)
 
                     if data.get('type') == 'ticker':
+                        symbols = self.coinbase_products.get(data.get('product_id'))
+                        if not symbols:
+                            continue
+
                         bid = float(data.get('best_bid', 0))
                         ask = float(data.get('best_ask', 0))
                         last = float(data.get('price', 0))
                         volume = float(data.get('volume_24h', 0))
-
-                        self.prices['coinbase'] = {
-                            'bid': bid,
-                            'ask': ask,
-                            'last': last,
-                            'volume': volume,
-                            'timestamp': datetime.now()
-                        }
-
-                        self.log_price('coinbase', bid, ask, last, volume)
+                        exchange_ns = parse_exchange_time(data.get('time'))
+                        decoded_ns = time.perf_counter_ns()
+                        for symbol in symbols:
+                            self.update_quote(symbol, 'coinbase', bid=bid, ask=ask, last=last, volume=volume,
+                                              received_ns=received_ns, exchange_ns=exchange_ns,
+                                              decoded_ns=decoded_ns)
 
         except Exception as e:
             print(f"❌ Coinbase WebSocket error: {e}")
-            await asyncio.sleep(5)
-
-    def calculate_arbitrage(self, fee_percent=0.1):
-        """Calculate potential arbitrage opportunities"""
-        opportunities = []
-
-        # Only calculate if we have data from all exchanges
-        if not all(self.prices.values()):
-            return opportunities
-
-        exchange_names = list(self.prices.keys())
-
-        for i, buy_exchange in enumerate(exchange_names):
-            for sell_exchange in exchange_names[i+1:]:
-                buy_data = self.prices[buy_exchange]
-                sell_data = self.prices[sell_exchange]
-
-                if buy_data and sell_data:
-                    buy_price = buy_data['ask']
-                    sell_price = sell_data['bid']
-
-                    # Calculate profit percentage after fees
-                    gross_profit = ((sell_price - buy_price) / buy_price) * 100
-                    fees = fee_percent * 2  # Buy fee + sell fee
-                    net_profit = gross_profit - fees
-
-                    if net_profit > 0:
-                        opportunity = {
-                            'buy_from': buy_exchange,
-                            'sell_to': sell_exchange,
-                            'buy_price': buy_price,
-                            'sell_price': sell_price,
-                            'gross_profit_pct': gross_profit,
-                            'net_profit_pct': net_profit
-                        }
-                        opportunities.append(opportunity)
-                        self.log_arbitrage(opportunity)
+            await asyncio.sleep(self.reconnect_delay)
+
+    def calculate_arbitrage(self, fee_percent=0.1, symbol=None):
+        """
+        Calculate potential arbitrage opportunities across every quoted exchange, best first
+
+        Args:
+            fee_percent: Taker fee per trade in percent
+            symbol: Only evaluate this symbol (default: every watched symbol)
+        """
+        exchanges = list(dict.fromkeys(exchange for prices in self.quotes.values() for exchange in prices))
+        if exchanges != self.spread.exchanges:
+            self.spread = SpreadEngine(self.symbols, exchanges, self.fee_percent)
+        self.spread.load(self.quotes)
+        opportunities = self.spread.opportunities(fees=fee_percent, symbol=symbol)
+
+        for opportunity in opportunities:
+            self.log_arbitrage(opportunity)
 
         return opportunities
 
     def display_prices(self):
         """Display current prices from all exchanges"""
-        print("\n" + "="*80)
-        print(f"Real-time Prices for {self.symbol} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*80)
-        print(f"{'Exchange':<15} {'Bid':<12} {'Ask':<12} {'Last':<12} {'Volume':<15}")
-        print("-"*80)
-
-        for exchange, data in self.prices.items():
-            if data:
-                age = (datetime.now() - data['timestamp']).total_seconds()
-                freshness = "🟢" if age < 5 else "🟡" if age < 30 else "🔴"
-                print(f"{exchange.capitalize():<15} ${data['bid']:<11.2f} ${data['ask']:<11.2f} ${data['last']:<11.2f} {data['volume']:<14.2f} {freshness}")
-            else:
-                print(f"{exchange.capitalize():<15} {'WAITING...':>12}")
+        print("\n" + "="*90)
+        print(f"Real-time Prices for {len(self.symbols)} symbol(s) at {self.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("="*90)
+        print(f"{'Symbol':<12} {'Exchange':<15} {'Bid':<12} {'Ask':<12} {'Last':<12} {'Volume':<15}")
+        print("-"*90)
+
+        for symbol in self.symbols:
+            for exchange, data in self.quotes[symbol].items():
+                if data:
+                    age = (self.now() - data['timestamp']).total_seconds()
+                    freshness = "🟢" if age < 5 else "🟡" if age < 30 else "🔴"
+                    print(f"{symbol:<12} {exchange.capitalize():<15} ${data['bid']:<11.2f} ${data['ask']:<11.2f} ${data['last']:<11.2f} {data['volume']:<14.2f} {freshness}")
+                else:
+                    print(f"{symbol:<12} {exchange.capitalize():<15} {'WAITING...':>12}")
 
     def display_opportunities(self, opportunities):
         """Display arbitrage opportunities"""
@@ -268,27 +509,54 @@ class WebSocketPriceMonitor:
         print("="*80)
 
         for i, opp in enumerate(opportunities, 1):
-            print(f"\nOpportunity #{i}:")
+            print(f"\nOpportunity #{i}: {opp['symbol']}")
             print(f"  Buy from:  {opp['buy_from']:<15} @ ${opp['buy_price']:.2f}")
             print(f"  Sell to:   {opp['sell_to']:<15} @ ${opp['sell_price']:.2f}")
             print(f"  Gross Profit: {opp['gross_profit_pct']:.3f}%")
             print(f"  Net Profit:   {opp['net_profit_pct']:.3f}%")
+            if 'detection_latency_us' in opp:
+                print(f"  Detected in:  {opp['detection_latency_us']:.0f}µs after tick receipt")
+
+    def display_latency(self):
+        """Display tick-to-evaluation and tick-to-detection latency"""
+        stats = self.latency_stats()
+
+        print(f"\nLatency (tick receipt → ...)   {self.opportunities_detected} opportunities detected")
+        for name, values in stats.items():
+            if values:
+                print(f"  {name.capitalize():<12} p50 {values['p50_us']:>8.1f}µs   p99 {values['p99_us']:>8.1f}µs   "
+                      f"max {values['max_us']:>8.1f}µs   ({values['count']} samples)")
+            else:
+                print(f"  {name.capitalize():<12} no samples yet")
+
+        self.latency.display()
+
+        recorder = self.tick_recorder.stats()
+        print(f"  Ticks written {recorder['written']:,}, queued {recorder['queued']:,}, "
+              f"dropped {recorder['dropped']:,} → {self.csv_file}")
+
+    async def monitor_and_display(self, interval=1):
+        """
+        Periodically display prices and open opportunities
 
-    async def monitor_and_display(self, interval=5):
-        """Periodically display prices and calculate arbitrage"""
+        Arbitrage is evaluated on every tick in update_quote(); this task only
+        renders, at most once per interval, so it never delays detection.
+        """
         await asyncio.sleep(3)  # Wait for initial data
 
         while True:
             self.display_prices()
-            opportunities = self.calculate_arbitrage()
+            opportunities = sorted(self.active_opportunities.values(),
+                                   key=lambda x: x['net_profit_pct'], reverse=True)
             self.display_opportunities(opportunities)
+            self.display_latency()
             await asyncio.sleep(interval)
 
     async def run(self):
         """Start all WebSocket connections and monitoring"""
         print("🤖 Crypto Arbitrage Bot - WebSocket Monitor")
         print("="*80)
-        print(f"Monitoring {self.symbol} in real-time")
+        print(f"Monitoring {', '.join(self.symbols)} in real-time")
         print("Press Ctrl+C to stop\n")
 
         # Start all connections concurrently
@@ -307,11 +575,15 @@ class WebSocketPriceMonitor:
             print(f"  - {self.csv_file}")
             print(f"  - {self.json_file}")
             print("Thanks for using the Crypto Arbitrage Bot!")
+        finally:
+            self.tick_recorder.close()
+            self.journal.close()
 
 
 async def main():
     """Main entry point"""
-    monitor = WebSocketPriceMonitor(symbol='BTC/USDT', data_dir='data')
+    start_metrics_server()
+    monitor = WebSocketPriceMonitor(symbols=['BTC/USDT', 'ETH/USDT', 'SOL/USDT'], data_dir='data')
     await monitor.run()
 
 
@@ -48,16 +48,18 @@ def test_multiple_tokens():
 
     print(f"\nFetching {len(tokens)} tokens...")
 
+    # One batched request for all tokens
+    prices = monitor.fetch_multiple_tokens(list(tokens.values()))
+
     results = {}
     for name, address in tokens.items():
         print(f"\n[{name}] {address}")
-        data = monitor.fetch_token_price_dexscreener(address)
+        data = prices.get(address)
         if data:
             results[name] = data
             print(f"  ✓ ${data['price_usd']:.8f} | 24h Vol: ${data['volume_24h']:,.0f}")
         else:
             print(f"  ✗ Not found")
-        time.sleep(1)  # Rate limiting
 
     print(f"\n✅ Test passed: Fetched {len(results)}/{len(tokens)} tokens")
     return len(results) > 0
@@ -0,0 +1,90 @@
+"""Tests for the vectorized backtester: evaluate_grid and Backtester.run against a per-tick loop"""
+
+import numpy as np
+import pytest
+
+from src.backtester import CELL_BYTES, CHUNK_BYTES, Backtester, TRADE_SIZE_USD, chunk_rows, evaluate_grid, parameter_grid
+from src.tick_log import TICK_DTYPE
+
+
+EXCHANGES = ['binance', 'kraken', 'coinbase']
+SYMBOLS = ['BTC/USDT', 'ETH/USDT']
+PARAMS = parameter_grid(fees=[0.0, 0.05, 0.1], min_profits=[0.0, 0.1, 0.3], alert_thresholds=[0.2, 0.5])
+
+
+def _records(rng, n=3000):
+    """Random walk quotes with occasional cross-exchange dislocations and repeated timestamps"""
+    records = np.zeros(n, dtype=TICK_DTYPE)
+    records['timestamp'] = np.cumsum(rng.integers(0, 400_000_000, n)) + 1_700_000_000 * 10**9
+    records['exchange'] = rng.integers(0, len(EXCHANGES), n)
+    records['symbol'] = rng.integers(0, len(SYMBOLS), n)
+    mid = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.0005, n))) * (1 + rng.normal(0, 0.003, n))
+    records['bid'] = mid * 0.9999
+    records['ask'] = mid * 1.0001
+    records['bid'][rng.random(n) < 0.02] = 0.0   # Missing quotes
+    return records
+
+
+def _per_tick(gross, dt, params):
+    """Reference: walk the timeline one row at a time, as the live monitor does"""
+    totals = [dict(opportunities=0, alerts=0, open_seconds=0.0, net_pct_sum=0.0, best_net_pct=-np.inf)
+              for _ in params]
+    for total, p in zip(totals, params):
+        fee_cost = 2 * p['fee_percent']
+        was_open = [False] * gross.shape[1]
+        for t in range(len(gross)):
+            for pair in range(gross.shape[1]):
+                profit = gross[t, pair]
+                is_open = not np.isnan(profit) and profit - fee_cost > p['min_profit']
+                if is_open and not was_open[pair]:
+                    total['opportunities'] += 1
+                    total['alerts'] += profit - fee_cost >= p['alert_threshold']
+                    total['net_pct_sum'] += profit - fee_cost
+                    total['best_net_pct'] = max(total['best_net_pct'], profit - fee_cost)
+                if is_open:
+                    total['open_seconds'] += dt[t]
+                was_open[pair] = is_open
+    return totals
+
+
+@pytest.fixture(scope='module')
+def backtester():
+    return Backtester(_records(np.random.default_rng(7)), EXCHANGES, SYMBOLS)
+
+
+@pytest.mark.parametrize('chunk_bytes', [1, 5_000, 10**9])
+def test_evaluate_grid_matches_per_tick_loop(backtester, chunk_bytes):
+    for gross, dt in backtester.series.values():
+        totals = evaluate_grid(gross, dt, PARAMS, chunk_bytes=chunk_bytes)
+        for i, expected in enumerate(_per_tick(gross, dt, PARAMS)):
+            assert totals['opportunities'][i] == expected['opportunities']
+            assert totals['alerts'][i] == expected['alerts']
+            assert totals['open_seconds'][i] == pytest.approx(expected['open_seconds'])
+            assert totals['net_pct_sum'][i] == pytest.approx(expected['net_pct_sum'])
+            assert totals['best_net_pct'][i] == pytest.approx(expected['best_net_pct'])
+
+
+def test_run_matches_per_tick_loop(backtester):
+    expected = [dict(opportunities=0, alerts=0, open_seconds=0.0, pnl_usd=0.0) for _ in PARAMS]
+    for gross, dt in backtester.series.values():
+        for total, reference in zip(expected, _per_tick(gross, dt, PARAMS)):
+            total['opportunities'] += reference['opportunities']
+            total['alerts'] += reference['alerts']
+            total['open_seconds'] += reference['open_seconds']
+            total['pnl_usd'] += reference['net_pct_sum'] / 100 * TRADE_SIZE_USD
+
+    results = backtester.run(PARAMS, workers=1)
+    assert sum(r['opportunities'] for r in results) > 0
+    for result, total in zip(results, expected):
+        assert result['opportunities'] == total['opportunities']
+        assert result['alerts'] == total['alerts']
+        assert result['open_seconds'] == pytest.approx(total['open_seconds'])
+        assert result['pnl_usd'] == pytest.approx(total['pnl_usd'])
+
+
+def test_chunk_rows_follow_the_byte_budget():
+    assert chunk_rows(6, 18, chunk_bytes=1) == 1
+    for pairs, param_sets in ((6, 18), (60, 180), (600, 1800)):
+        rows = chunk_rows(pairs, param_sets)
+        assert rows * pairs * param_sets * CELL_BYTES <= CHUNK_BYTES
+        assert (rows + 1) * pairs * param_sets * CELL_BYTES > CHUNK_BYTES
@@ -0,0 +1,137 @@
+"""Tests for depth-aware arbitrage: evaluate_books against a level-by-level walk"""
+
+import numpy as np
+import pytest
+
+from src.depth_arbitrage import evaluate_books
+from src.order_book import OrderBook
+
+
+def _random_book(rng, mid):
+    """Book with its own depth per side (possibly a single level) around mid"""
+    def side(sign, levels):
+        prices = mid * (1 + sign * (0.0005 + np.cumsum(rng.uniform(0.0001, 0.002, levels))))
+        return [[float(p), float(s)] for p, s in zip(prices, rng.uniform(0.01, 2.0, levels))]
+
+    return {'bids': side(-1, int(rng.integers(1, 30))), 'asks': side(1, int(rng.integers(1, 30)))}
+
+
+def _walk(asks, bids, buy_fee, sell_fee, max_notional=None):
+    """Reference: take the buy exchange's asks and the sell exchange's bids one level at a time"""
+    asks = [list(level) for level in asks]
+    bids = [list(level) for level in bids]
+    filled = spent = bought = sold = pnl = 0.0
+    i = j = 0
+    while i < len(asks) and j < len(bids):
+        (ask, ask_size), (bid, bid_size) = asks[i], bids[j]
+        buy_cost = ask * (1 + buy_fee)
+        margin = bid * (1 - sell_fee) - buy_cost
+        if margin <= 0:
+            break
+
+        quantity = min(ask_size, bid_size)
+        if max_notional is not None and spent + quantity * buy_cost > max_notional:
+            quantity = (max_notional - spent) / buy_cost
+            if quantity <= 0:
+                break
+            filled, spent, bought, sold, pnl = (filled + quantity, spent + quantity * buy_cost,
+                                                bought + quantity * ask, sold + quantity * bid, pnl + quantity * margin)
+            break
+
+        filled += quantity
+        spent += quantity * buy_cost
+        bought += quantity * ask
+        sold += quantity * bid
+        pnl += quantity * margin
+        asks[i][1] -= quantity
+        bids[j][1] -= quantity
+        if asks[i][1] <= 1e-15:
+            i += 1
+        if bids[j][1] <= 1e-15:
+            j += 1
+
+    return filled, spent, bought, sold, pnl
+
+
+def _reference(books, fees, max_notional=None):
+    routes = {}
+    for buy, buy_book in books.items():
+        for sell, sell_book in books.items():
+            if buy == sell:
+                continue
+            filled, spent, bought, sold, pnl = _walk(buy_book['asks'], sell_book['bids'],
+                                                     fees[buy] / 100, fees[sell] / 100, max_notional)
+            if filled > 0 and pnl > 0:
+                routes[(buy, sell)] = {'quantity': filled, 'cost_usd': spent, 'pnl_usd': pnl,
+                                       'avg_buy_price': bought / filled, 'avg_sell_price': sold / filled}
+    return routes
+
+
+@pytest.mark.parametrize('seed', range(25))
+@pytest.mark.parametrize('max_notional', [None, 5.0, 60.0])
+def test_matches_level_walk(seed, max_notional):
+    rng = np.random.default_rng(seed)
+    names = [f"venue{i}" for i in range(int(rng.integers(2, 6)))]
+    books = {name: _random_book(rng, 100 * (1 + rng.normal(0, 0.004))) for name in names}
+    fees = {name: float(rng.choice([0.0, 0.05, 0.1])) for name in names}
+
+    routes = evaluate_books(books, fees, max_notional=max_notional, symbol='TEST/USDT')
+    expected = _reference(books, fees, max_notional)
+
+    assert {(r['buy_from'], r['sell_to']) for r in routes} == set(expected)
+    for route in routes:
+        reference = expected[(route['buy_from'], route['sell_to'])]
+        assert route['symbol'] == 'TEST/USDT'
+        for key, value in reference.items():
+            assert route[key] == pytest.approx(value, rel=1e-9, abs=1e-9), key
+        if max_notional is not None:
+            assert route['cost_usd'] <= max_notional * (1 + 1e-12)
+
+    pnl = [route['pnl_usd'] for route in routes]
+    assert pnl == sorted(pnl, reverse=True)
+
+
+def test_partial_fill_stops_inside_a_level():
+    books = {
+        'cheap': {'bids': [[99.0, 10.0]], 'asks': [[100.0, 1.0], [100.5, 1.0]]},
+        'rich': {'bids': [[102.0, 5.0]], 'asks': [[103.0, 5.0]]},
+    }
+    route = evaluate_books(books, 0.0, max_notional=150.0)[0]
+
+    # 1.0 at 100 plus 50 / 100.5 of the second level
+    assert (route['buy_from'], route['sell_to']) == ('cheap', 'rich')
+    assert route['quantity'] == pytest.approx(1 + 50 / 100.5)
+    assert route['cost_usd'] == pytest.approx(150.0)
+    assert route['worst_buy_price'] == 100.5
+    assert route['pnl_usd'] == pytest.approx(2.0 + 50 / 100.5 * 1.5)
+
+
+def test_uneven_ladders_and_missing_books():
+    books = {
+        'one_level': {'bids': [[101.0, 0.5]], 'asks': [[101.5, 0.5]]},
+        'deep': {'bids': [[99.0 - i * 0.1, 1.0] for i in range(40)],
+                 'asks': [[100.0 + i * 0.1, 1.0] for i in range(40)]},
+        'offline': None,
+        'empty': {'bids': [], 'asks': []},
+    }
+    routes = evaluate_books(books, 0.0)
+
+    assert [(r['buy_from'], r['sell_to']) for r in routes] == [('deep', 'one_level')]
+    assert routes[0]['quantity'] == pytest.approx(0.5)
+    assert routes[0]['pnl_usd'] == pytest.approx(0.5)
+
+
+def test_accepts_order_book_objects():
+    cheap = OrderBook('BTC/USDT', 'cheap')
+    cheap.load_snapshot([[99.0, 1.0]], [[100.0, 2.0], [100.2, 1.0]])
+    rich = OrderBook('BTC/USDT', 'rich')
+    rich.load_snapshot([[100.4, 1.5], [100.1, 3.0]], [[100.6, 1.0]])
+
+    routes = evaluate_books({'cheap': cheap, 'rich': rich}, 0.0)
+    expected = _reference({'cheap': {'asks': [[100.0, 2.0], [100.2, 1.0]], 'bids': [[99.0, 1.0]]},
+                           'rich': {'asks': [[100.6, 1.0]], 'bids': [[100.4, 1.5], [100.1, 3.0]]}},
+                          {'cheap': 0.0, 'rich': 0.0})
+
+    assert len(routes) == 1
+    assert routes[0]['quantity'] == pytest.approx(expected[('cheap', 'rich')]['quantity'])
+    assert routes[0]['pnl_usd'] == pytest.approx(expected[('cheap', 'rich')]['pnl_usd'])
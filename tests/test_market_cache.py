@@ -0,0 +1,29 @@
+"""Tests for the market cache's background refresh client"""
+
+import pytest
+
+from src.market_cache import clone_exchange
+
+
+ccxt = pytest.importorskip('ccxt')
+
+
+def test_clone_keeps_credentials_options_and_sandbox():
+    exchange = ccxt.binance({'apiKey': 'key', 'secret': 'secret', 'enableRateLimit': False, 'timeout': 1234,
+                             'options': {'defaultType': 'future'}})
+    exchange.set_sandbox_mode(True)
+
+    clone = clone_exchange(exchange)
+
+    assert type(clone) is type(exchange) and clone is not exchange
+    assert (clone.apiKey, clone.secret) == ('key', 'secret')
+    assert clone.enableRateLimit is False
+    assert clone.timeout == 1234
+    assert clone.options['defaultType'] == 'future'
+    assert clone.urls == exchange.urls
+    assert clone.urls['api'] != ccxt.binance().urls['api']
+    assert clone.isSandboxModeEnabled
+
+    # Independent copies: the refresh client can't mutate the live one
+    clone.options['defaultType'] = 'spot'
+    assert exchange.options['defaultType'] == 'future'
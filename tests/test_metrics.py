@@ -0,0 +1,37 @@
+"""Tests for the Prometheus metrics module"""
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+from src import metrics as package_metrics
+
+
+SRC = Path(__file__).resolve().parents[1] / 'src'
+
+
+@pytest.fixture
+def flat_metrics(monkeypatch):
+    """The same module imported by its flat name, as the scripts in src/ do"""
+    monkeypatch.syspath_prepend(str(SRC))
+    monkeypatch.delitem(sys.modules, 'metrics', raising=False)
+    return importlib.import_module('metrics')
+
+
+def test_both_import_names_share_collectors(flat_metrics):
+    assert flat_metrics is not package_metrics
+    for name in ('REST_REQUEST_SECONDS', 'REST_ERRORS', 'WS_MESSAGES', 'WS_MESSAGE_GAP_SECONDS',
+                 'WS_LAST_MESSAGE', 'OPPORTUNITIES', 'CURRENT_OPPORTUNITIES', 'ANALYZER_WRITE_SECONDS',
+                 'RATE_LIMIT_WAIT_SECONDS', 'UPDATE_LOOP_SECONDS'):
+        assert getattr(flat_metrics, name) is getattr(package_metrics, name), name
+
+
+def test_reimport_keeps_recording(flat_metrics):
+    if not package_metrics.PROMETHEUS_AVAILABLE:
+        pytest.skip("prometheus_client is not installed")
+
+    flat_metrics.REST_ERRORS.labels(exchange='test-reimport', method='fetch_ticker').inc()
+    output = package_metrics.generate_latest().decode()
+    assert 'arb_rest_errors_total{exchange="test-reimport",method="fetch_ticker"} 1.0' in output
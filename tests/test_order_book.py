@@ -0,0 +1,166 @@
+"""Tests for local order books: Binance update-id sequencing and Kraken checksums"""
+
+import asyncio
+
+from src.order_book import OrderBook, OrderBookMonitor, kraken_checksum
+
+
+# Kraken's documented checksum example (LTC/XBT, 5 price and 8 volume decimals)
+KRAKEN_ASKS = ['0.05005', '0.05010', '0.05015', '0.05020', '0.05025',
+               '0.05030', '0.05035', '0.05040', '0.05045', '0.05050']
+KRAKEN_BIDS = ['0.05000', '0.04995', '0.04990', '0.04980', '0.04975',
+               '0.04970', '0.04965', '0.04960', '0.04955', '0.04950']
+KRAKEN_VOLUME = '0.00000500'
+KRAKEN_CHECKSUM = 974947235
+
+
+class _Response:
+    def __init__(self, payload):
+        self.payload = payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self):
+        return self.payload
+
+
+class _Session:
+    """Stands in for aiohttp.ClientSession, serving depth snapshots in order"""
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.requests = 0
+
+    def get(self, url):
+        self.requests += 1
+        return _Response(self.snapshots.pop(0))
+
+
+def _snapshot(last_update_id, bid='100.0', ask='101.0'):
+    return {'lastUpdateId': last_update_id, 'bids': [[bid, '1.0']], 'asks': [[ask, '1.0']]}
+
+
+def _diff(first, last, bids=(), asks=()):
+    return {'e': 'depthUpdate', 'U': first, 'u': last, 'b': [list(b) for b in bids], 'a': [list(a) for a in asks]}
+
+
+def test_binance_diff_sequencing():
+    monitor = OrderBookMonitor(['BTC/USDT'])
+    book = monitor.books['binance']['BTC/USDT']
+    book.load_snapshot([['100.0', '1.0']], [['101.0', '1.0']], sequence=100)
+
+    # Fully contained in the snapshot: ignored
+    assert monitor._apply_binance_event(book, _diff(95, 100, bids=[('100.0', '9.0')]))
+    assert book.bids.best() == (100.0, 1.0)
+
+    # Straddles the snapshot: applied
+    assert monitor._apply_binance_event(book, _diff(99, 102, bids=[('100.5', '2.0')]))
+    assert book.sequence == 102
+    assert book.best_bid() == 100.5
+
+    # Contiguous, removes a level
+    assert monitor._apply_binance_event(book, _diff(103, 104, bids=[('100.5', '0')]))
+    assert book.sequence == 104
+    assert book.best_bid() == 100.0
+
+    # Gap: rejected and left untouched
+    assert not monitor._apply_binance_event(book, _diff(106, 107, asks=[('100.8', '1.0')]))
+    assert book.sequence == 104
+    assert book.best_ask() == 101.0
+
+
+def test_binance_gap_resyncs_from_a_newer_snapshot():
+    monitor = OrderBookMonitor(['BTC/USDT'])
+    book = monitor.books['binance']['BTC/USDT']
+
+    # Diffs buffered after a gap; the first snapshot predates them, the second overlaps them
+    monitor._binance_buffers['BTC/USDT'] = [
+        _diff(210, 212, bids=[('100.2', '3.0')]),
+        _diff(213, 215, asks=[('100.9', '2.0')]),
+    ]
+    monitor._binance_resyncing.add('BTC/USDT')
+    session = _Session([_snapshot(200), _snapshot(211, bid='99.0')])
+
+    asyncio.run(monitor._resync_binance(session, 'BTC/USDT'))
+
+    assert session.requests == 2
+    assert book.synced
+    assert book.sequence == 215
+    assert book.best_bid() == 100.2
+    assert book.best_ask() == 100.9
+    assert 'BTC/USDT' not in monitor._binance_resyncing
+    assert monitor._binance_buffers['BTC/USDT'] == []
+
+
+def test_kraken_checksum_reference_vector():
+    book = OrderBook('LTC/BTC', 'kraken')
+    book.load_snapshot([[price, KRAKEN_VOLUME] for price in KRAKEN_BIDS],
+                       [[price, KRAKEN_VOLUME] for price in KRAKEN_ASKS])
+
+    assert kraken_checksum(book, 5, 8) == KRAKEN_CHECKSUM
+
+
+def _kraken_snapshot():
+    return [42, {'as': [[price, KRAKEN_VOLUME, '1582905487.684110'] for price in KRAKEN_ASKS],
+                 'bs': [[price, KRAKEN_VOLUME, '1582905487.439814'] for price in KRAKEN_BIDS]},
+            'book-10', 'LTC/XBT']
+
+
+def test_kraken_update_verified_by_checksum():
+    monitor = OrderBookMonitor(['LTC/BTC'])
+    book = monitor.books['kraken']['LTC/BTC']
+    assert monitor._apply_kraken_message(_kraken_snapshot()) is None
+    assert kraken_checksum(book, 5, 8) == KRAKEN_CHECKSUM
+
+    # New best ask; the 11th ask falls off the subscribed depth
+    expected = OrderBook('LTC/BTC', 'kraken')
+    expected.load_snapshot([[price, KRAKEN_VOLUME] for price in KRAKEN_BIDS],
+                           [['0.05004', '0.00100000']] + [[price, KRAKEN_VOLUME] for price in KRAKEN_ASKS[:9]])
+    checksum = str(kraken_checksum(expected, 5, 8))
+
+    update = [42, {'a': [['0.05004', '0.00100000', '1582905490.000000']], 'c': checksum}, 'book-10', 'LTC/XBT']
+    assert monitor._apply_kraken_message(update) is None
+    assert book.synced
+    assert len(book.asks) == 10
+    assert book.best_ask() == 0.05004
+
+
+def test_kraken_checksum_mismatch_requests_resync():
+    monitor = OrderBookMonitor(['LTC/BTC'])
+    book = monitor.books['kraken']['LTC/BTC']
+    monitor._apply_kraken_message(_kraken_snapshot())
+
+    update = [42, {'b': [['0.05001', '0.00100000', '1582905490.000000']], 'c': str(KRAKEN_CHECKSUM)},
+              'book-10', 'LTC/XBT']
+    assert monitor._apply_kraken_message(update) == 'LTC/XBT'
+    assert not book.synced
+    assert book.resyncs == 1
+
+    # Diffs are ignored until a new snapshot arrives
+    assert monitor._apply_kraken_message(update) is None
+    monitor._apply_kraken_message(_kraken_snapshot())
+    assert book.synced
+    assert kraken_checksum(book, 5, 8) == KRAKEN_CHECKSUM
+
+
+def test_coinbase_product_shared_by_two_symbols_updates_both_books():
+    monitor = OrderBookMonitor(['BTC/USDT', 'BTC/USD'])
+    assert monitor.coinbase_products == {'BTC-USD': ['BTC/USDT', 'BTC/USD']}
+
+    monitor._apply_coinbase_message({'type': 'snapshot', 'product_id': 'BTC-USD',
+                                     'bids': [['100.0', '1.0']], 'asks': [['101.0', '1.0']]})
+    monitor._apply_coinbase_message({'type': 'l2update', 'product_id': 'BTC-USD',
+                                     'changes': [['buy', '100.5', '2.0']]})
+
+    for symbol in ('BTC/USDT', 'BTC/USD'):
+        book = monitor.books['coinbase'][symbol]
+        assert book.synced
+        assert book.best_bid() == 100.5
+        assert book.best_ask() == 101.0
@@ -0,0 +1,58 @@
+"""Tests for the memory-mapped binary tick log"""
+
+import numpy as np
+
+from src.tick_log import HEADER_SIZE, TickLogReader, TickLogWriter
+
+
+def _rows(symbols, start_ns=0):
+    return [
+        {'timestamp_ns': start_ns + i, 'exchange': ('binance', 'kraken')[i % 2], 'symbol': symbol,
+         'bid': 100.0 + i, 'ask': 100.5 + i, 'last': 100.25 + i, 'volume': float(i)}
+        for i, symbol in enumerate(symbols)
+    ]
+
+
+def test_header_grows_past_initial_size(tmp_path):
+    path = tmp_path / 'ticks.ticklog'
+    symbols = [f"LONGNAMEDTOKEN{i:04d}/USDT" for i in range(350)]
+
+    writer = TickLogWriter(path)
+    reader = TickLogReader(path)
+    for batch in range(0, len(symbols), 50):
+        writer.write_rows(_rows(symbols[batch:batch + 50], start_ns=batch))
+        writer.flush()
+    # Repeat symbols after the dictionaries grew must reuse their ids
+    writer.write_rows(_rows(symbols[:10], start_ns=len(symbols)))
+    writer.close()
+
+    assert reader.refresh() == len(symbols) + 10
+    assert reader.meta['header_size'] > HEADER_SIZE
+    assert reader.symbols == symbols
+    assert int(reader.records['symbol'].max()) == len(symbols) - 1
+
+    frame = reader.to_pandas()
+    assert list(frame['symbol']) == symbols + symbols[:10]
+    assert list(frame['exchange'][:4]) == ['binance', 'kraken', 'binance', 'kraken']
+    np.testing.assert_array_equal(reader.select(symbol=symbols[300])['timestamp'], [300])
+
+
+def test_reopened_writer_appends_after_grown_header(tmp_path):
+    path = tmp_path / 'ticks.ticklog'
+    first = [f"SYMBOL{i:04d}/USDT" for i in range(400)]
+    second = [f"OTHER{i:04d}/USDT" for i in range(300)]
+
+    writer = TickLogWriter(path)
+    writer.write_rows(_rows(first))
+    writer.close()
+
+    writer = TickLogWriter(path)
+    writer.write_rows(_rows(second, start_ns=len(first)))
+    writer.close()
+
+    reader = TickLogReader(path)
+    assert len(reader) == len(first) + len(second)
+    assert reader.symbols == first + second
+    decoded = [reader.symbols[i] for i in reader.records['symbol']]
+    assert decoded == first + second
+    np.testing.assert_array_equal(reader.records['timestamp'], np.arange(len(first) + len(second)))
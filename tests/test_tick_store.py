@@ -0,0 +1,92 @@
+"""Tests for tick store timestamp normalization"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.tick_store import _to_ns
+
+
+NS = 1_700_000_000_123_456_789   # 2023-11-14T22:13:20.123456789Z
+
+
+@pytest.mark.parametrize('value, expected', [
+    (1_700_000_000, 1_700_000_000_000_000_000),              # seconds
+    (1_700_000_000.5, 1_700_000_000_500_000_000),            # fractional seconds
+    (1_700_000_000_123, 1_700_000_000_123_000_000),          # milliseconds (Binance 'E')
+    (1_700_000_000_123_456, 1_700_000_000_123_456_000),      # microseconds
+    (NS, NS),                                                # nanoseconds
+])
+def test_epoch_units_by_magnitude(value, expected):
+    assert _to_ns(value) == expected
+
+
+def test_datetimes_and_strings():
+    moment = datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+    assert _to_ns(moment) == 1_700_000_000_000_000_000
+    assert _to_ns('2023-11-14T22:13:20+00:00') == 1_700_000_000_000_000_000
+    assert _to_ns(None) is None
+
+
+def test_every_unit_lands_in_the_same_year():
+    years = {datetime.fromtimestamp(_to_ns(value) / 1e9, tz=timezone.utc).year
+             for value in (NS // 10**9, NS // 10**6, NS // 10**3, NS)}
+    assert years == {2023}
+
+
+def _ticks(symbol, exchange, start_ns, count):
+    return [{'timestamp_ns': start_ns + i, 'timestamp': '', 'symbol': symbol, 'exchange': exchange,
+             'bid': 100.0 + i, 'ask': 100.5 + i, 'last': 100.25 + i, 'volume': 1.0} for i in range(count)]
+
+
+def test_store_is_readable_while_a_sink_is_open(tmp_path):
+    pytest.importorskip('pyarrow')
+    from src.tick_store import ParquetSink, read_ticks
+
+    closed = ParquetSink(tmp_path)
+    closed.open(tmp_path / 'ticks_closed.parquet')
+    closed.write(_ticks('ETH/USDT', 'kraken', NS, 5))
+    closed.close()
+
+    live = ParquetSink(tmp_path, row_group_size=4)
+    live.open(tmp_path / 'ticks_live.parquet')
+    live.write(_ticks('BTC/USDT', 'binance', NS, 10))   # Two full row groups already on disk
+    live.flush()
+
+    # The live sink's files are still in progress: skipped, not a crash
+    table = read_ticks(tmp_path)
+    assert table.num_rows == 5
+    assert set(table.column('symbol').to_pylist()) == {'ETH/USDT'}
+
+    # Once its window has passed, a flush makes everything written so far readable
+    live.finalize_interval = 0
+    live.flush()
+    assert read_ticks(tmp_path, symbols=['BTC/USDT']).num_rows == 10
+
+    # Later rows go to a new part file; close finalizes it
+    live.write(_ticks('BTC/USDT', 'binance', NS + 10, 3))
+    assert read_ticks(tmp_path, symbols=['BTC/USDT']).num_rows == 10
+    live.close()
+
+    table = read_ticks(tmp_path, symbols=['BTC/USDT'])
+    assert table.column('timestamp').to_pylist() == [NS + i for i in range(13)]
+    assert not list(tmp_path.rglob('*.inprogress'))
+    assert live.size() > 0
+
+
+def test_recorder_flush_makes_rows_readable(tmp_path):
+    pytest.importorskip('pyarrow')
+    from src.tick_recorder import TickRecorder
+    from src.tick_store import ParquetSink, read_ticks
+
+    recorder = TickRecorder(tmp_path, prefix='ticks', sink=ParquetSink(tmp_path, finalize_interval=0),
+                            flush_interval=0.01, rotate_hourly=False)
+    try:
+        for tick in _ticks('SOL/USDT', 'coinbase', NS, 50):
+            recorder.record(tick)
+        recorder.flush()
+        assert recorder.written == 50
+        assert read_ticks(tmp_path).num_rows == 50
+    finally:
+        recorder.close()
+    assert read_ticks(tmp_path).num_rows == 50
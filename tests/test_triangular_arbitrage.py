@@ -0,0 +1,139 @@
+"""Tests for single-exchange cycle arbitrage"""
+
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from src.triangular_arbitrage import TriangularArbitrage, demo_markets
+
+
+CURRENCIES = ['USDT', 'BTC', 'ETH', 'SOL', 'BNB']
+
+
+def _exchange(rng, noise, fee=0.001):
+    """Every pair of CURRENCIES listed once, priced from a USD value with noise and a small spread"""
+    usd = {'USDT': 1.0, 'BTC': 60_000.0, 'ETH': 3_000.0, 'SOL': 150.0, 'BNB': 550.0}
+    markets, tickers = {}, {}
+    for quote, base in itertools.combinations(CURRENCIES, 2):
+        symbol = f"{base}/{quote}"
+        mid = usd[base] / usd[quote] * (1 + rng.normal(0, noise))
+        markets[symbol] = {'symbol': symbol, 'base': base, 'quote': quote, 'spot': True, 'taker': fee}
+        tickers[symbol] = {'bid': mid * 0.9998, 'ask': mid * 1.0002}
+    return markets, tickers
+
+
+def _rate(markets, tickers, src, dst):
+    """Units of dst per unit of src after fees, or None when no market connects them"""
+    for symbol, market in markets.items():
+        fee = market['taker']
+        if (market['base'], market['quote']) == (src, dst):
+            return tickers[symbol]['bid'] * (1 - fee)
+        if (market['base'], market['quote']) == (dst, src):
+            return (1 - fee) / tickers[symbol]['ask']
+    return None
+
+
+def _canonical(path):
+    """Rotate a closed path (without its repeated end) to start at its smallest currency"""
+    i = path.index(min(path))
+    return tuple(path[i:] + path[:i])
+
+
+def test_enumeration_has_no_duplicates_or_same_market_cycles():
+    markets, tickers = demo_markets(n_bases=40, seed=11)
+    detector = TriangularArbitrage(markets, start_currencies=None)
+
+    seen = set()
+    for length, cycles in detector.cycles.items():
+        assert length >= 3
+        for edges in cycles.tolist():
+            # Closed: each leg starts where the previous one ended
+            for e, nxt in zip(edges, edges[1:] + edges[:1]):
+                assert detector.edge_dst[e] == detector.edge_src[nxt]
+            # Simple: no currency or market visited twice
+            nodes = [int(detector.edge_src[e]) for e in edges]
+            assert len(set(nodes)) == len(nodes)
+            assert len({e // 2 for e in edges}) == len(edges)
+
+            key = _canonical(nodes)
+            assert key not in seen
+            seen.add(key)
+
+
+def test_start_currencies_only_keep_cycles_through_them():
+    markets, _ = demo_markets(n_bases=40, seed=11)
+    detector = TriangularArbitrage(markets, start_currencies=['ETH'])
+    eth = detector.currency_index['ETH']
+
+    assert detector.cycle_count > 0
+    for cycles in detector.cycles.values():
+        assert (detector.edge_src[cycles] == eth).any(axis=1).all()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_scan_matches_brute_force_cycle_products(seed):
+    rng = np.random.default_rng(seed)
+    markets, tickers = _exchange(rng, noise=0.003)
+    detector = TriangularArbitrage(markets, start_currencies=None)
+    detector.update_tickers(tickers)
+
+    expected = {}
+    for length in (3, 4):
+        for path in itertools.permutations(CURRENCIES, length):
+            key = _canonical(list(path))
+            if key in expected:
+                continue
+            rates = [_rate(markets, tickers, src, dst) for src, dst in zip(path, path[1:] + path[:1])]
+            expected[key] = (math.prod(rates) - 1) * 100
+
+    found = {_canonical(opp['path'][:-1]): opp['profit_pct'] for opp in detector.scan(min_profit=-99)}
+    assert set(found) == set(expected)
+    for key, profit in expected.items():
+        assert found[key] == pytest.approx(profit, abs=1e-9)
+
+    profitable = detector.scan()
+    assert {_canonical(opp['path'][:-1]) for opp in profitable} == {k for k, p in expected.items() if p > 0}
+    assert [opp['profit_pct'] for opp in profitable] == sorted((opp['profit_pct'] for opp in profitable), reverse=True)
+
+
+def test_negative_cycle_is_closed_and_profitable():
+    markets, tickers = demo_markets(n_bases=200, seed=3)
+    detector = TriangularArbitrage(markets)
+    detector.update_tickers(tickers)
+
+    cycle = detector.negative_cycle()
+    assert cycle is not None
+    assert cycle['path'][0] == cycle['path'][-1]
+    for leg, nxt in zip(cycle['legs'], cycle['legs'][1:] + cycle['legs'][:1]):
+        assert leg['to'] == nxt['from']
+
+    growth = 1.0
+    for leg in cycle['legs']:
+        rate = _rate(markets, tickers, leg['from'], leg['to'])
+        assert rate is not None
+        growth *= rate
+    assert cycle['profit_pct'] > 0
+    assert cycle['profit_pct'] == pytest.approx((growth - 1) * 100)
+
+
+def test_consistent_rates_have_no_cycles():
+    rng = np.random.default_rng(0)
+    markets, tickers = _exchange(rng, noise=0.0)
+    detector = TriangularArbitrage(markets, start_currencies=None)
+    detector.update_tickers(tickers)
+
+    assert detector.scan() == []
+    assert detector.negative_cycle() is None
+
+
+def test_missing_quotes_are_skipped():
+    rng = np.random.default_rng(1)
+    markets, tickers = _exchange(rng, noise=0.003)
+    tickers = {symbol: {'bid': None, 'ask': None} for symbol in tickers}
+    detector = TriangularArbitrage(markets, start_currencies=None)
+    detector.update_tickers(tickers)
+
+    assert detector.scan(min_profit=-99) == []
+    assert detector.negative_cycle() is None